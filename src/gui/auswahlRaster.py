@@ -0,0 +1,180 @@
+import logging
+from typing import Any, Iterable, Optional
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QObject, QPersistentModelIndex, QPoint, QRect, QSize, Qt
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QImage, QPainter, QPixmap
+from PySide6.QtWidgets import QListView, QStyle, QStyledItemDelegate, QStyleOptionViewItem, QWidget
+from src.gui.bildLader import BildLader
+from src.util import LruCache
+
+logger = logging.getLogger(__name__)
+
+kachelGroesse = 371  # Breite und Bildhöhe einer Kachel in logischen Pixeln
+kachelAbstand = 58
+namenZeilen = 4
+XmlPfadRolle = Qt.ItemDataRole.UserRole
+
+
+def namenUmbrechen(name: str, zeilenLaenge: int = 30) -> str:
+    """Bricht den Namen einer Prüfanweisung nach etwa zeilenLaenge Zeichen an Wortgrenzen um."""
+    zeilen = []
+    zeile = ""
+    for wort in name.split():
+        if zeile and len(zeile) + len(wort) > zeilenLaenge:
+            zeilen.append(zeile.strip())
+            zeile = ""
+        zeile += wort + " "
+    zeilen.append(zeile.strip())
+    return "\n".join(zeilen)
+
+
+class AuswahlModell(QAbstractListModel):
+    """Listenmodell über die Übersicht der Prüfanweisungen (ladePruefanweisungenXml).
+    Vorschaubilder werden erst angefordert, wenn die Ansicht eine Kachel zeichnet, und
+    bis dahin als None gemeldet. Nicht lesbare Bilder ergeben eine leere Pixmap."""
+
+    def __init__(self, bildLader: BildLader, parent: Optional[QObject] = None, maxBytes: int = 256 * 1024 * 1024) -> None:
+        super().__init__(parent)
+        self.bildLader = bildLader
+        self.bildLader.geladen.connect(self._bildGeladen)
+        self.vorschauGroesse = kachelGroesse
+        self.pixelVerhaeltnis = 1.0
+        self._eintraege: list[dict] = []
+        self._namen: dict[int, str] = {}
+        # Zeilennummer -> QPixmap; nach Bytes begrenzt, verdrängte Kacheln werden beim nächsten Zeichnen neu geladen
+        self._bilder = LruCache(maxBytes=maxBytes)
+        self._prioritaet = 0
+
+    def eintraegeSetzen(self, eintraege: list[dict], pixelVerhaeltnis: float = 1.0) -> None:
+        self.beginResetModel()
+        self.bildLader.abbrechen()
+        self._eintraege = eintraege
+        self._namen.clear()
+        self._bilder.leeren()
+        self.pixelVerhaeltnis = pixelVerhaeltnis
+        # HiDPI: entsprechend größere Vorschaubilder dekodieren
+        self.vorschauGroesse = round(kachelGroesse * pixelVerhaeltnis)
+        self.endResetModel()
+        logger.debug(f"Auswahl-Modell mit {len(eintraege)} Prüfanweisungen gefüllt")
+
+    def bilderAbbrechen(self) -> None:
+        """Verwirft ausstehende Bilder, z.B. beim Verlassen der Seite. Sie werden beim nächsten Zeichnen neu angefordert."""
+        self.bildLader.abbrechen()
+
+    def bilderVorziehen(self, zeilen: Iterable[int]) -> None:
+        """Zieht die noch wartenden Bilder dieser Zeilen vor alle bisher angeforderten."""
+        self._prioritaet += 1
+        self.bildLader.priorisieren(zeilen, self._prioritaet)
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._eintraege)
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= len(self._eintraege):
+            return None
+        zeile = index.row()
+        eintrag = self._eintraege[zeile]
+        if role == Qt.ItemDataRole.DisplayRole:
+            name = self._namen.get(zeile)
+            if name is None:
+                name = self._namen[zeile] = namenUmbrechen(eintrag.get("Name") or "")
+            return name
+        if role == Qt.ItemDataRole.DecorationRole:
+            pixmap = self._bilder.get(zeile)
+            if pixmap is None:
+                # Später angeforderte Kacheln zuerst laden: das sind die, die gerade im Bild sind
+                self._prioritaet += 1
+                self.bildLader.laden(zeile, eintrag.get("VorschauBildPfad") or "", self.vorschauGroesse, self._prioritaet)
+            return pixmap
+        if role == XmlPfadRolle:
+            return eintrag.get("PruefanweisungXmlPfad")
+        return None
+
+    def _bildGeladen(self, zeile: int, bild: QImage) -> None:
+        if zeile >= len(self._eintraege):
+            return
+        pixmap = QPixmap.fromImage(bild) if not bild.isNull() else QPixmap()
+        pixmap.setDevicePixelRatio(self.pixelVerhaeltnis)
+        self._bilder.put(zeile, pixmap, bild.sizeInBytes())
+        index = self.index(zeile)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+class AuswahlDelegate(QStyledItemDelegate):
+    """Zeichnet eine Kachel: Vorschaubild (oder Platzhalter) und darunter den Namen."""
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.schrift = QFont("Segoe UI", 16, QFont.Weight.DemiBold)
+        self.textHoehe = 12 + namenZeilen * QFontMetrics(self.schrift).lineSpacing() + 12
+        self.platzhalterFarbe = QColor(60, 60, 60)
+        self.textFarbe = QColor(208, 83, 82)
+        self.textFarbeHover = QColor(255, 255, 255)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex | QPersistentModelIndex) -> QSize:
+        return QSize(kachelGroesse, kachelGroesse + self.textHoehe)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex | QPersistentModelIndex) -> None:
+        painter.save()
+        bildRect = QRect(option.rect.left(), option.rect.top(), kachelGroesse, kachelGroesse)
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+        if pixmap is None:
+            painter.fillRect(bildRect, self.platzhalterFarbe)
+        elif not pixmap.isNull():
+            groesse = pixmap.deviceIndependentSize().toSize().scaled(bildRect.size(), Qt.AspectRatioMode.KeepAspectRatio)
+            ziel = QRect(0, 0, groesse.width(), groesse.height())
+            ziel.moveCenter(bildRect.center())
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            painter.drawPixmap(ziel, pixmap)
+
+        hover = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        painter.setFont(self.schrift)
+        painter.setPen(self.textFarbeHover if hover else self.textFarbe)
+        textRect = QRect(option.rect.left(), bildRect.bottom() + 1 + 12, kachelGroesse, self.textHoehe - 24)
+        painter.drawText(textRect, Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop | Qt.TextFlag.TextWordWrap,
+                         index.data(Qt.ItemDataRole.DisplayRole) or "")
+        painter.restore()
+
+
+class AuswahlRaster(QListView):
+    """Raster der Prüfanweisungen als virtualisierte Listenansicht: Gezeichnet und
+    geladen werden nur die sichtbaren Kacheln, unabhängig von der Anzahl der Einträge."""
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setObjectName("sichtpruefungAuswahlListe")
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setMovement(QListView.Movement.Static)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setWrapping(True)
+        self.setUniformItemSizes(True)  # Layout ohne sizeHint() je Eintrag
+        self.setSpacing(kachelAbstand // 2)
+        self.setViewportMargins(kachelAbstand // 2, kachelAbstand // 2, kachelAbstand // 2, kachelAbstand // 2)
+        self.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(40)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setMouseTracking(True)  # Für den Hover-Effekt des Namens
+        self.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+        self.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+        self.setStyleSheet("border: none;")
+        self.setItemDelegate(AuswahlDelegate(self))
+        # Beim Zurückscrollen warten die Bilder der sichtbaren Kacheln sonst hinter den übersprungenen
+        self.verticalScrollBar().valueChanged.connect(self._sichtbareBilderVorziehen)
+
+    def sichtbareZeilen(self) -> range:
+        """Zeilen der Kacheln, die gerade (auch nur teilweise) im Viewport liegen."""
+        # Raster in halber Kachelgröße: jede sichtbare Kachel enthält mindestens einen Punkt
+        schritt = kachelGroesse // 2
+        rect = self.viewport().rect()
+        zeilen = [self.indexAt(QPoint(min(x, rect.right()), min(y, rect.bottom()))).row()
+                  for x in range(rect.left(), rect.right() + schritt, schritt)
+                  for y in range(rect.top(), rect.bottom() + schritt, schritt)]
+        zeilen = [zeile for zeile in zeilen if zeile >= 0]
+        return range(min(zeilen), max(zeilen) + 1) if zeilen else range(0)
+
+    def _sichtbareBilderVorziehen(self) -> None:
+        modell = self.model()
+        if isinstance(modell, AuswahlModell):
+            modell.bilderVorziehen(self.sichtbareZeilen())
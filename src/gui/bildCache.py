@@ -0,0 +1,127 @@
+import os
+import logging
+import threading
+from typing import Iterable, Optional
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+from src.util import LruCache
+
+logger = logging.getLogger(__name__)
+
+bildBreite = 540  # Breite der Bilder auf den Eigenschaft-Seiten
+
+
+def skaliertesBild(bildPfad: str, breite: int = bildBreite) -> QImage:
+    """Dekodiert ein Bild und skaliert es glatt auf die Breite. Große Fotos werden schon beim
+    Dekodieren auf die doppelte Breite verkleinert. Leeres Bild, falls nicht lesbar."""
+    reader = QImageReader(bildPfad)
+    originalGroesse = reader.size()
+    if originalGroesse.isValid() and originalGroesse.width() > 2 * breite:
+        reader.setScaledSize(originalGroesse.scaled(2 * breite, originalGroesse.height(), Qt.AspectRatioMode.KeepAspectRatio))
+    bild = reader.read()
+    if bild.isNull():
+        logger.warning(f"Bild konnte nicht geladen werden: {bildPfad} ({reader.errorString()})")
+        return bild
+    return bild.scaledToWidth(breite, Qt.TransformationMode.SmoothTransformation)
+
+
+class BildCacheSignale(QObject):
+    fertig = Signal(object)  # Schlüssel des Auftrags
+
+
+class SkalierAuftrag(QRunnable):
+    def __init__(self, signale: BildCacheSignale, schluessel: tuple, bildPfad: str, breite: int) -> None:
+        super().__init__()
+        self.setAutoDelete(False)  # Der BildCache hält die Aufträge, um auf sie warten zu können
+        self.signale = signale
+        self.schluessel = schluessel
+        self.bildPfad = bildPfad
+        self.breite = breite
+        self.bild = QImage()
+        self.erledigt = threading.Event()
+
+    def run(self) -> None:
+        try:
+            self.bild = skaliertesBild(self.bildPfad, self.breite)
+        except Exception as e:
+            logger.error(f"Fehler beim Skalieren von {self.bildPfad}: {e}", exc_info=True)
+        self.erledigt.set()
+        self.signale.fertig.emit(self.schluessel)
+
+
+class BildCache(QObject):
+    """Nach Bytes begrenzter Cache der auf Breite skalierten Pixmaps der Eigenschaft-Seiten.
+    vorladen() dekodiert die Bilder der nächsten Eigenschaften im Hintergrund; pixmap() liefert
+    sie dann ohne Wartezeit oder wartet auf einen schon laufenden Auftrag."""
+
+    def __init__(self, parent: Optional[QObject] = None, maxBytes: int = 128 * 1024 * 1024, maxThreads: int = 0) -> None:
+        super().__init__(parent)
+        self.threadPool = QThreadPool(self)
+        if maxThreads:
+            self.threadPool.setMaxThreadCount(maxThreads)
+        self._pixmaps = LruCache(maxBytes=maxBytes)
+        self._auftraege: dict[tuple, SkalierAuftrag] = {}
+        # Von pixmap() abgeholte, noch laufende Aufträge bis zu ihrer Meldung festhalten
+        self._abgeholt: dict[tuple, SkalierAuftrag] = {}
+        self._signale = BildCacheSignale()
+        self._signale.fertig.connect(self._auftragFertig)
+
+    @staticmethod
+    def _schluessel(bildPfad: str, breite: int) -> Optional[tuple]:
+        # Änderungszeit und Größe im Schlüssel: ersetzte Dateien werden neu geladen
+        try:
+            stat = os.stat(bildPfad)
+        except (OSError, TypeError, ValueError):
+            return None
+        return (os.path.abspath(bildPfad), stat.st_mtime_ns, stat.st_size, breite)
+
+    def pixmap(self, bildPfad: str, breite: int = bildBreite) -> QPixmap:
+        """Skalierte Pixmap aus dem Cache, sonst sofort im GUI-Thread erzeugt. Leer, falls nicht lesbar."""
+        schluessel = self._schluessel(bildPfad, breite)
+        if schluessel is None:
+            logger.warning(f"Bild nicht gefunden: {bildPfad}")
+            return QPixmap()
+        pixmap = self._pixmaps.get(schluessel)
+        if pixmap is not None:
+            return pixmap
+        auftrag = self._auftraege.pop(schluessel, None)
+        if auftrag is not None:
+            if self.threadPool.tryTake(auftrag):
+                auftrag.run()  # Noch nicht gestartet: hier erledigen statt hinten anzustellen
+            else:
+                self._abgeholt[schluessel] = auftrag
+                auftrag.erledigt.wait()
+            bild = auftrag.bild
+        else:
+            bild = skaliertesBild(bildPfad, breite)
+        return self._ablegen(schluessel, bild)
+
+    def vorladen(self, bildPfade: Iterable[str], breite: int = bildBreite) -> None:
+        for bildPfad in bildPfade:
+            schluessel = self._schluessel(bildPfad, breite)
+            if schluessel is None or schluessel in self._auftraege or self._pixmaps.get(schluessel) is not None:
+                continue
+            auftrag = SkalierAuftrag(self._signale, schluessel, bildPfad, breite)
+            self._auftraege[schluessel] = auftrag
+            self.threadPool.start(auftrag)
+
+    def abbrechen(self) -> None:
+        """Verwirft noch nicht gestartete Vorlade-Aufträge."""
+        for schluessel, auftrag in list(self._auftraege.items()):
+            if self.threadPool.tryTake(auftrag):
+                del self._auftraege[schluessel]
+
+    def warten(self, timeout: int = -1) -> bool:
+        return self.threadPool.waitForDone(timeout)
+
+    def _ablegen(self, schluessel: tuple, bild: QImage) -> QPixmap:
+        pixmap = QPixmap.fromImage(bild) if not bild.isNull() else QPixmap()
+        self._pixmaps.put(schluessel, pixmap, bild.sizeInBytes())
+        return pixmap
+
+    def _auftragFertig(self, schluessel: tuple) -> None:
+        if self._abgeholt.pop(schluessel, None) is not None:
+            return
+        auftrag = self._auftraege.pop(schluessel, None)
+        if auftrag is not None:
+            self._ablegen(schluessel, auftrag.bild)
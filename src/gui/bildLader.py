@@ -0,0 +1,95 @@
+import logging
+from typing import Iterable, Optional
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader
+from src.logic.vorschauBilder import vorschauBild
+
+logger = logging.getLogger(__name__)
+
+
+class BildLaderSignale(QObject):
+    geladen = Signal(int, int, QImage)  # Generation, Schlüssel, Bild (leer bei Fehler)
+
+
+class BildAuftrag(QRunnable):
+    """Dekodiert ein Vorschaubild (siehe vorschauBilder) mit QImageReader im Hintergrund."""
+
+    def __init__(self, signale: BildLaderSignale, generation: int, schluessel: int, bildPfad: str, groesse: int) -> None:
+        super().__init__()
+        self.setAutoDelete(False)  # Der BildLader hält die Aufträge, um sie vorziehen oder abbrechen zu können
+        self.signale = signale
+        self.generation = generation
+        self.schluessel = schluessel
+        self.bildPfad = bildPfad
+        self.groesse = groesse
+
+    def run(self) -> None:
+        bild = QImage()
+        try:
+            reader = QImageReader(vorschauBild(self.bildPfad, self.groesse))
+            # Ohne Vorschaubild (z.B. nicht lesbar für Pillow) das Original wenigstens verkleinert dekodieren
+            originalGroesse = reader.size()
+            if originalGroesse.isValid() and max(originalGroesse.width(), originalGroesse.height()) > self.groesse:
+                reader.setScaledSize(originalGroesse.scaled(self.groesse, self.groesse, Qt.AspectRatioMode.KeepAspectRatio))
+            bild = reader.read()
+            if bild.isNull() and self.bildPfad:
+                logger.warning(f"Vorschaubild konnte nicht geladen werden: {self.bildPfad} ({reader.errorString()})")
+        except Exception as e:
+            logger.error(f"Fehler beim Laden des Vorschaubilds {self.bildPfad}: {e}", exc_info=True)
+        self.signale.geladen.emit(self.generation, self.schluessel, bild)
+
+
+class BildLader(QObject):
+    """Lädt Bilder in einem eigenen QThreadPool, damit abbrechen() die PDF-Erstellung im globalen
+    Pool nicht berührt. Nach abbrechen() eintreffende Bilder werden verworfen."""
+    geladen = Signal(int, QImage)  # Schlüssel, Bild
+
+    def __init__(self, parent: Optional[QObject] = None, maxThreads: int = 0) -> None:
+        super().__init__(parent)
+        self.threadPool = QThreadPool(self)
+        if maxThreads:
+            self.threadPool.setMaxThreadCount(maxThreads)
+        self._signale = BildLaderSignale()
+        self._signale.geladen.connect(self._auftragFertig)
+        self._generation = 0
+        self._offen: dict[int, BildAuftrag] = {}
+        # Abgebrochene, aber schon laufende Aufträge bis zu ihrer Meldung festhalten,
+        # sonst gibt Python sie frei, während run() noch läuft
+        self._auslaufend: dict[tuple[int, int], BildAuftrag] = {}
+
+    def laden(self, schluessel: int, bildPfad: str, groesse: int, prioritaet: int = 0) -> None:
+        if schluessel in self._offen:
+            return
+        auftrag = BildAuftrag(self._signale, self._generation, schluessel, bildPfad, groesse)
+        self._offen[schluessel] = auftrag
+        self.threadPool.start(auftrag, prioritaet)
+
+    def priorisieren(self, schluessel: Iterable[int], prioritaet: int = 1) -> None:
+        """Zieht noch wartende Aufträge vor, z.B. für Kacheln, die gerade ins Bild gescrollt wurden."""
+        for eintrag in schluessel:
+            auftrag = self._offen.get(eintrag)
+            if auftrag is not None and self.threadPool.tryTake(auftrag):
+                self.threadPool.start(auftrag, prioritaet)
+
+    def wartend(self) -> int:
+        return len(self._offen)
+
+    def abbrechen(self) -> None:
+        """Verwirft alle noch nicht gestarteten Aufträge und die Ergebnisse der laufenden."""
+        if self._offen:
+            logger.debug(f"Breche {len(self._offen)} Bildaufträge ab")
+        for schluessel, auftrag in self._offen.items():
+            if not self.threadPool.tryTake(auftrag):
+                self._auslaufend[(self._generation, schluessel)] = auftrag
+        self._offen.clear()
+        self._generation += 1
+
+    def warten(self, timeout: int = -1) -> bool:
+        return self.threadPool.waitForDone(timeout)
+
+    def _auftragFertig(self, generation: int, schluessel: int, bild: QImage) -> None:
+        if generation != self._generation:
+            self._auslaufend.pop((generation, schluessel), None)
+            return
+        if self._offen.pop(schluessel, None) is not None:
+            self.geladen.emit(schluessel, bild)
@@ -1,20 +1,20 @@
-import os
-import shutil
 import webbrowser
-import yaml
 import logging
 from PySide6.QtWidgets import QMainWindow, QMessageBox, QFileDialog, QLabel, QSizePolicy, QPlainTextEdit, QSpacerItem
-from PySide6.QtGui import QIcon, QCursor, QPixmap
-from PySide6.QtCore import Qt, QSize, QCoreApplication
+from PySide6.QtGui import QIcon, QCursor
+from PySide6.QtCore import Qt, QSize, QCoreApplication, QThreadPool
 from src.gui.navigation import NavigationController
 from src.gui.pages import Page
+from src.gui.pdfWorker import PdfWorker
 from src.gui.viewHandler import ViewHandler
+from src.logic import bildSpeicher, ergebnisArchiv
 from src.logic.pruefanweisungManager import PruefanweisungManager
 from src.logic.state import AppState
 from src.logic.vorgang import Vorgang
+from src.logic.serializer import konfiguriereSpeicher, ladePruefanweisungenXml, verwaisteBilderAufraeumen
 from src.logic.validators import ValidationController
 from src.models.pruefanweisung import Pruefanweisung
-from src.util import getUniqueFilename
+from src.util import ladeKonfiguration
 from ui.ui_main import Ui_MainWindow
 
 logger = logging.getLogger(__name__)
@@ -29,8 +29,11 @@ class MainWindow(QMainWindow):
         logger.debug("UI-Setup abgeschlossen")
 
         try:
-            with open("config.yaml", "r", encoding="utf-8") as config:
-                self.config = yaml.safe_load(config)
+            self.config = ladeKonfiguration()
+            konfiguriereSpeicher(self.config)
+            # Archiv vor dem Aufräumen festlegen: Bilder archivierter Sichtprüfungen bleiben erhalten
+            ergebnisArchiv.archivPfad = self.config.get("archivPfad", ergebnisArchiv.archivPfad)
+            verwaisteBilderAufraeumen()
             logger.info("Konfigurationsdatei erfolgreich geladen")
         except Exception as e:
             logger.error(f"Fehler beim Laden der Konfigurationsdatei: {e}", exc_info=True)
@@ -48,9 +51,13 @@ class MainWindow(QMainWindow):
         self.view_handler = ViewHandler(self, self.navigator, self.ui, self.state)
         logger.debug("ViewHandler initialisiert")
 
-        self.assetsDir = "assets/images"
+        self.assetsDir = bildSpeicher.bilderDir
         logger.debug(f"Assets-Verzeichnis: {self.assetsDir}")
 
+        # PDF-Erstellung läuft im Hintergrund, damit das Fenster nicht einfriert
+        self.threadPool = QThreadPool.globalInstance()
+        self.pdfWorker: PdfWorker | None = None
+
         # Buttons verbinden
         # Navigationsleiste
         self.ui.feuerwehrLogo.clicked.connect(self.feuerwehrLogoGeklickt)
@@ -111,21 +118,32 @@ class MainWindow(QMainWindow):
         if istSeiteValide:
             logger.debug("Seite ist valide, speichere Inhalte")
             self.state.speichereSeiteninhalte(currentPage)
-            nextPage = self.navigator.get_next_page()
-            logger.debug(f"Nächste Seite: {nextPage}")
-            self.view_handler.ladeSeiteninhalte(nextPage)
-            self.navigator.goto(nextPage)
-            logger.info(f"Navigation zu Seite: {nextPage}")
+            if currentPage == Page.SICHTPRUEFUNG_ZUSAMMENFASSUNG:
+                # Weiter geht es erst, wenn das PDF geschrieben ist (pdfFertig)
+                self.pdfErstellenStarten()
+                return
+            self.zurNaechstenSeite()
         elif statusNachricht:
             logger.warning(f"Validierung fehlgeschlagen: {statusNachricht}")
             self.statusBarMeldung(statusNachricht)
 
 
+    def zurNaechstenSeite(self):
+        nextPage = self.navigator.get_next_page()
+        logger.debug(f"Nächste Seite: {nextPage}")
+        self.view_handler.ladeSeiteninhalte(nextPage)
+        self.navigator.goto(nextPage)
+        logger.info(f"Navigation zu Seite: {nextPage}")
+
     def loeschenGeklickt(self):
         logger.info("Löschen-Button geklickt")
         self.loeschenPruefanweisungEigenschaft()
         
     def abbrechenGeklickt(self):
+        if self.pdfWorker is not None:
+            logger.info("Abbrechen-Button geklickt, breche PDF-Erstellung ab")
+            self.pdfWorker.abbrechen()
+            return
         logger.info("Abbrechen-Button geklickt, zeige Bestätigungsdialog")
         msg_box = QMessageBox()
         msg_box.setIcon(QMessageBox.Warning)
@@ -182,8 +200,8 @@ class MainWindow(QMainWindow):
     # Sichtprüfung Auswahl
     def auswahlVorbereiten(self):
         logger.debug("Bereite Sichtprüfung-Auswahl vor")
-        if not os.path.exists("data/pruefanweisungen.xml"):
-            logger.warning("Prüfanweisungen-XML-Datei nicht gefunden")
+        if not ladePruefanweisungenXml():
+            logger.warning("Keine Prüfanweisungen gefunden")
             self.statusBar().showMessage("Keine vorhandenen Prüfanweisungen gefunden, die zur Auswahl stehen.", 3000)
             return False
         logger.debug("Lade Seiteninhalte für Sichtprüfung-Auswahl")
@@ -283,11 +301,10 @@ class MainWindow(QMainWindow):
             eigenschaftBildEinfuegen.setMaximumSize(QSize(540, 16777215))
             eigenschaftBildEinfuegen.setText("")
             eigenschaftBildEinfuegen.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-            pixmap = QPixmap(bildPfad)
-            scaledPixmap = pixmap.scaled(540, pixmap.height() * (540 / pixmap.width()), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            eigenschaftBildEinfuegen.setPixmap(scaledPixmap)
+            eigenschaftBildEinfuegen.setPixmap(self.view_handler.bildCache.pixmap(bildPfad))
             eigenschaftBildEinfuegen.setProperty("isPlaceholder", False)
             eigenschaftBildEinfuegen.setProperty("imagePath", bildPfad)
+            eigenschaftBildEinfuegen.setToolTip(bildSpeicher.originalName(bildPfad) or "")
             eigenschaftBildEinfuegen.setStyleSheet(u"QPushButton {\n"
                 "border:none;\n"
                 "height: 304;\n"
@@ -309,6 +326,44 @@ class MainWindow(QMainWindow):
             bildEditorSpacer = QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
             self.ui.verticalLayout_11.addItem(bildEditorSpacer)
 
+    # Sichtprüfung Zusammenfassung
+    def pdfErstellenStarten(self):
+        if self.pdfWorker is not None:
+            logger.debug("PDF wird bereits erstellt")
+            return
+        sichtpruefungManager = self.state.sichtpruefungManager
+        self.pdfWorker = PdfWorker(sichtpruefungManager.pdfPfad, sichtpruefungManager.sichtpruefung)
+        self.pdfWorker.signale.fortschritt.connect(self.pdfFortschritt)
+        self.pdfWorker.signale.fertig.connect(self.pdfFertig)
+        self.pdfWorker.signale.fehler.connect(self.pdfFehler)
+        self.pdfWorker.signale.abgebrochen.connect(self.pdfAbgebrochen)
+        self.ui.fertig.setEnabled(False)
+        self.statusBar().showMessage("PDF wird erstellt...")
+        logger.info(f"Starte PDF-Erstellung im Hintergrund: {sichtpruefungManager.pdfPfad}")
+        self.threadPool.start(self.pdfWorker)
+
+    def pdfFortschritt(self, prozent):
+        self.statusBar().showMessage(f"PDF wird erstellt... {prozent} %")
+
+    def pdfFertig(self, pdfPfad):
+        logger.info(f"PDF im Hintergrund erstellt: {pdfPfad}")
+        self.pdfWorkerBeenden()
+        self.statusBar().clearMessage()
+        self.zurNaechstenSeite()
+
+    def pdfFehler(self, nachricht):
+        logger.error(f"PDF konnte nicht erstellt werden: {nachricht}")
+        self.pdfWorkerBeenden()
+        self.statusBarMeldung(f"PDF konnte nicht erstellt werden: {nachricht}")
+
+    def pdfAbgebrochen(self):
+        self.pdfWorkerBeenden()
+        self.statusBarMeldung("Erstellen des PDFs abgebrochen.")
+
+    def pdfWorkerBeenden(self):
+        self.pdfWorker = None
+        self.ui.fertig.setEnabled(True)
+
     # Erfolgreich abgeschlossen
     def zurueckZumHauptmenueGeklickt(self):
         logger.info("Zurück zum Hauptmenü geklickt")
@@ -322,19 +377,10 @@ class MainWindow(QMainWindow):
         filePath, _ = QFileDialog.getOpenFileName(self, "Bild auswählen", "", "Bilder (*.png *.jpg *.jpeg)")
         if filePath:
             logger.info(f"Bild ausgewählt: {filePath}")
-            os.makedirs(self.assetsDir, exist_ok=True)  # Falls assets-Ordner nicht existiert, erstellen
-            logger.debug(f"Assets-Verzeichnis sichergestellt: {self.assetsDir}")
-
-            # Neuen Pfad im assets-Ordner erstellen (selber Dateiname wie Original)
-            fileName = os.path.basename(filePath)
-            fileName = getUniqueFilename(self.assetsDir, fileName)
-            newPath = os.path.join(self.assetsDir, fileName)
-            logger.debug(f"Kopiere Bild nach: {newPath}")
-
-            # Datei kopieren
+            # Ablage nach Inhalt: gleiche Bilder werden nur einmal gespeichert
             try:
-                shutil.copy(filePath, newPath)
-                logger.info(f"Bild erfolgreich kopiert: {newPath}")
+                newPath = bildSpeicher.speichereBild(filePath)
+                logger.info(f"Bild erfolgreich übernommen: {newPath}")
                 return newPath
             except Exception as e:
                 logger.error(f"Fehler beim Kopieren des Bildes: {e}", exc_info=True)
@@ -346,4 +392,15 @@ class MainWindow(QMainWindow):
     def statusBarMeldung(self, nachricht):
         self.statusBar().showMessage(nachricht, 3000)
 
+    def closeEvent(self, event):
+        # Kein halbfertiges PDF zurücklassen
+        if self.pdfWorker is not None:
+            self.pdfWorker.abbrechen()
+            self.threadPool.waitForDone()
+        self.view_handler.bildLader.abbrechen()
+        self.view_handler.bildLader.warten()
+        self.view_handler.bildCache.abbrechen()
+        self.view_handler.bildCache.warten()
+        super().closeEvent(event)
+
 # TODO: evtl. ungenutzte Bilder löschen
\ No newline at end of file
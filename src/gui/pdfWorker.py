@@ -0,0 +1,51 @@
+import copy
+import logging
+import threading
+from PySide6.QtCore import QObject, QRunnable, Signal
+from src.logic.sichtpruefungManager import pdfErstellen
+from src.models.sichtpruefung import Sichtpruefung
+from src.pdfGenerator import PdfAbgebrochen
+
+logger = logging.getLogger(__name__)
+
+
+class PdfWorkerSignale(QObject):
+    fortschritt = Signal(int)  # Prozent
+    fertig = Signal(str)  # Pfad des geschriebenen PDFs
+    fehler = Signal(str)
+    abgebrochen = Signal()
+
+
+class PdfWorker(QRunnable):
+    """Erstellt das PDF einer Sichtprüfung im QThreadPool, damit die Oberfläche nicht einfriert.
+    Gearbeitet wird auf einer Kopie der Sichtprüfung, spätere Eingaben ändern das PDF nicht."""
+
+    def __init__(self, pdfPfad: str, sichtpruefung: Sichtpruefung) -> None:
+        super().__init__()
+        self.setAutoDelete(False)  # MainWindow hält den Worker, um ihn abbrechen zu können
+        self.pdfPfad = pdfPfad
+        self.sichtpruefung = copy.deepcopy(sichtpruefung)
+        self.signale = PdfWorkerSignale()
+        self._abbruch = threading.Event()
+
+    def abbrechen(self) -> None:
+        logger.info(f"Abbruch der PDF-Erstellung angefordert: {self.pdfPfad}")
+        self._abbruch.set()
+
+    def _fortschrittMelden(self, prozent: int) -> None:
+        if self._abbruch.is_set():
+            raise PdfAbgebrochen()
+        self.signale.fortschritt.emit(prozent)
+
+    def run(self) -> None:
+        try:
+            # Auch bei einem Abbruch vor dem Start: pdfErstellen archiviert die Sichtprüfung und
+            # bricht bei der ersten Fortschrittsmeldung ab
+            pdfErstellen(self.pdfPfad, self.sichtpruefung, self._fortschrittMelden)
+        except PdfAbgebrochen:
+            self.signale.abgebrochen.emit()
+        except Exception as e:
+            self.signale.fehler.emit(str(e))
+        else:
+            self.signale.fortschritt.emit(100)
+            self.signale.fertig.emit(self.pdfPfad)
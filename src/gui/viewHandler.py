@@ -1,12 +1,17 @@
 import datetime
 import logging
 from typing import TYPE_CHECKING
-from PySide6.QtWidgets import QLineEdit, QTextEdit, QCheckBox, QRadioButton, QComboBox, QMessageBox, QLayoutItem, QVBoxLayout, QPushButton, QLabel, QHBoxLayout, QSizePolicy, QPlainTextEdit, QSpacerItem, QMainWindow
-from PySide6.QtGui import QIcon, QCursor, QPixmap
-from PySide6.QtCore import Qt, QObject, QSize, QCoreApplication
+from PySide6.QtWidgets import QLineEdit, QTextEdit, QCheckBox, QRadioButton, QComboBox, QMessageBox, QLayoutItem, QPushButton, QLabel, QSizePolicy, QPlainTextEdit, QSpacerItem, QMainWindow
+from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtCore import Qt, QObject, QSize, QModelIndex
 
+from src.gui.auswahlRaster import AuswahlModell, AuswahlRaster, XmlPfadRolle
+from src.gui.bildCache import BildCache
+from src.gui.bildLader import BildLader
 from src.gui.navigation import NavigationController
 from src.gui.pages import Page
+from src.gui.zusammenfassungTabelle import ZusammenfassungModell, ZusammenfassungTabelle
+from src.logic.richText import bilderAufloesen
 from src.logic.vorgang import Vorgang
 from src.logic.serializer import eigenschaftenNachKategorienGruppieren, eigenschaftspruefungenNachKategorienGruppieren, ladePruefanweisungXml, ladePruefanweisungenXml
 from src.logic.state import AppState
@@ -30,8 +35,30 @@ class ViewHandler(QObject):
         self.placeholderPath: str = "assets/icons/Add Image.png"
         self.placeholderIconSize: QSize = QSize(96, 96)
 
+        # Auswahl als Listenansicht über einem Modell statt eines Button-Rasters, Vorschaubilder im Hintergrund
+        self.bildLader = BildLader(self)
+        self.auswahlModell = AuswahlModell(self.bildLader, self)
+        self.auswahlRaster = AuswahlRaster(self.ui.sichtpruefungAuswahl)
+        self.auswahlRaster.setModel(self.auswahlModell)
+        self.auswahlRaster.clicked.connect(self.pruefanweisungAngeklickt)
+        self.ui.verticalLayout_3.replaceWidget(self.ui.sichtpruefungAuswahlScroll, self.auswahlRaster)
+        self.ui.sichtpruefungAuswahlScroll.hide()
+        self.ui.content.currentChanged.connect(self.seiteGewechselt)
+
+        # Skalierte Bilder der Eigenschaft-Seiten; die der nächsten Eigenschaften werden vorab geladen
+        self.bildCache = BildCache(self)
+        self.vorladenAnzahl: int = 2
+
+        # Eigenschaften der Zusammenfassungen als Tabelle über einem Modell statt Widgets je Zeile
         self.zusammenfassungEigenschaftenIndex: int = 7
-        self.zusammenfassungAnzahlZeilen: int = 11
+        self.sichtpruefungZusammenfassungModell = ZusammenfassungModell(self)
+        self.sichtpruefungZusammenfassungTabelle = ZusammenfassungTabelle(self.ui.scrollAreaWidgetContents)
+        self.sichtpruefungZusammenfassungTabelle.setModel(self.sichtpruefungZusammenfassungModell)
+        self.ui.verticalLayout_10.insertWidget(self.zusammenfassungEigenschaftenIndex, self.sichtpruefungZusammenfassungTabelle)
+        self.pruefanweisungZusammenfassungModell = ZusammenfassungModell(self)
+        self.pruefanweisungZusammenfassungTabelle = ZusammenfassungTabelle(self.ui.scrollAreaWidgetContents_2)
+        self.pruefanweisungZusammenfassungTabelle.setModel(self.pruefanweisungZusammenfassungModell)
+        self.ui.verticalLayout_17.insertWidget(self.zusammenfassungEigenschaftenIndex, self.pruefanweisungZusammenfassungTabelle)
 
         self.ladbareSeitenInhalte: dict[Page, callable] = {
             Page.SICHTPRUEFUNG_AUSWAHL: self.ladeSichtpruefungAuswahl,
@@ -57,146 +84,49 @@ class ViewHandler(QObject):
         self.ladePruefanweisungenInAuswahl(auswahl)
 
     def ladePruefanweisungenInAuswahl(self, auswahl) -> None:
-        # Erst alle alten Widgets/Layout-Elemente aus dem Layout entfernen (rekursiv)
-        def _clear_layout(layout):
-            while layout.count():
-                item = layout.takeAt(0)
-                if item is None:
-                    continue
-                w = item.widget()
-                l = item.layout()
-                if w is not None:
-                    try:
-                        w.setParent(None)
-                    except Exception:
-                        pass
-                    w.deleteLater()
-                elif l is not None:
-                    _clear_layout(l)
-                    try:
-                        layout.removeItem(item)
-                    except Exception:
-                        pass
-                else:
-                    # spacer or unknown item; nothing to delete
-                    pass
-
-        _clear_layout(self.ui.gridLayout)
-
-        columns = 3  # Anzahl der Spalten
-        for index, pruefanweisung in enumerate(auswahl):
-            row = index // columns
-            col = index % columns
-
-            # Vertikales Layout für Name und Bild erstellen
-            verticalLayout = QVBoxLayout()
-            verticalLayout.setSpacing(0)
-            verticalLayout.setObjectName(f"pruefobjektAuswahl{index}")
-
-            # Anklickbares Bild erstellen
-            verticalLayoutImage = QPushButton(self.ui.sichtpruefungAuswahlRaster)
-            verticalLayoutImage.setObjectName(f"pruefobjektAuswahlImage{index}")
-            verticalLayoutImage.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-            verticalLayoutImage.setStyleSheet(u"height: 371;")
-            icon = QIcon()
-            icon.addFile(pruefanweisung["VorschauBildPfad"], QSize(), QIcon.Mode.Normal, QIcon.State.Off)
-            verticalLayoutImage.setIcon(icon)
-            verticalLayoutImage.setIconSize(QSize(371, 371))
-            verticalLayoutImage.setProperty("xmlPfad", pruefanweisung["PruefanweisungXmlPfad"])
-            # Connect click handler depending on current Vorgang (normal load or delete)
-            if getattr(self.state, 'aktuellerVorgang', None) == Vorgang.PRUEFANWEISUNG_LOESCHEN:
-                verticalLayoutImage.clicked.connect(self.bestatigeUndLoeschePruefanweisung)
-            else:
-                verticalLayoutImage.clicked.connect(self.ladePruefanweisung)
-            verticalLayout.addWidget(verticalLayoutImage)
-
-            # Anklickbaren Namen erstellen
-            sizePolicy = QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-            sizePolicy.setHorizontalStretch(0)
-            sizePolicy.setVerticalStretch(0)
-            verticalLayoutName = QPushButton(self.ui.sichtpruefungAuswahlRaster)
-            verticalLayoutName.setMaximumSize(QSize(371, 16777215))
-            verticalLayoutName.setObjectName(f"pruefobjektAuswahlName{index}")
-            verticalLayoutName.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-            verticalLayoutName.setStyleSheet(u"QPushButton {\n"
-                "	border: none;\n"
-                "	color: rgb(208, 83, 82);\n"
-                "	font: 600 16pt \"Segoe UI\";\n"
-                "	padding-left:35;\n"
-                "	padding-right:35;\n"
-                "	padding-top:12;\n"
-                "	padding-bottom:12;\n"
-                "}\n"
-                "QPushButton:hover {\n"
-                "	color: rgb(255, 255, 255);\n"
-                "}\n"
-                "QPushButton:pressed {\n"
-                "	color: rgb(208, 83, 82);\n"
-                "}")
+        self.auswahlModell.eintraegeSetzen(auswahl, self.mainWindow.devicePixelRatioF())
+        self.auswahlRaster.scrollToTop()
+
+    def seiteGewechselt(self, seitenIndex: int) -> None:
+        # Beim Verlassen der Auswahl keine Bilder mehr im Hintergrund dekodieren,
+        # fehlende Kacheln werden beim nächsten Zeichnen wieder angefordert
+        if seitenIndex != Page.SICHTPRUEFUNG_AUSWAHL.value:
+            self.auswahlModell.bilderAbbrechen()
+
+    def pruefanweisungAngeklickt(self, index: QModelIndex) -> None:
+        xmlPfad = index.data(XmlPfadRolle)
+        if getattr(self.state, 'aktuellerVorgang', None) == Vorgang.PRUEFANWEISUNG_LOESCHEN:
+            self.bestatigeUndLoeschePruefanweisung(xmlPfad)
+        else:
+            self.ladePruefanweisung(xmlPfad)
 
-            woerterImNamen = pruefanweisung["Name"].split()
-            name = ''
-            zeilenLaenge = 0
-            for wort in woerterImNamen:
-                if zeilenLaenge + len(wort) > 30:
-                    name += '\n'
-                    zeilenLaenge = 0
-                name += wort + ' '
-                zeilenLaenge += len(wort) + 1
-                
-            verticalLayoutName.setText(QCoreApplication.translate("MainWindow", name.strip(), None))
-            verticalLayoutName.setProperty("xmlPfad", pruefanweisung["PruefanweisungXmlPfad"])
-            sizePolicy.setHeightForWidth(verticalLayoutName.sizePolicy().hasHeightForWidth())
-            verticalLayoutName.clicked.connect(self.ladePruefanweisung)
-
-            verticalLayout.addWidget(verticalLayoutName)
-
-            verticalSpacer = QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
-            verticalLayout.addItem(verticalSpacer)
-            
-            self.ui.gridLayout.addLayout(verticalLayout, row, col, 1, 1)
-            # Notlösung, wenn sich die Buttons vertikal überlappen...
-            # Merke: Bei ScrollAreas ganz vorsichtig mit Größenangaben umgehen. Selbst eine minimum Size verhindert die Expandierung von Widgets...
-            # self.ui.sichtpruefungAuswahlRaster.setMinimumHeight(self.ui.gridLayout.sizeHint().height())
-
-    def ladePruefanweisung(self) -> None:
-        button = self.sender()
-        if button:
-            xmlPfad = button.property("xmlPfad")
-            if xmlPfad:
-                logger.info(f"Lade Prüfanweisung aus: {xmlPfad}")
-                try:
-                    self.state.sichtpruefungManager.sichtpruefung = ladePruefanweisungXml(xmlPfad)
-                    logger.debug("Prüfanweisung erfolgreich geladen, fülle UI-Felder")
-                    if self.state.sichtpruefungManager.sichtpruefung is None:
-                        raise ValueError("Sichtpruefung wurde nicht korrekt geladen")
-                    self.ui.sichtpruefungInfosPruefart.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.pruefart)
-                    self.ui.sichtpruefungInfosPruefvorgabe.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.pruefvorgabe)
-                    self.ui.sichtpruefungInfosPruefvorgabeZusatz.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.pruefvorgabeZusatz)
-                    self.ui.sichtpruefungInfosPrueffrist.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.prueffrist)
-                    self.ui.sichtpruefungInfosSachkundiger.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.sachkundiger)
-                    self.ui.sichtpruefungInfosZusatzausbildung.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.zusatzausbildung)
-                    self.ui.sichtpruefungInfosHersteller.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.hersteller)
-                    self.ui.sichtpruefungInfosAussonderungsfrist.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.aussonderungsfrist)
-                    self.ui.fertig.setEnabled(True)
-                    nextPage = self.navigator.get_next_page()
-                    self.navigator.goto(nextPage)
-                    logger.info(f"Prüfanweisung geladen: {self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.namePruefobjekt}")
-                except Exception as e:
-                    logger.error(f"Fehler beim Laden der Prüfanweisung: {e}", exc_info=True)
-
-            else:
-                logger.error("Fehler: Kein XML-Pfad gefunden!")
+    def ladePruefanweisung(self, xmlPfad: str) -> None:
+        if xmlPfad:
+            logger.info(f"Lade Prüfanweisung aus: {xmlPfad}")
+            try:
+                self.state.sichtpruefungManager.sichtpruefung = ladePruefanweisungXml(xmlPfad)
+                logger.debug("Prüfanweisung erfolgreich geladen, fülle UI-Felder")
+                if self.state.sichtpruefungManager.sichtpruefung is None:
+                    raise ValueError("Sichtpruefung wurde nicht korrekt geladen")
+                self.ui.sichtpruefungInfosPruefart.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.pruefart)
+                self.ui.sichtpruefungInfosPruefvorgabe.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.pruefvorgabe)
+                self.ui.sichtpruefungInfosPruefvorgabeZusatz.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.pruefvorgabeZusatz)
+                self.ui.sichtpruefungInfosPrueffrist.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.prueffrist)
+                self.ui.sichtpruefungInfosSachkundiger.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.sachkundiger)
+                self.ui.sichtpruefungInfosZusatzausbildung.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.zusatzausbildung)
+                self.ui.sichtpruefungInfosHersteller.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.hersteller)
+                self.ui.sichtpruefungInfosAussonderungsfrist.setText(self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.aussonderungsfrist)
+                self.ui.fertig.setEnabled(True)
+                nextPage = self.navigator.get_next_page()
+                self.navigator.goto(nextPage)
+                logger.info(f"Prüfanweisung geladen: {self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.namePruefobjekt}")
+            except Exception as e:
+                logger.error(f"Fehler beim Laden der Prüfanweisung: {e}", exc_info=True)
         else:
-            logger.warning("LadePruefanweisung aufgerufen, aber kein Sender-Button gefunden")
+            logger.error("Fehler: Kein XML-Pfad gefunden!")
 
-    def bestatigeUndLoeschePruefanweisung(self) -> None:
+    def bestatigeUndLoeschePruefanweisung(self, xmlPfad: str) -> None:
         """Called when in delete mode: ask for confirmation and delete the selected pruefanweisung."""
-        button = self.sender()
-        if not button:
-            logger.warning("bestatigeUndLoeschePruefanweisung aufgerufen, aber kein Sender")
-            return
-        xmlPfad = button.property('xmlPfad')
         if not xmlPfad:
             logger.error("Kein XML-Pfad für zu löschende Prüfanweisung gefunden")
             return
@@ -227,7 +157,7 @@ class ViewHandler(QObject):
             try:
                 from src.logic.serializer import loeschePruefanweisung
                 geloeschte = loeschePruefanweisung(xmlPfad)
-                logger.info(f"Prüfanweisung gelöscht, {len(geloeschte)} Dateien entfernt")
+                logger.info(f"Prüfanweisung gelöscht, {len(geloeschte)} unbenutzte Bilder zum Aufräumen vorgemerkt")
                 # refresh the selection view
                 self.ladeSichtpruefungAuswahl()
                 # Use main window helper to show status messages
@@ -260,7 +190,7 @@ class ViewHandler(QObject):
             return
         vorgabenText = self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.vorgabenText
         if vorgabenText:
-            self.ui.vorgabenText.setText(vorgabenText)
+            self.ui.vorgabenText.setText(bilderAufloesen(vorgabenText))
 
     def ladeSichtpruefungPruefablauf(self) -> None:
         if self.state.sichtpruefungManager.sichtpruefung is None:
@@ -268,7 +198,9 @@ class ViewHandler(QObject):
             return
         pruefablaufText = self.state.sichtpruefungManager.sichtpruefung.pruefanweisung.pruefablaufText
         if pruefablaufText:
-            self.ui.pruefablaufText.setText(pruefablaufText)
+            self.ui.pruefablaufText.setText(bilderAufloesen(pruefablaufText))
+        # Als Nächstes kommt die erste Eigenschaft
+        self.eigenschaftBilderVorladen(0)
 
     def ladeSichtpruefungEigenschaft(self) -> None:
         logger.debug(f"Lade Sichtprüfung-Eigenschaft (Index: {self.state.aktuelleEigenschaftIndex})")
@@ -281,6 +213,13 @@ class ViewHandler(QObject):
         self.eigenschaftBilderEinfuegen(eigenschaft)
         self.ui.eigenschaftKategorie.setText(eigenschaft.kategorie)
         self.ui.eigenschaftText.setText(eigenschaft.beschreibung)
+        self.eigenschaftBilderVorladen(self.state.aktuelleEigenschaftIndex + 1)
+
+    def eigenschaftBilderVorladen(self, abIndex: int) -> None:
+        """Lädt die Bilder der Eigenschaften ab abIndex im Hintergrund, damit "weiter" sie sofort zeigt."""
+        eigenschaftspruefungen = self.state.sichtpruefungManager.sichtpruefung.eigenschaftspruefungen
+        for eigenschaftspruefung in eigenschaftspruefungen[abIndex:abIndex + self.vorladenAnzahl]:
+            self.bildCache.vorladen(bildPfad for bildPfad, _ in eigenschaftspruefung.eigenschaft.bilder)
 
     def ladeSichtpruefungZusammenfassung(self) -> None:
         if self.state.sichtpruefungManager.sichtpruefung is None:
@@ -314,9 +253,7 @@ class ViewHandler(QObject):
                 eigenschaftBild.setSizePolicy(sizePolicy)
                 eigenschaftBild.setMinimumSize(QSize(540, 0))
                 eigenschaftBild.setStyleSheet(u"height: 371;")
-                pixmap = QPixmap(bildPfad)
-                scaledPixmap = pixmap.scaled(540, pixmap.height() * (540 / pixmap.width()), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                eigenschaftBild.setPixmap(scaledPixmap)
+                eigenschaftBild.setPixmap(self.bildCache.pixmap(bildPfad))
                 eigenschaftBild.setAlignment(Qt.AlignmentFlag.AlignCenter)
                 eigenschaftBild.setText("")
 
@@ -338,175 +275,15 @@ class ViewHandler(QObject):
         if self.state.sichtpruefungManager.sichtpruefung is None:
             logger.error("Sichtpruefung wurde nicht initialisiert")
             return
-        layoutRowIndex = self.zusammenfassungEigenschaftenIndex
-        eigenschaftenLayout = self.ui.verticalLayout_10
         kategorien = eigenschaftspruefungenNachKategorienGruppieren(self.state.sichtpruefungManager.sichtpruefung.eigenschaftspruefungen)
-        for kategorie, eigenschaftspruefungen in kategorien.items():
-            # Falls eine neue Kategorie beginnt, erst die Kategoriezeile hinzufügen
-            labelKategorie = QLabel(self.ui.scrollAreaWidgetContents)
-            labelKategorie.setStyleSheet(  u"background-color: rgb(161, 192, 228);\n"
-                                            "font: 700 14pt \"Segoe UI\";\n"
-                                            "color: rgb(0, 0, 0);\n"
-                                            "border: 1px solid rgb(81, 106, 196);")
-            labelKategorie.setText(QCoreApplication.translate("MainWindow", kategorie, None))
-            labelKategorie.setWordWrap(True)
-
-            eigenschaftenLayout.insertWidget(layoutRowIndex, labelKategorie)
-            layoutRowIndex += 1
-
-            for eigenschaftspruefung in eigenschaftspruefungen:
-                sizePolicy5 = QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-                sizePolicy5.setHorizontalStretch(0)
-                sizePolicy5.setVerticalStretch(0)
-
-                eigenschaftLayout = QHBoxLayout()
-                eigenschaftLayout.setSpacing(0)
-                labelEigenschaft = QLabel(self.ui.scrollAreaWidgetContents)
-                sizePolicy5.setHeightForWidth(labelEigenschaft.sizePolicy().hasHeightForWidth())
-                labelEigenschaft.setSizePolicy(sizePolicy5)
-                labelEigenschaft.setStyleSheet(u"border: 1px solid rgb(81, 106, 196);\n"
-                                                "background-color: rgb(255, 255, 255);\n"
-                                                "color: rgb(0, 0, 0);")
-                labelEigenschaft.setText(QCoreApplication.translate("MainWindow", eigenschaftspruefung.eigenschaft.beschreibung, None))
-                labelEigenschaft.setWordWrap(True)
-
-                eigenschaftLayout.addWidget(labelEigenschaft)
-
-                checkboxHandlungsbedarf = QCheckBox(self.ui.scrollAreaWidgetContents)
-                sizePolicy6 = QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
-                sizePolicy6.setHorizontalStretch(0)
-                sizePolicy6.setVerticalStretch(0)
-                sizePolicy6.setHeightForWidth(checkboxHandlungsbedarf.sizePolicy().hasHeightForWidth())
-                checkboxHandlungsbedarf.setSizePolicy(sizePolicy6)
-                checkboxHandlungsbedarf.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-                checkboxHandlungsbedarf.setLayoutDirection(Qt.LayoutDirection.LeftToRight)
-                checkboxHandlungsbedarf.setStyleSheet( u"QCheckBox {\n"
-                                                        "    border: 1px solid rgb(81, 106, 196);\n"
-                                                        "	background-color: rgb(255, 255, 255);\n"
-                                                        "	color: rgb(0, 0, 0);\n"
-                                                        "	padding-left: 6px;\n"
-                                                        "}\n"
-                                                        "QCheckBox::indicator {\n"
-                                                        "    width: 14px;\n"
-                                                        "    height: 14px;\n"
-                                                        "    border:2px solid black;\n"
-                                                        "}\n"
-                                                        "QCheckBox::indicator:unchecked {\n"
-                                                        "}\n"
-                                                        "QCheckBox::indicator:checked {\n"
-                                                        "	image: url(\":/icons/assets/icons/Checkmark.png\");\n"
-                                                        "}\n"
-                                                        "QCheckBox::indicator:hover {\n"
-                                                        "	background-color: rgb(230, 230, 230);\n"
-                                                        "}")
-                checkboxHandlungsbedarf.setCheckable(True)
-                checkboxHandlungsbedarf.setChecked(eigenschaftspruefung.keinHandlungsbedarf)
-                checkboxHandlungsbedarf.setText("")
-
-                eigenschaftLayout.addWidget(checkboxHandlungsbedarf, 0, Qt.AlignmentFlag.AlignHCenter)
-
-                inputMassnahmen = QLineEdit(self.ui.scrollAreaWidgetContents)
-                sizePolicy5.setHeightForWidth(inputMassnahmen.sizePolicy().hasHeightForWidth())
-                inputMassnahmen.setSizePolicy(sizePolicy5)
-                inputMassnahmen.setStyleSheet( u"border: 1px solid rgb(81, 106, 196);\n"
-                                                "background-color: rgb(255, 255, 255);\n"
-                                                "color: rgb(0, 0, 0);")
-                inputMassnahmen.setText(eigenschaftspruefung.massnahmen)
-
-                eigenschaftLayout.addWidget(inputMassnahmen)
-                eigenschaftLayout.setStretch(0, 1)
-                eigenschaftLayout.setStretch(1, 0)
-                eigenschaftLayout.setStretch(2, 1)
-
-                eigenschaftenLayout.insertLayout(layoutRowIndex, eigenschaftLayout)
-                layoutRowIndex += 1
-        
+        self.sichtpruefungZusammenfassungModell.kategorienSetzen(kategorien)
+
     def eigenschaftenEinfuegenSeite12(self) -> None:
         if self.state.pruefanweisungManager.pruefanweisung is None:
             logger.error("Pruefanweisung wurde nicht initialisiert")
             return
-        layoutRowIndex = self.zusammenfassungEigenschaftenIndex
-        eigenschaftenLayout = self.ui.verticalLayout_17
         kategorien = eigenschaftenNachKategorienGruppieren(self.state.pruefanweisungManager.pruefanweisung.eigenschaften)
-        for kategorie, eigenschaften in kategorien.items():
-            # Falls eine neue Kategorie beginnt, erst die Kategoriezeile hinzufügen
-            labelKategorie = QLabel(self.ui.scrollAreaWidgetContents_2)
-            labelKategorie.setStyleSheet(  u"background-color: rgb(161, 192, 228);\n"
-                                            "font: 700 14pt \"Segoe UI\";\n"
-                                            "color: rgb(0, 0, 0);\n"
-                                            "border: 1px solid rgb(81, 106, 196);")
-            labelKategorie.setText(QCoreApplication.translate("MainWindow", kategorie, None))
-            labelKategorie.setWordWrap(True)
-
-            eigenschaftenLayout.insertWidget(layoutRowIndex, labelKategorie)
-            layoutRowIndex += 1
-
-            for eigenschaft in eigenschaften:
-                sizePolicy5 = QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-                sizePolicy5.setHorizontalStretch(0)
-                sizePolicy5.setVerticalStretch(0)
-
-                eigenschaftLayout = QHBoxLayout()
-                eigenschaftLayout.setSpacing(0)
-                labelEigenschaft = QLabel(self.ui.scrollAreaWidgetContents_2)
-                sizePolicy5.setHeightForWidth(labelEigenschaft.sizePolicy().hasHeightForWidth())
-                labelEigenschaft.setSizePolicy(sizePolicy5)
-                labelEigenschaft.setStyleSheet(u"border: 1px solid rgb(81, 106, 196);\n"
-                                                "background-color: rgb(255, 255, 255);\n"
-                                                "color: rgb(0, 0, 0);")
-                labelEigenschaft.setText(QCoreApplication.translate("MainWindow", eigenschaft.beschreibung, None))
-                labelEigenschaft.setWordWrap(True)
-
-                eigenschaftLayout.addWidget(labelEigenschaft)
-
-                checkboxHandlungsbedarf = QCheckBox(self.ui.scrollAreaWidgetContents_2)
-                sizePolicy6 = QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
-                sizePolicy6.setHorizontalStretch(0)
-                sizePolicy6.setVerticalStretch(0)
-                sizePolicy6.setHeightForWidth(checkboxHandlungsbedarf.sizePolicy().hasHeightForWidth())
-                checkboxHandlungsbedarf.setSizePolicy(sizePolicy6)
-                checkboxHandlungsbedarf.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-                checkboxHandlungsbedarf.setLayoutDirection(Qt.LayoutDirection.LeftToRight)
-                checkboxHandlungsbedarf.setStyleSheet( u"QCheckBox {\n"
-                                                        "    border: 1px solid rgb(81, 106, 196);\n"
-                                                        "	background-color: rgb(255, 255, 255);\n"
-                                                        "	color: rgb(0, 0, 0);\n"
-                                                        "	padding-left: 6px;\n"
-                                                        "}\n"
-                                                        "QCheckBox::indicator {\n"
-                                                        "    width: 14px;\n"
-                                                        "    height: 14px;\n"
-                                                        "    border:2px solid black;\n"
-                                                        "}\n"
-                                                        "QCheckBox::indicator:unchecked {\n"
-                                                        "}\n"
-                                                        "QCheckBox::indicator:checked {\n"
-                                                        "	image: url(\":/icons/assets/icons/Checkmark.png\");\n"
-                                                        "}\n"
-                                                        "QCheckBox::indicator:hover {\n"
-                                                        "	background-color: rgb(230, 230, 230);\n"
-                                                        "}")
-                checkboxHandlungsbedarf.setCheckable(False)
-                checkboxHandlungsbedarf.setChecked(False)
-                checkboxHandlungsbedarf.setText("")
-
-                eigenschaftLayout.addWidget(checkboxHandlungsbedarf, 0, Qt.AlignmentFlag.AlignHCenter)
-
-                inputMassnahmen = QLabel(self.ui.scrollAreaWidgetContents_2)
-                sizePolicy5.setHeightForWidth(inputMassnahmen.sizePolicy().hasHeightForWidth())
-                inputMassnahmen.setSizePolicy(sizePolicy5)
-                inputMassnahmen.setStyleSheet( u"border: 1px solid rgb(81, 106, 196);\n"
-                                                "background-color: rgb(255, 255, 255);\n"
-                                                "color: rgb(0, 0, 0);")
-                inputMassnahmen.setText('')
-
-                eigenschaftLayout.addWidget(inputMassnahmen)
-                eigenschaftLayout.setStretch(0, 1)
-                eigenschaftLayout.setStretch(1, 0)
-                eigenschaftLayout.setStretch(2, 1)
-
-                eigenschaftenLayout.insertLayout(layoutRowIndex, eigenschaftLayout)
-                layoutRowIndex += 1
+        self.pruefanweisungZusammenfassungModell.kategorienSetzen(kategorien)
 
     def resetAlleFelder(self) -> None:
         logger.info("Setze alle Felder zurück")
@@ -559,7 +336,7 @@ class ViewHandler(QObject):
             self.ui.verticalLayout_14.addWidget(eigenschaftBild)
 
         if page == Page.SICHTPRUEFUNG_ZUSAMMENFASSUNG:
-            self.resetEigenschaftenDerZusammenfassung(self.ui.verticalLayout_10)
+            self.resetEigenschaftenDerZusammenfassung(self.sichtpruefungZusammenfassungModell)
 
         if page == Page.PRUEFANWEISUNG_AUSWAHL:
             self.ui.auswahlBildEinfuegen.setIcon(QIcon(self.placeholderPath))
@@ -589,27 +366,10 @@ class ViewHandler(QObject):
                     
 
         if page == Page.PRUEFANWEISUNG_ZUSAMMENFASSUNG:
-            self.resetEigenschaftenDerZusammenfassung(self.ui.verticalLayout_17)
+            self.resetEigenschaftenDerZusammenfassung(self.pruefanweisungZusammenfassungModell)
             
-    def resetEigenschaftenDerZusammenfassung(self, layout: QVBoxLayout) -> None:
-        anzahlZuLoeschendeZeilen = layout.count() - self.zusammenfassungAnzahlZeilen
-        letzterIndex = self.zusammenfassungEigenschaftenIndex + anzahlZuLoeschendeZeilen - 1
-
-        # Rückwärts durch das Layout iterieren, um Index-Verschiebungen zu vermeiden
-        for i in reversed(range(self.zusammenfassungEigenschaftenIndex, letzterIndex)):
-            item = layout.itemAt(i)
-
-            if item.widget():  # Falls es ein Widget ist (QLabel, QCheckBox, QLineEdit etc.)
-                item.widget().deleteLater()
-            elif item.layout():  # Falls es ein verschachteltes Layout (z. B. QHBoxLayout) ist
-                sub_layout = item.layout()
-                while sub_layout.count():  # Alle enthaltenen Widgets löschen
-                    sub_item = sub_layout.takeAt(0)
-                    if sub_item.widget():
-                        sub_item.widget().deleteLater()
-                layout.removeItem(sub_layout)  # Das leere Layout entfernen
-
-            layout.removeItem(item)  # Schließlich das Haupt-Item aus dem Layout entfernen
+    def resetEigenschaftenDerZusammenfassung(self, modell: ZusammenfassungModell) -> None:
+        modell.leeren()
 
     def fuellePruefanweisungEigenschaft(self, eigenschaft: Eigenschaft) -> None:
         """Füllt die Eingabefelder auf der Page PRUEFANWEISUNG_EIGENSCHAFT mit den
@@ -640,9 +400,7 @@ class ViewHandler(QObject):
             eigenschaftBild.setSizePolicy(sizePolicy)
             eigenschaftBild.setMinimumSize(QSize(0, 0))
             try:
-                pixmap = QPixmap(bildPfad)
-                scaledPixmap = pixmap.scaled(540, pixmap.height() * (540 / pixmap.width()), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                eigenschaftBild.setPixmap(scaledPixmap)
+                eigenschaftBild.setPixmap(self.bildCache.pixmap(bildPfad))
             except Exception:
                 logger.exception(f"Bild konnte nicht geladen werden: {bildPfad}")
             eigenschaftBild.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -0,0 +1,168 @@
+import logging
+from typing import Any, Optional
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QObject, QPersistentModelIndex, Qt
+from PySide6.QtGui import QBrush, QColor, QFont
+from PySide6.QtWidgets import QAbstractItemView, QAbstractScrollArea, QHeaderView, QTableView, QWidget
+from src.models.eigenschaft import Eigenschaft
+from src.models.eigenschaftpruefung import Eigenschaftspruefung
+
+logger = logging.getLogger(__name__)
+
+SPALTE_BESCHREIBUNG, SPALTE_HAKEN, SPALTE_MASSNAHMEN = range(3)
+
+# Gemeinsames Stylesheet beider Zusammenfassungen (Sichtprüfung und Prüfanweisung)
+zusammenfassungStylesheet = (
+    "QTableView {\n"
+    "    border: 1px solid rgb(81, 106, 196);\n"
+    "    gridline-color: rgb(81, 106, 196);\n"
+    "    background-color: rgb(255, 255, 255);\n"
+    "    color: rgb(0, 0, 0);\n"
+    "    selection-background-color: rgb(230, 230, 230);\n"
+    "    selection-color: rgb(0, 0, 0);\n"
+    "}\n"
+    "QTableView QLineEdit {\n"
+    "    border: none;\n"
+    "    background-color: rgb(255, 255, 255);\n"
+    "    color: rgb(0, 0, 0);\n"
+    "}\n"
+    "QTableView::indicator {\n"
+    "    width: 14px;\n"
+    "    height: 14px;\n"
+    "    border: 2px solid black;\n"
+    "}\n"
+    "QTableView::indicator:checked {\n"
+    "    image: url(\":/icons/assets/icons/Checkmark.png\");\n"
+    "}\n"
+    "QTableView::indicator:hover {\n"
+    "    background-color: rgb(230, 230, 230);\n"
+    "}")
+
+
+class ZusammenfassungModell(QAbstractTableModel):
+    """Tabellenmodell der Zusammenfassung, nach Kategorien gruppiert: je Kategorie eine
+    Kategoriezeile, darunter die Eigenschaften (Beschreibung, Haken, Maßnahmen).
+    Bei Eigenschaftsprüfungen schreiben Haken und Maßnahmen direkt in die Sichtprüfung,
+    Eigenschaften einer Prüfanweisung werden nur angezeigt."""
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        # Je Zeile: (Kategorie, None) für Kategoriezeilen, (None, Eintrag) für Eigenschaften
+        self._zeilen: list[tuple[Optional[str], Optional[Eigenschaftspruefung | Eigenschaft]]] = []
+        self.kategorieSchrift = QFont("Segoe UI", 14, QFont.Weight.Bold)
+        self.kategorieHintergrund = QBrush(QColor(161, 192, 228))
+
+    def kategorienSetzen(self, kategorien: dict[str, list[Eigenschaftspruefung | Eigenschaft]]) -> None:
+        """Übernimmt die Gruppierung aus eigenschaft(spruefung)enNachKategorienGruppieren."""
+        self.beginResetModel()
+        self._zeilen = []
+        for kategorie, eintraege in kategorien.items():
+            self._zeilen.append((kategorie, None))
+            self._zeilen.extend((None, eintrag) for eintrag in eintraege)
+        self.endResetModel()
+        logger.debug(f"Zusammenfassung mit {len(self._zeilen)} Zeilen gefüllt")
+
+    def leeren(self) -> None:
+        self.kategorienSetzen({})
+
+    def istKategorie(self, zeile: int) -> bool:
+        return self._zeilen[zeile][1] is None
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._zeilen)
+
+    def columnCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else 3
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        kategorie, eintrag = self._zeilen[index.row()]
+        spalte = index.column()
+        if eintrag is None:
+            if role == Qt.ItemDataRole.DisplayRole and spalte == SPALTE_BESCHREIBUNG:
+                return kategorie
+            if role == Qt.ItemDataRole.FontRole:
+                return self.kategorieSchrift
+            if role == Qt.ItemDataRole.BackgroundRole:
+                return self.kategorieHintergrund
+            return None
+
+        pruefung = eintrag if isinstance(eintrag, Eigenschaftspruefung) else None
+        if spalte == SPALTE_BESCHREIBUNG and role == Qt.ItemDataRole.DisplayRole:
+            return pruefung.eigenschaft.beschreibung if pruefung else eintrag.beschreibung
+        if spalte == SPALTE_HAKEN and role == Qt.ItemDataRole.CheckStateRole:
+            # Prüfanweisung: leeres Kästchen wie auf dem Papier-Vordruck
+            return Qt.CheckState.Checked if pruefung and pruefung.keinHandlungsbedarf else Qt.CheckState.Unchecked
+        if spalte == SPALTE_MASSNAHMEN and role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return pruefung.massnahmen if pruefung else ""
+        return None
+
+    def setData(self, index: QModelIndex | QPersistentModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or not (self.flags(index) & (Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsUserCheckable)):
+            return False
+        pruefung = self._zeilen[index.row()][1]
+        if index.column() == SPALTE_HAKEN and role == Qt.ItemDataRole.CheckStateRole:
+            pruefung.setKeinHandlungsbedarf(Qt.CheckState(value) == Qt.CheckState.Checked)
+        elif index.column() == SPALTE_MASSNAHMEN and role == Qt.ItemDataRole.EditRole:
+            pruefung.setMassnahmen(str(value))
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index: QModelIndex | QPersistentModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        eintrag = self._zeilen[index.row()][1]
+        if not isinstance(eintrag, Eigenschaftspruefung):
+            return Qt.ItemFlag.ItemIsEnabled
+        if index.column() == SPALTE_HAKEN:
+            return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsUserCheckable
+        if index.column() == SPALTE_MASSNAHMEN:
+            return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+        return Qt.ItemFlag.ItemIsEnabled
+
+
+class ZusammenfassungTabelle(QTableView):
+    """Tabelle der Zusammenfassung in der scrollbaren Seite: so hoch wie ihr Inhalt, ohne
+    eigene Scrollleisten. Gezeichnet werden trotzdem nur die sichtbaren Zeilen."""
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.horizontalHeader().hide()
+        self.verticalHeader().hide()
+        self.setWordWrap(True)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setSizeAdjustPolicy(QAbstractScrollArea.SizeAdjustPolicy.AdjustToContents)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.AllEditTriggers)
+        self.setStyleSheet(zusammenfassungStylesheet)
+        self._breite = -1
+
+    def setModel(self, model: ZusammenfassungModell) -> None:
+        super().setModel(model)
+        kopfzeile = self.horizontalHeader()
+        kopfzeile.setSectionResizeMode(SPALTE_BESCHREIBUNG, QHeaderView.ResizeMode.Stretch)
+        kopfzeile.setSectionResizeMode(SPALTE_HAKEN, QHeaderView.ResizeMode.Fixed)
+        kopfzeile.setSectionResizeMode(SPALTE_MASSNAHMEN, QHeaderView.ResizeMode.Stretch)
+        self.setColumnWidth(SPALTE_HAKEN, 30)
+        model.modelReset.connect(self._zeilenAnpassen)
+        self._zeilenAnpassen()
+
+    def _zeilenAnpassen(self) -> None:
+        modell = self.model()
+        self.clearSpans()
+        for zeile in range(modell.rowCount()):
+            if modell.istKategorie(zeile):
+                self.setSpan(zeile, 0, 1, modell.columnCount())
+        self.resizeRowsToContents()
+        self.updateGeometry()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        # Umbrüche der Beschreibungen hängen an der Spaltenbreite
+        if self.model() is not None and event.size().width() != self._breite:
+            self._breite = event.size().width()
+            self.resizeRowsToContents()
+            self.updateGeometry()
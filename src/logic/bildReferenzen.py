@@ -0,0 +1,273 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import Counter
+from typing import Callable, Iterable, Optional
+from src.logic import vorschauBilder
+
+logger = logging.getLogger(__name__)
+
+# Ein Index je Datei, damit Tests und beide Speicher-Backends sich nicht in die Quere kommen
+_indizes: dict[str, "BildReferenzIndex"] = {}
+_indizesLock = threading.Lock()
+
+# Gerade abgelegte oder wiederverwendete Bilder, die noch in keiner gespeicherten Prüfanweisung stehen
+_inBenutzung: set[str] = set()
+_inBenutzungLock = threading.Lock()
+
+
+def index(pfad: str) -> "BildReferenzIndex":
+    with _indizesLock:
+        if pfad not in _indizes:
+            _indizes[pfad] = BildReferenzIndex(pfad)
+        return _indizes[pfad]
+
+def bildInBenutzung(bildPfad: str) -> None:
+    """Schützt ein Bild vor dem Aufräumer, bis eine Prüfanweisung mit diesem Bild gespeichert
+    ist (referenzenSetzen). Muss vor der Prüfung aufgerufen werden, ob die Datei schon existiert:
+    danach löscht kein laufender Aufräumer sie mehr."""
+    bild = os.path.normpath(bildPfad)
+    with _inBenutzungLock:
+        _inBenutzung.add(bild)
+    with _indizesLock:
+        indizes = list(_indizes.values())
+    for referenzIndex in indizes:
+        referenzIndex.kandidatVerwerfen(bild)
+
+def _inBenutzungAufheben(bilder: Iterable[str]) -> None:
+    with _inBenutzungLock:
+        _inBenutzung.difference_update(bilder)
+
+def _istInBenutzung(bild: str) -> bool:
+    with _inBenutzungLock:
+        return bild in _inBenutzung
+
+
+class BildReferenzIndex:
+    """Merkt sich, welche Prüfanweisung auf welche Bilddateien verweist. Bilder, auf die nach
+    dem Löschen einer Prüfanweisung niemand mehr verweist, werden als Kandidaten vorgemerkt
+    und erst vom Aufräumer (aufraeumen / imHintergrundAufraeumen) von der Platte entfernt.
+    Index und Kandidaten liegen als JSON unter `pfad`, ein Absturz verliert also nichts."""
+
+    def __init__(self, pfad: str) -> None:
+        self.pfad = pfad
+        self._lock = threading.RLock()
+        self._geladen = False
+        self._referenzen: dict[str, list[str]] = {}
+        self._anzahl: Counter = Counter()
+        self._kandidaten: list[str] = []
+        self._aufraeumer: Optional[threading.Thread] = None
+        self._aufbauer: Optional[threading.Thread] = None
+        # Während des Aufbaus im Hintergrund eingegangene Änderungen, werden danach nachgeholt
+        self._ausstehend: list[tuple[Callable, tuple]] = []
+        # Verweise außerhalb des Index, z.B. aus dem Ergebnis-Archiv; solche Bilder werden nie gelöscht
+        self.externReferenziert: Optional[Callable[[str], bool]] = None
+
+    def vorhanden(self) -> bool:
+        with self._lock:
+            return self._geladen or os.path.exists(self.pfad)
+
+    def _laden(self) -> None:
+        if self._geladen:
+            return
+        try:
+            with open(self.pfad, "r", encoding="utf-8") as datei:
+                daten = json.load(datei)
+        except FileNotFoundError:
+            return  # Noch kein Index, vorhanden() bleibt False bis aufbauen()
+        self._referenzen = daten.get("referenzen", {})
+        self._kandidaten = daten.get("kandidaten", [])
+        self._anzahl = Counter(bild for bilder in self._referenzen.values() for bild in set(bilder))
+        self._geladen = True
+
+    def _speichern(self) -> None:
+        verzeichnis = os.path.dirname(self.pfad)
+        if verzeichnis:
+            os.makedirs(verzeichnis, exist_ok=True)
+        tmpPfad = self.pfad + ".tmp"
+        with open(tmpPfad, "w", encoding="utf-8") as datei:
+            json.dump({"referenzen": self._referenzen, "kandidaten": self._kandidaten}, datei, ensure_ascii=False)
+        os.replace(tmpPfad, self.pfad)
+
+    def aufbauen(self, referenzen: dict[str, list[str]]) -> None:
+        """Ersetzt den Index vollständig, z.B. beim ersten Anlegen aus allen Prüfanweisungen."""
+        with self._lock:
+            self._referenzen = {pfad: [os.path.normpath(bild) for bild in bilder] for pfad, bilder in referenzen.items()}
+            self._anzahl = Counter(bild for bilder in self._referenzen.values() for bild in set(bilder))
+            self._kandidaten = []
+            self._geladen = True
+            self._speichern()
+            logger.info(f"Bild-Referenzindex aufgebaut: {len(self._referenzen)} Prüfanweisungen, {len(self._anzahl)} Bilder")
+
+    def imAufbau(self) -> bool:
+        with self._lock:
+            return self._aufbauer is not None
+
+    def imHintergrundAufbauen(self, ermitteln: Callable[[], dict[str, list[str]]]) -> None:
+        """Baut den Index (falls nicht vorhanden und nicht schon im Aufbau) in einem Hintergrund-Thread
+        aus `ermitteln()` auf. Bis dahin werden referenzenSetzen/referenzenEntfernen vorgemerkt."""
+        with self._lock:
+            if self._aufbauer is not None or self.vorhanden():
+                return
+            self._aufbauer = threading.Thread(target=self._aufbauerSchleife, args=(ermitteln,),
+                                              name="BildIndexAufbau", daemon=True)
+            self._aufbauer.start()
+
+    def _aufbauerSchleife(self, ermitteln: Callable[[], dict[str, list[str]]]) -> None:
+        try:
+            referenzen = ermitteln()
+        except Exception:
+            # Ohne Index wird nichts gelöscht; beim nächsten Anlass wird erneut aufgebaut
+            logger.error("Fehler beim Aufbau des Bild-Referenzindex", exc_info=True)
+            with self._lock:
+                self._aufbauer = None
+                self._ausstehend = []
+            return
+        with self._lock:
+            self._aufbauer = None
+            self.aufbauen(referenzen)
+            ausstehend, self._ausstehend = self._ausstehend, []
+            for methode, argumente in ausstehend:
+                methode(*argumente)
+            if ausstehend:
+                logger.info(f"{len(ausstehend)} Änderungen am Bild-Referenzindex nachgeholt")
+            if self._kandidaten:
+                self.imHintergrundAufraeumen()
+
+    def referenzenSetzen(self, pruefanweisungPfad: str, bildPfade: Iterable[str]) -> None:
+        with self._lock:
+            if self._aufbauer is not None:
+                self._ausstehend.append((self.referenzenSetzen, (pruefanweisungPfad, list(bildPfade))))
+                return
+            self._laden()
+            self._entfernen(pruefanweisungPfad)
+            bilder = [os.path.normpath(bild) for bild in bildPfade if bild]
+            self._referenzen[pruefanweisungPfad] = bilder
+            self._anzahl.update(set(bilder))
+            self._speichern()
+        _inBenutzungAufheben(bilder)
+
+    def _entfernen(self, pruefanweisungPfad: str) -> list[str]:
+        bilder = self._referenzen.pop(pruefanweisungPfad, [])
+        self._anzahl.subtract(set(bilder))
+        return bilder
+
+    def _externReferenziert(self, bild: str) -> bool:
+        if self.externReferenziert is None:
+            return False
+        try:
+            return self.externReferenziert(bild)
+        except Exception:
+            logger.error(f"Externe Verweise auf {bild} nicht prüfbar, Bild bleibt erhalten", exc_info=True)
+            return True
+
+    def bilderVon(self, pruefanweisungPfad: str) -> Optional[list[str]]:
+        with self._lock:
+            self._laden()
+            bilder = self._referenzen.get(pruefanweisungPfad)
+            return list(bilder) if bilder is not None else None
+
+    def referenzenEntfernen(self, pruefanweisungPfad: str, bildPfade: Iterable[str] = ()) -> list[str]:
+        """Entfernt die Verweise einer Prüfanweisung. `bildPfade` ergänzt Bilder, die (noch) nicht
+        im Index stehen. Gibt die Bilder zurück, auf die jetzt niemand mehr verweist; sie werden
+        zum Löschen vorgemerkt. Läuft gerade der Aufbau, wird das Entfernen danach nachgeholt
+        und die Liste ist leer."""
+        with self._lock:
+            if self._aufbauer is not None:
+                self._ausstehend.append((self.referenzenEntfernen, (pruefanweisungPfad, list(bildPfade))))
+                return []
+            self._laden()
+            bilder = self._entfernen(pruefanweisungPfad) + [os.path.normpath(bild) for bild in bildPfade if bild]
+            unreferenziert = []
+            for bild in dict.fromkeys(bilder):
+                if self._anzahl[bild] <= 0:
+                    del self._anzahl[bild]
+                    if self._externReferenziert(bild):
+                        continue
+                    unreferenziert.append(bild)
+                    if bild not in self._kandidaten:
+                        self._kandidaten.append(bild)
+            self._speichern()
+            logger.debug(f"Verweise von {pruefanweisungPfad} entfernt, {len(unreferenziert)} Bilder vorgemerkt")
+            return unreferenziert
+
+    def istReferenziert(self, bildPfad: str) -> bool:
+        with self._lock:
+            self._laden()
+            return self._anzahl[os.path.normpath(bildPfad)] > 0
+
+    def kandidatVerwerfen(self, bildPfad: str) -> None:
+        """Nimmt ein Bild wieder aus der Liste der zu löschenden Bilder."""
+        with self._lock:
+            self._laden()
+            bild = os.path.normpath(bildPfad)
+            if bild in self._kandidaten:
+                self._kandidaten.remove(bild)
+                self._speichern()
+                logger.debug(f"Bild wird wieder verwendet, nicht mehr zum Löschen vorgemerkt: {bild}")
+
+    def kandidaten(self) -> list[str]:
+        with self._lock:
+            self._laden()
+            return list(self._kandidaten)
+
+    def aufraeumen(self, maxAnzahl: int = 0) -> list[str]:
+        """Löscht bis zu `maxAnzahl` (0 = alle) vorgemerkte Bilder, auf die weiterhin niemand
+        verweist, samt ihren Vorschaubildern. Wird ein Bild inzwischen wieder verwendet, bleibt es erhalten."""
+        with self._lock:
+            self._laden()
+            stapel = self._kandidaten[:maxAnzahl] if maxAnzahl else list(self._kandidaten)
+            geloescht = []
+            for bild in stapel:
+                self._kandidaten.remove(bild)
+                if self._anzahl[bild] > 0 or _istInBenutzung(bild) or self._externReferenziert(bild):
+                    logger.debug(f"Bild wird wieder verwendet und bleibt erhalten: {bild}")
+                    continue
+                try:
+                    vorschauBilder.vorschauBilderEntfernen(bild)
+                    os.remove(bild)
+                    geloescht.append(bild)
+                    logger.info(f"Bild gelöscht: {bild}")
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    logger.error(f"Fehler beim Löschen der Bilddatei {bild}: {e}", exc_info=True)
+            if stapel:
+                self._speichern()
+            return geloescht
+
+    def imHintergrundAufraeumen(self, stapelGroesse: int = 50) -> None:
+        """Startet (falls nicht schon aktiv) einen Hintergrund-Thread, der die vorgemerkten
+        Bilder stapelweise löscht, bis keine mehr übrig sind."""
+        with self._lock:
+            if self._aufraeumer is not None:
+                return
+            self._aufraeumer = threading.Thread(target=self._aufraeumerSchleife, args=(stapelGroesse,),
+                                                name="BildAufraeumer", daemon=True)
+            self._aufraeumer.start()
+
+    def _aufraeumerSchleife(self, stapelGroesse: int) -> None:
+        while True:
+            with self._lock:
+                self._laden()
+                if not self._kandidaten:
+                    self._aufraeumer = None
+                    return
+            try:
+                self.aufraeumen(stapelGroesse)
+            except Exception:
+                logger.error("Fehler beim Aufräumen unbenutzter Bilder", exc_info=True)
+                with self._lock:
+                    self._aufraeumer = None
+                return
+            time.sleep(0.01)  # Zwischen den Stapeln anderen Threads den Vortritt lassen
+
+    def warten(self, timeout: Optional[float] = None) -> None:
+        aufbauer = self._aufbauer
+        if aufbauer is not None:
+            aufbauer.join(timeout)
+        aufraeumer = self._aufraeumer
+        if aufraeumer is not None:
+            aufraeumer.join(timeout)
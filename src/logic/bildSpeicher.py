@@ -0,0 +1,95 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from typing import Optional
+from src.logic import bildReferenzen
+
+logger = logging.getLogger(__name__)
+
+# Bilder werden nach ihrem Inhalt abgelegt: <bilderDir>/ab/abcdef....jpg (ab = erste zwei Zeichen
+# des SHA-256). Gleiche Dateien landen so immer am selben Pfad und werden nur einmal gespeichert.
+bilderDir = "assets/images"
+
+_endungen = {".jpeg": ".jpg", ".jpg": ".jpg", ".png": ".png", ".gif": ".gif", ".bmp": ".bmp", ".webp": ".webp"}
+
+_lock = threading.Lock()
+_namenCache: dict = {"pfad": None, "namen": {}}
+
+
+def _namenPfad() -> str:
+    """Nebenindex Hash -> ursprünglicher Dateiname, nur für die Anzeige."""
+    return os.path.join(bilderDir, "namen.json")
+
+def _ladeNamen() -> dict[str, str]:
+    if _namenCache["pfad"] != _namenPfad():
+        try:
+            with open(_namenPfad(), "r", encoding="utf-8") as datei:
+                namen = json.load(datei)
+        except FileNotFoundError:
+            namen = {}
+        except ValueError:
+            logger.warning(f"Bildnamen-Index ist beschädigt und wird neu angelegt: {_namenPfad()}")
+            namen = {}
+        _namenCache["pfad"] = _namenPfad()
+        _namenCache["namen"] = namen
+    return _namenCache["namen"]
+
+def _namenMerken(hashWert: str, originalName: str) -> None:
+    namen = _ladeNamen()
+    if hashWert in namen:
+        return
+    namen[hashWert] = originalName
+    tmpPfad = _namenPfad() + ".tmp"
+    with open(tmpPfad, "w", encoding="utf-8") as datei:
+        json.dump(namen, datei, ensure_ascii=False, indent=1)
+    os.replace(tmpPfad, _namenPfad())
+
+def _zielPfad(hashWert: str, endung: str) -> str:
+    endung = _endungen.get(endung.lower(), endung.lower())
+    return os.path.join(bilderDir, hashWert[:2], hashWert + endung)
+
+def _ablegen(hashWert: str, endung: str, originalName: str, schreiben) -> str:
+    zielPfad = _zielPfad(hashWert, endung)
+    # Vor der Prüfung auf Existenz: sonst könnte der Aufräumer ein schon abgelegtes Bild löschen
+    bildReferenzen.bildInBenutzung(zielPfad)
+    with _lock:
+        if os.path.exists(zielPfad):
+            logger.debug(f"Bild bereits vorhanden: {zielPfad}")
+        else:
+            os.makedirs(os.path.dirname(zielPfad), exist_ok=True)
+            tmpPfad = zielPfad + ".tmp"
+            schreiben(tmpPfad)
+            os.replace(tmpPfad, zielPfad)
+            logger.info(f"Bild gespeichert: {zielPfad}")
+        _namenMerken(hashWert, originalName)
+    return zielPfad
+
+def speichereBild(quellPfad: str) -> str:
+    """Kopiert die Bilddatei in den Bildspeicher und gibt den Pfad der Ablage zurück.
+    Ist der Inhalt bereits gespeichert, wird nichts kopiert."""
+    sha256 = hashlib.sha256()
+    with open(quellPfad, "rb") as datei:
+        for block in iter(lambda: datei.read(1024 * 1024), b""):
+            sha256.update(block)
+    originalName = os.path.basename(quellPfad)
+    return _ablegen(sha256.hexdigest(), os.path.splitext(originalName)[1], originalName,
+                    lambda tmpPfad: shutil.copyfile(quellPfad, tmpPfad))
+
+def speichereBildDaten(daten: bytes, endung: str, originalName: str = "") -> str:
+    """Wie speichereBild, aber für Bilddaten aus dem Speicher (z.B. eingebettete Bilder)."""
+    hashWert = hashlib.sha256(daten).hexdigest()
+
+    def schreiben(tmpPfad: str) -> None:
+        with open(tmpPfad, "wb") as datei:
+            datei.write(daten)
+
+    return _ablegen(hashWert, endung, originalName or hashWert + endung, schreiben)
+
+def originalName(bildPfad: str) -> Optional[str]:
+    """Ursprünglicher Dateiname eines gespeicherten Bildes, None wenn unbekannt."""
+    hashWert = os.path.splitext(os.path.basename(bildPfad))[0]
+    with _lock:
+        return _ladeNamen().get(hashWert)
@@ -0,0 +1,270 @@
+import os
+import json
+import hashlib
+import logging
+import sqlite3
+import datetime
+import threading
+from typing import Optional
+
+from src.logic import richText
+from src.models.eigenschaft import Eigenschaft
+from src.models.eigenschaftpruefung import Eigenschaftspruefung
+from src.models.pruefanweisung import Pruefanweisung
+from src.models.sichtpruefung import Sichtpruefung
+
+logger = logging.getLogger(__name__)
+
+# Abgeschlossene Sichtprüfungen, nur anhängend (Änderungen und Löschen verhindern Trigger).
+# Vorgaben und Prüfablauf stehen je Inhalt einmal in pruefanweisungText, die Momentaufnahme
+# in sichtpruefung.daten verweist nur mit ihrem Schlüssel darauf.
+archivPfad = "data/archiv.sqlite3"
+
+_lokal = threading.local()
+
+_schema = """
+CREATE TABLE IF NOT EXISTS sichtpruefung (
+    id INTEGER PRIMARY KEY,
+    archiviertAm TEXT NOT NULL,
+    pruefanweisungPfad TEXT,
+    namePruefobjekt TEXT,
+    lagerort TEXT,
+    nummer TEXT,
+    einsatzbereit INTEGER NOT NULL,
+    pruefer TEXT,
+    datum TEXT,
+    datumIso TEXT,
+    bemerkungen TEXT,
+    pdfPfad TEXT,
+    daten TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sichtpruefungNachNummer ON sichtpruefung(nummer, datumIso);
+CREATE INDEX IF NOT EXISTS sichtpruefungNachLagerort ON sichtpruefung(lagerort, datumIso);
+CREATE INDEX IF NOT EXISTS sichtpruefungNachDatum ON sichtpruefung(datumIso);
+CREATE TABLE IF NOT EXISTS eigenschaftspruefung (
+    id INTEGER PRIMARY KEY,
+    sichtpruefungId INTEGER NOT NULL REFERENCES sichtpruefung(id),
+    position INTEGER NOT NULL,
+    kategorie TEXT,
+    beschreibung TEXT,
+    keinHandlungsbedarf INTEGER NOT NULL,
+    massnahmen TEXT
+);
+CREATE INDEX IF NOT EXISTS eigenschaftspruefungNachSichtpruefung ON eigenschaftspruefung(sichtpruefungId, position);
+CREATE TABLE IF NOT EXISTS pruefanweisungText (
+    schluessel TEXT PRIMARY KEY,
+    vorgabenText TEXT,
+    pruefablaufText TEXT
+);
+CREATE TABLE IF NOT EXISTS bild (
+    sichtpruefungId INTEGER NOT NULL REFERENCES sichtpruefung(id),
+    bildPfad TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bildNachPfad ON bild(bildPfad);
+CREATE TRIGGER IF NOT EXISTS sichtpruefungUnveraenderlich BEFORE UPDATE ON sichtpruefung
+BEGIN SELECT RAISE(ABORT, 'Archiv ist nur anhängend'); END;
+CREATE TRIGGER IF NOT EXISTS sichtpruefungNichtLoeschbar BEFORE DELETE ON sichtpruefung
+BEGIN SELECT RAISE(ABORT, 'Archiv ist nur anhängend'); END;
+CREATE TRIGGER IF NOT EXISTS eigenschaftspruefungUnveraenderlich BEFORE UPDATE ON eigenschaftspruefung
+BEGIN SELECT RAISE(ABORT, 'Archiv ist nur anhängend'); END;
+CREATE TRIGGER IF NOT EXISTS eigenschaftspruefungNichtLoeschbar BEFORE DELETE ON eigenschaftspruefung
+BEGIN SELECT RAISE(ABORT, 'Archiv ist nur anhängend'); END;
+CREATE TRIGGER IF NOT EXISTS pruefanweisungTextUnveraenderlich BEFORE UPDATE ON pruefanweisungText
+BEGIN SELECT RAISE(ABORT, 'Archiv ist nur anhängend'); END;
+CREATE TRIGGER IF NOT EXISTS pruefanweisungTextNichtLoeschbar BEFORE DELETE ON pruefanweisungText
+BEGIN SELECT RAISE(ABORT, 'Archiv ist nur anhängend'); END;
+CREATE TRIGGER IF NOT EXISTS bildUnveraenderlich BEFORE UPDATE ON bild
+BEGIN SELECT RAISE(ABORT, 'Archiv ist nur anhängend'); END;
+CREATE TRIGGER IF NOT EXISTS bildNichtLoeschbar BEFORE DELETE ON bild
+BEGIN SELECT RAISE(ABORT, 'Archiv ist nur anhängend'); END;
+"""
+
+_uebersichtSpalten = "id, archiviertAm, pruefanweisungPfad, namePruefobjekt, lagerort, nummer, einsatzbereit, pruefer, datum, datumIso, bemerkungen, pdfPfad"
+
+
+def _verbindung() -> sqlite3.Connection:
+    verbindungen = getattr(_lokal, "verbindungen", None)
+    if verbindungen is None:
+        verbindungen = _lokal.verbindungen = {}
+    verbindung = verbindungen.get(archivPfad)
+    if verbindung is None:
+        logger.info(f"Öffne Ergebnis-Archiv: {archivPfad}")
+        verzeichnis = os.path.dirname(archivPfad)
+        if verzeichnis:
+            os.makedirs(verzeichnis, exist_ok=True)
+        verbindung = sqlite3.connect(archivPfad)
+        verbindung.row_factory = sqlite3.Row
+        verbindung.execute("PRAGMA journal_mode=WAL")
+        verbindung.execute("PRAGMA synchronous=NORMAL")
+        verbindung.execute("PRAGMA foreign_keys=ON")
+        verbindung.executescript(_schema)
+        verbindungen[archivPfad] = verbindung
+    return verbindung
+
+def schliesseVerbindungen() -> None:
+    verbindungen = getattr(_lokal, "verbindungen", {})
+    for verbindung in verbindungen.values():
+        verbindung.close()
+    verbindungen.clear()
+
+def _datumIso(datum: str) -> Optional[str]:
+    """Datum der Sichtprüfung (TT.MM.JJJJ aus der Oberfläche oder JJJJ-MM-TT) als JJJJ-MM-TT."""
+    for datumsFormat in ("%d.%m.%Y", "%Y-%m-%d"):
+        try:
+            return datetime.datetime.strptime(datum.strip(), datumsFormat).date().isoformat()
+        except ValueError:
+            continue
+    logger.warning(f"Datum der Sichtprüfung nicht lesbar, wird nicht indiziert: {datum}")
+    return None
+
+def sichtpruefungAlsDict(sichtpruefung: Sichtpruefung) -> dict:
+    """Vollständige Momentaufnahme einer Sichtprüfung inkl. Prüfanweisung als JSON-fähiges Dict."""
+    pruefanweisung = sichtpruefung.pruefanweisung
+    return {
+        "pruefanweisungPfad": sichtpruefung.pruefanweisungPfad,
+        "pruefanweisung": None if pruefanweisung is None else {
+            "pfadVorschauBild": pruefanweisung.pfadVorschauBild,
+            "namePruefobjekt": pruefanweisung.namePruefobjekt,
+            "pruefart": pruefanweisung.pruefart,
+            "pruefvorgabe": pruefanweisung.pruefvorgabe,
+            "pruefvorgabeZusatz": pruefanweisung.pruefvorgabeZusatz,
+            "prueffrist": pruefanweisung.prueffrist,
+            "sachkundiger": pruefanweisung.sachkundiger,
+            "zusatzausbildung": pruefanweisung.zusatzausbildung,
+            "hersteller": pruefanweisung.hersteller,
+            "aussonderungsfrist": pruefanweisung.aussonderungsfrist,
+            "vorgabenText": pruefanweisung.vorgabenText,
+            "pruefablaufText": pruefanweisung.pruefablaufText,
+            "hinweis": pruefanweisung.hinweis,
+        },
+        "lagerort": sichtpruefung.lagerort,
+        "nummer": sichtpruefung.nummer,
+        "einsatzbereit": sichtpruefung.einsatzbereit,
+        "bemerkungen": sichtpruefung.bemerkungen,
+        "pruefer": sichtpruefung.pruefer,
+        "datum": sichtpruefung.datum,
+        "eigenschaftspruefungen": [{
+            "kategorie": pruefung.eigenschaft.kategorie,
+            "beschreibung": pruefung.eigenschaft.beschreibung,
+            "bilder": [list(bild) for bild in pruefung.eigenschaft.bilder],
+            "keinHandlungsbedarf": pruefung.keinHandlungsbedarf,
+            "massnahmen": pruefung.massnahmen,
+        } for pruefung in sichtpruefung.eigenschaftspruefungen],
+    }
+
+def _textSchluessel(vorgabenText: str, pruefablaufText: str) -> str:
+    return hashlib.sha256(json.dumps([vorgabenText, pruefablaufText], ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def _bildPfadeVon(daten: dict) -> list[str]:
+    """Alle Bilddateien, auf die eine archivierte Sichtprüfung verweist (Vorschau, Rich-Text, Eigenschaften)."""
+    bildPfade = []
+    pruefanweisung = daten.get("pruefanweisung")
+    if pruefanweisung is not None:
+        bildPfade.append(pruefanweisung.get("pfadVorschauBild"))
+        bildPfade += richText.bildPfade(pruefanweisung.get("vorgabenText") or "")
+        bildPfade += richText.bildPfade(pruefanweisung.get("pruefablaufText") or "")
+    bildPfade += [bild[0] for pruefung in daten.get("eigenschaftspruefungen", []) for bild in pruefung.get("bilder", [])]
+    return list(dict.fromkeys(os.path.normpath(bildPfad) for bildPfad in bildPfade if bildPfad))
+
+def sichtpruefungAusDict(daten: dict) -> Sichtpruefung:
+    sichtpruefung = Sichtpruefung()
+    sichtpruefung.pruefanweisungPfad = daten.get("pruefanweisungPfad", "")
+    if daten.get("pruefanweisung") is not None:
+        felder = daten["pruefanweisung"]
+        pruefanweisung = Pruefanweisung()
+        pruefanweisung.auswahlHinzufuegen(felder["pfadVorschauBild"], felder["namePruefobjekt"])
+        pruefanweisung.infosHinzufuegen(felder["pruefart"], felder["pruefvorgabe"], felder["pruefvorgabeZusatz"], felder["prueffrist"],
+                                        felder["sachkundiger"], felder["zusatzausbildung"], felder["hersteller"], felder["aussonderungsfrist"])
+        pruefanweisung.vorgabenHinzufuegen(felder["vorgabenText"])
+        pruefanweisung.pruefablaufHinzufuegen(felder["pruefablaufText"])
+        pruefanweisung.hinweisHinzufuegen(felder["hinweis"])
+        sichtpruefung.labelsBefuellen(pruefanweisung)
+    for pruefung in daten.get("eigenschaftspruefungen", []):
+        bilder = [tuple(bild) for bild in pruefung["bilder"]]
+        if sichtpruefung.pruefanweisung is not None:
+            sichtpruefung.pruefanweisung.eigenschaftHinzufuegen(pruefung["kategorie"], pruefung["beschreibung"], list(bilder))
+        sichtpruefung.eigenschaftspruefungen.append(Eigenschaftspruefung(
+            Eigenschaft(pruefung["kategorie"], pruefung["beschreibung"], bilder),
+            pruefung["keinHandlungsbedarf"], pruefung["massnahmen"]))
+    sichtpruefung.finalesErgebnisEinfuegen(daten["lagerort"], daten["nummer"], daten["einsatzbereit"],
+                                           daten["pruefer"], daten["datum"], daten["bemerkungen"])
+    return sichtpruefung
+
+def archiviereSichtpruefung(sichtpruefung: Sichtpruefung, pdfPfad: str = "") -> int:
+    """Hängt eine abgeschlossene Sichtprüfung an das Archiv an und gibt ihre Archiv-Id zurück."""
+    pruefanweisung = sichtpruefung.pruefanweisung
+    daten = sichtpruefungAlsDict(sichtpruefung)
+    bildPfade = _bildPfadeVon(daten)
+    texte = None
+    if daten["pruefanweisung"] is not None:
+        felder = daten["pruefanweisung"]
+        texte = (felder.pop("vorgabenText"), felder.pop("pruefablaufText"))
+        felder["textSchluessel"] = _textSchluessel(*texte)
+    verbindung = _verbindung()
+    with verbindung:
+        if texte is not None:
+            verbindung.execute("INSERT OR IGNORE INTO pruefanweisungText (schluessel, vorgabenText, pruefablaufText) VALUES (?, ?, ?)",
+                               (daten["pruefanweisung"]["textSchluessel"], *texte))
+        cursor = verbindung.execute(
+            "INSERT INTO sichtpruefung (archiviertAm, pruefanweisungPfad, namePruefobjekt, lagerort, nummer, einsatzbereit, "
+            "pruefer, datum, datumIso, bemerkungen, pdfPfad, daten) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (datetime.datetime.now().isoformat(timespec="seconds"), sichtpruefung.pruefanweisungPfad,
+             pruefanweisung.namePruefobjekt if pruefanweisung else "", sichtpruefung.lagerort, sichtpruefung.nummer,
+             int(sichtpruefung.einsatzbereit), sichtpruefung.pruefer, sichtpruefung.datum, _datumIso(sichtpruefung.datum),
+             sichtpruefung.bemerkungen, pdfPfad, json.dumps(daten, ensure_ascii=False))
+        )
+        sichtpruefungId = cursor.lastrowid
+        verbindung.executemany("INSERT INTO bild (sichtpruefungId, bildPfad) VALUES (?, ?)",
+                               [(sichtpruefungId, bildPfad) for bildPfad in bildPfade])
+        verbindung.executemany(
+            "INSERT INTO eigenschaftspruefung (sichtpruefungId, position, kategorie, beschreibung, keinHandlungsbedarf, massnahmen) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(sichtpruefungId, position, pruefung.eigenschaft.kategorie, pruefung.eigenschaft.beschreibung,
+              int(pruefung.keinHandlungsbedarf), pruefung.massnahmen)
+             for position, pruefung in enumerate(sichtpruefung.eigenschaftspruefungen)]
+        )
+    logger.info(f"Sichtprüfung archiviert: Id {sichtpruefungId} (Nummer {sichtpruefung.nummer}, Lagerort {sichtpruefung.lagerort})")
+    return sichtpruefungId
+
+def bildArchiviert(bildPfad: str) -> bool:
+    """Ob eine archivierte Sichtprüfung auf das Bild verweist. Solche Bilder dürfen nicht gelöscht werden."""
+    if not os.path.exists(archivPfad):
+        return False
+    return _verbindung().execute("SELECT 1 FROM bild WHERE bildPfad = ? LIMIT 1",
+                                 (os.path.normpath(bildPfad),)).fetchone() is not None
+
+def _suche(bedingung: str, parameter: tuple) -> list[dict]:
+    return [dict(zeile) for zeile in _verbindung().execute(
+        f"SELECT {_uebersichtSpalten} FROM sichtpruefung WHERE {bedingung} ORDER BY datumIso, id", parameter)]
+
+def sucheAlle() -> list[dict]:
+    return _suche("1 = 1", ())
+
+def sucheNachNummer(nummer: str) -> list[dict]:
+    return _suche("nummer = ?", (nummer,))
+
+def sucheNachLagerort(lagerort: str) -> list[dict]:
+    return _suche("lagerort = ?", (lagerort,))
+
+def sucheNachZeitraum(von: datetime.date, bis: datetime.date) -> list[dict]:
+    """Sichtprüfungen mit Datum zwischen `von` und `bis` (jeweils einschließlich)."""
+    return _suche("datumIso BETWEEN ? AND ?", (von.isoformat(), bis.isoformat()))
+
+def ladeEigenschaftspruefungen(sichtpruefungId: int) -> list[dict]:
+    return [dict(zeile) for zeile in _verbindung().execute(
+        "SELECT kategorie, beschreibung, keinHandlungsbedarf, massnahmen FROM eigenschaftspruefung "
+        "WHERE sichtpruefungId = ? ORDER BY position", (sichtpruefungId,))]
+
+def ladeSichtpruefung(sichtpruefungId: int) -> Optional[Sichtpruefung]:
+    """Stellt die archivierte Sichtprüfung (inkl. Prüfanweisung zum Zeitpunkt der Prüfung) wieder her."""
+    verbindung = _verbindung()
+    zeile = verbindung.execute("SELECT daten FROM sichtpruefung WHERE id = ?", (sichtpruefungId,)).fetchone()
+    if zeile is None:
+        return None
+    daten = json.loads(zeile["daten"])
+    felder = daten.get("pruefanweisung")
+    if felder is not None:
+        texte = verbindung.execute("SELECT vorgabenText, pruefablaufText FROM pruefanweisungText WHERE schluessel = ?",
+                                   (felder.pop("textSchluessel"),)).fetchone()
+        felder["vorgabenText"], felder["pruefablaufText"] = texte["vorgabenText"], texte["pruefablaufText"]
+    return sichtpruefungAusDict(daten)
@@ -7,6 +7,7 @@
 import logging
 from typing import TYPE_CHECKING, Optional
 from src.gui.pages import Page
+from src.logic.richText import bilderAuslagern
 from src.logic.serializer import addToPruefanweisungenXml, speicherePruefanweisungXml
 from src.models.pruefanweisung import Pruefanweisung
 from ui.ui_main import Ui_MainWindow
@@ -62,13 +63,13 @@ class PruefanweisungManager:
         self.pruefanweisung.infosHinzufuegen(pruefart, pruefvorgabe, pruefvorgabeZusatz, prueffrist, sachkundiger, zusatzausbildung, hersteller, aussonderungsfrist)
 
     def speicherePruefanweisungVorgaben(self) -> None:
-        vorgaben = self.ui.vorgabenTextEingeben.toHtml()
+        vorgaben = bilderAuslagern(self.ui.vorgabenTextEingeben.toHtml())
         if self.pruefanweisung is None:
             raise ValueError("Pruefanweisung wurde nicht initialisiert")
         self.pruefanweisung.vorgabenHinzufuegen(vorgaben)
 
     def speicherePruefanweisungPruefablauf(self) -> None:
-        pruefablauf = self.ui.pruefablaufTextEingeben.toHtml()
+        pruefablauf = bilderAuslagern(self.ui.pruefablaufTextEingeben.toHtml())
         if self.pruefanweisung is None:
             raise ValueError("Pruefanweisung wurde nicht initialisiert")
         self.pruefanweisung.pruefablaufHinzufuegen(pruefablauf)
@@ -0,0 +1,146 @@
+import os
+import re
+import base64
+import binascii
+import logging
+
+from src.logic import bildSpeicher
+
+logger = logging.getLogger(__name__)
+
+# <img ...>-Tags wie sie QTextEdit.toHtml() erzeugt, z.B. <img src="data:image/png;base64,..." width="300" />
+_imgTag = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+_srcAttribut = re.compile(r"""\bsrc\s*=\s*(["'])(.*?)\1""", re.IGNORECASE | re.DOTALL)
+_dataUri = re.compile(r"data:image/([a-z0-9.+-]+);base64,(.*)", re.IGNORECASE | re.DOTALL)
+_tag = re.compile(r"<(/?)([a-z][a-z0-9]*)\b[^>]*>", re.IGNORECASE)
+_kopf = re.compile(r"^.*?<body\b[^>]*>|<head\b.*?</head\s*>", re.IGNORECASE | re.DOTALL)
+# Tags, an denen ein neuer Block beginnt. Alles dazwischen ist Inline-Markup (b, i, span, font, ...).
+_blockTags = {"html", "body", "p", "div", "h1", "h2", "h3", "h4", "h5", "h6", "li", "ul", "ol",
+              "table", "tr", "td", "th", "blockquote", "pre", "hr", "br"}
+_aufzaehlungszeichen = ["•", "–", "·"]
+_leereTags = {"img", "input", "wbr", "col", "area"}
+
+
+def _srcErsetzen(imgTag: str, src: str) -> str:
+    return _srcAttribut.sub(lambda treffer: f"src={treffer.group(1)}{src}{treffer.group(1)}", imgTag, count=1)
+
+def bilderAuslagern(htmlText: str) -> str:
+    """Legt als data-URI eingebettete Bilder im Bildspeicher ab und ersetzt sie im HTML
+    durch den Dateipfad. Gleiche Bilder werden nur einmal abgelegt."""
+    if not htmlText or "data:image/" not in htmlText:
+        return htmlText
+
+    def ersetzen(treffer: re.Match) -> str:
+        imgTag = treffer.group(0)
+        src = _srcAttribut.search(imgTag)
+        dataUri = _dataUri.fullmatch(src.group(2).strip()) if src else None
+        if dataUri is None:
+            return imgTag
+        try:
+            daten = base64.b64decode(re.sub(r"\s+", "", dataUri.group(2)), validate=True)
+        except (binascii.Error, ValueError):
+            logger.warning("Eingebettetes Bild mit ungültigen base64-Daten bleibt unverändert")
+            return imgTag
+        pfad = bildSpeicher.speichereBildDaten(daten, "." + dataUri.group(1))
+        return _srcErsetzen(imgTag, pfad.replace(os.sep, "/"))
+
+    return _imgTag.sub(ersetzen, htmlText)
+
+def bilderAufloesen(htmlText: str) -> str:
+    """Macht relative Bildpfade absolut, damit Qt-Widgets sie unabhängig vom
+    Arbeitsverzeichnis des Dokuments finden."""
+    if not htmlText or "<img" not in htmlText.lower():
+        return htmlText
+
+    def aufloesen(treffer: re.Match) -> str:
+        imgTag = treffer.group(0)
+        src = _srcAttribut.search(imgTag)
+        if src is None or ":" in src.group(2) or os.path.isabs(src.group(2)):
+            return imgTag
+        return _srcErsetzen(imgTag, os.path.abspath(src.group(2)).replace(os.sep, "/"))
+
+    return _imgTag.sub(aufloesen, htmlText)
+
+def abschnitteMitBildern(htmlText: str) -> list[tuple[str, str]]:
+    """Zerlegt HTML an den <img>-Tags in ("text", html) und ("bild", pfad) Abschnitte,
+    z.B. für den PDF-Export. Bilder ohne lokalen Pfad (data-URI, URL) werden ausgelassen."""
+    abschnitte: list[tuple[str, str]] = []
+    position = 0
+    for treffer in _imgTag.finditer(htmlText or ""):
+        if treffer.start() > position:
+            abschnitte.append(("text", htmlText[position:treffer.start()]))
+        position = treffer.end()
+        src = _srcAttribut.search(treffer.group(0))
+        if src is None:
+            continue
+        pfad = src.group(2)
+        if pfad.startswith("file://"):
+            pfad = pfad[len("file://"):]
+        if ":" in pfad and not os.path.isabs(pfad):
+            logger.debug(f"Bild ohne lokalen Pfad wird übersprungen: {pfad[:40]}")
+            continue
+        abschnitte.append(("bild", pfad))
+    if position < len(htmlText or ""):
+        abschnitte.append(("text", htmlText[position:]))
+    return abschnitte
+
+def bildPfade(htmlText: str) -> list[str]:
+    """Lokale Bildpfade, auf die der Rich-Text verweist."""
+    return [inhalt for art, inhalt in abschnitteMitBildern(htmlText) if art == "bild"]
+
+def bloecke(htmlText: str) -> list[tuple[str, str, str]]:
+    """Zerlegt Rich-Text ohne Bilder (siehe abschnitteMitBildern) in Blöcke für den PDF-Export:
+    ("absatz", html, ""), ("punkt", html, Aufzählungszeichen) und ("leer", "", "") für Leerzeilen.
+    <br> beendet ebenfalls einen Block, der html-Teil enthält nur noch Inline-Markup. Über einen
+    Blockwechsel offene Inline-Tags (z.B. <b> über ein <br>) werden geschlossen und im nächsten
+    Block wieder geöffnet."""
+    text = _kopf.sub("", htmlText or "")
+    ergebnis: list[tuple[str, str, str]] = []
+    listen: list[list] = []  # Offene <ul>/<ol> mit Zähler
+    offen: list[tuple[str, str]] = []  # Offene Inline-Tags (Name, öffnender Tag)
+    offenAmAnfang: list[tuple[str, str]] = []
+    art, zeichen, position, leererAbsatz = "absatz", "", 0, False
+
+    for treffer in _tag.finditer(text):
+        name = treffer.group(2).lower()
+        if name not in _blockTags:
+            if treffer.group(1) == "/":
+                for stelle in range(len(offen) - 1, -1, -1):
+                    if offen[stelle][0] == name:
+                        del offen[stelle]
+                        break
+            elif name not in _leereTags and not treffer.group(0).endswith("/>"):
+                offen.append((name, treffer.group(0)))
+            continue
+        teil = text[position:treffer.start()]
+        position = treffer.end()
+        teilAnfang, offenAmAnfang = offenAmAnfang, list(offen)
+        if _tag.sub("", teil).strip():
+            teil = "".join(tag for _, tag in teilAnfang) + teil + "".join(f"</{tagName}>" for tagName, _ in reversed(offen))
+            ergebnis.append((art, teil, zeichen))
+            leererAbsatz = False
+            zeichen = ""  # Folgezeilen eines Listenpunkts nach <br> ohne Zeichen, aber eingerückt
+        schliessend = treffer.group(1) == "/"
+        if name in ("p", "h1", "h2", "h3", "h4", "h5", "h6", "div"):
+            if schliessend and leererAbsatz:
+                ergebnis.append(("leer", "", ""))
+            leererAbsatz = not schliessend
+        elif name in ("ul", "ol"):
+            if schliessend:
+                if listen:
+                    listen.pop()
+            else:
+                listen.append([name, 0])
+        elif name == "li" and not schliessend and listen:
+            liste = listen[-1]
+            liste[1] += 1
+            art = "punkt"
+            zeichen = f"{liste[1]}." if liste[0] == "ol" else _aufzaehlungszeichen[min(len(listen), 3) - 1]
+            continue
+        if name != "br":
+            art, zeichen = "absatz", ""
+
+    teil = text[position:]
+    if _tag.sub("", teil).strip():
+        ergebnis.append((art, "".join(tag for _, tag in offenAmAnfang) + teil, zeichen))
+    return ergebnis
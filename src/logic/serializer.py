@@ -1,22 +1,84 @@
 
+import copy
+import gzip
 import html
+import json
 import os
 import logging
+import threading
 import xml.etree.ElementTree as ET
+from typing import Optional
 
+from src.logic import bildReferenzen, ergebnisArchiv, richText, sqliteSpeicher
+from src.models.eigenschaft import Eigenschaft
+from src.models.eigenschaftpruefung import Eigenschaftspruefung
 from src.models.pruefanweisung import Pruefanweisung
 from src.models.sichtpruefung import Sichtpruefung
-from src.util import getUniqueFilename
+from src.util import LruCache, getUniqueFilename
 
 logger = logging.getLogger(__name__)
 
 pruefanweisungenDir = "data/pruefanweisungen"
 pruefanweisungenXmlPfad="data/pruefanweisungen.xml"
 
+# "xml": eine XML-Datei je Prüfanweisung plus Übersichts-XML, "sqlite": eine Datenbank (siehe sqliteSpeicher)
+speicherBackend = "xml"
+
+# Prozessinterner Cache der Übersicht. Gültig, solange (mtime, size, inode) von Übersichts-XML
+# und Journal unverändert sind; eigene Schreibzugriffe aktualisieren ihn direkt.
+_uebersichtCache: dict = {"pfad": None, "signatur": None, "eintraege": []}
+
+# Geparste Prüfanweisungen als Vorlagen, je Pfad mit (mtime, size, inode) der Datei. Grenzen
+# über pruefanweisungCacheMaxEintraege / pruefanweisungCacheMaxBytes in der config.yaml.
+_pruefanweisungCache = LruCache(maxEintraege=32, maxBytes=32 * 1024 * 1024)
+
+# Version des Dateiformats einzelner Prüfanweisungen. v1: Rich-Text zusätzlich mit html.escape
+# maskiert, v2: Rich-Text unverändert (nur von ElementTree maskiert), Attribut version="2".
+xmlFormatVersion = "2"
+
+# v2-Dateien gzip-komprimiert schreiben (Dateiname bleibt .xml, erkannt wird am Dateianfang)
+xmlKomprimieren = False
+
+# Unbenutzte Bilder nach dem Löschen im Hintergrund-Thread entfernen (False: sofort, z.B. in Tests)
+bilderImHintergrundAufraeumen = True
+
+# Änderungen an der Übersicht werden als JSON-Zeilen in "<Übersicht>.journal" angehängt und
+# ab dieser Größe in die Übersichts-XML zurückgefaltet.
+journalMaxBytes = 64 * 1024
+
+
+def konfiguriereSpeicher(config: dict) -> None:
+    """Übernimmt die Speicher-Einstellungen aus der config.yaml."""
+    global speicherBackend, xmlKomprimieren
+    backend = config.get("speicherBackend", "xml")
+    if backend not in ("xml", "sqlite"):
+        raise ValueError(f"Unbekanntes Speicher-Backend: {backend}")
+    speicherBackend = backend
+    sqliteSpeicher.datenbankPfad = config.get("datenbankPfad", sqliteSpeicher.datenbankPfad)
+    _pruefanweisungCache.maxEintraege = config.get("pruefanweisungCacheMaxEintraege", _pruefanweisungCache.maxEintraege)
+    _pruefanweisungCache.maxBytes = config.get("pruefanweisungCacheMaxBytes", _pruefanweisungCache.maxBytes)
+    xmlKomprimieren = bool(config.get("pruefanweisungenKomprimieren", xmlKomprimieren))
+    _pruefanweisungCache.leeren()
+    logger.info(f"Speicher-Backend: {speicherBackend}")
+
+def _speicherePruefanweisungSqlite(pruefanweisung: Pruefanweisung) -> str:
+    base, ext = os.path.splitext(f"{pruefanweisung.namePruefobjekt}.xml")
+    filePath = os.path.join(pruefanweisungenDir, base + ext)
+    counter = 1
+    while sqliteSpeicher.pfadVergeben(filePath):
+        filePath = os.path.join(pruefanweisungenDir, f"{base}_{counter}{ext}")
+        counter += 1
+    try:
+        sqliteSpeicher.speicherePruefanweisung(pruefanweisung, filePath)
+        logger.info(f"Prüfanweisung erfolgreich in Datenbank gespeichert: {filePath}")
+        _bildReferenzenSetzen(pruefanweisung, filePath)
+        return filePath
+    except Exception as e:
+        logger.error(f"Fehler beim Speichern der Prüfanweisung: {e}", exc_info=True)
+        raise
 
-def speicherePruefanweisungXml(pruefanweisung: Pruefanweisung):
-    logger.info(f"Speichere Prüfanweisung: {pruefanweisung.namePruefobjekt}")
-    root = ET.Element("Pruefanweisung")
+def _pruefanweisungXmlElement(pruefanweisung: Pruefanweisung) -> ET.Element:
+    root = ET.Element("Pruefanweisung", version=xmlFormatVersion)
     ET.SubElement(root, "Name").text = pruefanweisung.namePruefobjekt
     ET.SubElement(root, "VorschauBildPfad").text = pruefanweisung.pfadVorschauBild
     ET.SubElement(root, "Pruefart").text = pruefanweisung.pruefart
@@ -27,8 +89,8 @@ def speicherePruefanweisungXml(pruefanweisung: Pruefanweisung):
     ET.SubElement(root, "Zusatzausbildung").text = pruefanweisung.zusatzausbildung
     ET.SubElement(root, "Hersteller").text = pruefanweisung.hersteller
     ET.SubElement(root, "Aussonderungsfrist").text = pruefanweisung.aussonderungsfrist
-    ET.SubElement(root, "VorgabenText").text = html.escape(pruefanweisung.vorgabenText)
-    ET.SubElement(root, "PruefablaufText").text = html.escape(pruefanweisung.pruefablaufText)
+    ET.SubElement(root, "VorgabenText").text = pruefanweisung.vorgabenText
+    ET.SubElement(root, "PruefablaufText").text = pruefanweisung.pruefablaufText
 
     eigenschaftenElement = ET.SubElement(root, "Eigenschaften")
     logger.debug(f"Speichere {len(pruefanweisung.eigenschaften)} Eigenschaften")
@@ -43,8 +105,26 @@ def speicherePruefanweisungXml(pruefanweisung: Pruefanweisung):
             ET.SubElement(bildElement, "BildBeschreibung").text = bildBeschreibung
             
     ET.SubElement(root, "Hinweis").text = pruefanweisung.hinweis
+    return root
+
+def _schreibePruefanweisungXml(pruefanweisung: Pruefanweisung, filePath: str, komprimieren: bool) -> None:
+    tree = ET.ElementTree(_pruefanweisungXmlElement(pruefanweisung))
+    if komprimieren:
+        with gzip.open(filePath, "wb") as datei:
+            tree.write(datei, encoding="utf-8", xml_declaration=True)
+    else:
+        tree.write(filePath, encoding="utf-8", xml_declaration=True)
+
+def _oeffnePruefanweisungXml(xmlPfad: str):
+    """Öffnet eine Prüfanweisungs-XML binär, gzip-komprimierte Dateien werden transparent entpackt."""
+    with open(xmlPfad, "rb") as datei:
+        komprimiert = datei.read(2) == b"\x1f\x8b"
+    return gzip.open(xmlPfad, "rb") if komprimiert else open(xmlPfad, "rb")
 
-    tree = ET.ElementTree(root)
+def speicherePruefanweisungXml(pruefanweisung: Pruefanweisung):
+    logger.info(f"Speichere Prüfanweisung: {pruefanweisung.namePruefobjekt}")
+    if speicherBackend == "sqlite":
+        return _speicherePruefanweisungSqlite(pruefanweisung)
     namePruefobjekt = pruefanweisung.namePruefobjekt
     fileName = f"{namePruefobjekt}.xml"
     fileName = getUniqueFilename(pruefanweisungenDir, fileName)
@@ -52,151 +132,448 @@ def speicherePruefanweisungXml(pruefanweisung: Pruefanweisung):
     
     try:
         os.makedirs(pruefanweisungenDir, exist_ok=True)
-        tree.write(filePath, encoding="utf-8", xml_declaration=True)
+        _schreibePruefanweisungXml(pruefanweisung, filePath, xmlKomprimieren)
         logger.info(f"Prüfanweisung erfolgreich gespeichert: {filePath}")
+        _bildReferenzenSetzen(pruefanweisung, filePath)
         return filePath
     except Exception as e:
         logger.error(f"Fehler beim Speichern der Prüfanweisung: {e}", exc_info=True)
         raise
 
+def _pruefanweisungKopieren(vorlage: Pruefanweisung) -> Pruefanweisung:
+    pruefanweisung = copy.copy(vorlage)
+    pruefanweisung.eigenschaften = [e.kopieren() for e in vorlage.eigenschaften]
+    return pruefanweisung
+
+def sichtpruefungAusPruefanweisung(pruefanweisung: Pruefanweisung, pruefanweisungPfad: str = "") -> Sichtpruefung:
+    sichtpruefung = Sichtpruefung()
+    sichtpruefung.pruefanweisungPfad = pruefanweisungPfad
+    for eigenschaft in pruefanweisung.eigenschaften:
+        sichtpruefung.eigenschaftspruefungen.append(Eigenschaftspruefung(eigenschaft.kopieren()))
+    sichtpruefung.labelsBefuellen(pruefanweisung)
+    return sichtpruefung
+
+def _text(element: ET.Element, tag: str, standard: str = "") -> str:
+    """Text des Kindelements `tag`, `standard` wenn das Element fehlt oder leer ist."""
+    kind = element.find(tag)
+    if kind is None or kind.text is None:
+        return standard
+    return kind.text
+
+# Direkte Kindelemente von <Pruefanweisung>, die beim Öffnen sofort gelesen werden
+_infoTags = ["Name", "VorschauBildPfad", "Pruefart", "Pruefvorgabe", "PruefvorgabeZusatz", "Prueffrist",
+             "Sachkundiger", "Zusatzausbildung", "Hersteller", "Aussonderungsfrist", "Hinweis"]
+
+class _AufgeschobeneAbschnitte:
+    """Vorgaben-, Prüfablauftext und Bilder einer Prüfanweisungs-XML. Sie werden erst beim
+    ersten Zugriff gelesen, einmal für die Vorlage im Cache und alle ihre Kopien. Schlägt das
+    Lesen fehl, wird der Fehler weitergereicht und beim nächsten Zugriff erneut gelesen."""
+
+    def __init__(self, xmlPfad: str, signatur: Optional[tuple[int, int, int]]) -> None:
+        self.xmlPfad = xmlPfad
+        self.signatur = signatur
+        # (Kategorie, Beschreibung) je Eigenschaft beim Öffnen; die Bilder werden über die Position zugeordnet
+        self.eigenschaften: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._texte: Optional[dict[str, str]] = None
+        self._bilder: list[list[tuple[str, str]]] = []
+
+    def __deepcopy__(self, memo: dict) -> "_AufgeschobeneAbschnitte":
+        # Auch tiefe Kopien (z.B. für den PDF-Worker) teilen sich den Nachlader
+        return self
+
+    def _laden(self) -> None:
+        with self._lock:
+            if self._texte is not None:
+                return
+            logger.debug(f"Lade Texte und Bilder nach: {self.xmlPfad}")
+            try:
+                texte, bilder, eigenschaften = self._lesen()
+                if _dateiSignatur(self.xmlPfad) != self.signatur:
+                    if eigenschaften != self.eigenschaften:
+                        raise ValueError(f"Prüfanweisung-XML wurde seit dem Öffnen verändert, "
+                                         f"die Eigenschaften passen nicht mehr: {self.xmlPfad}")
+                    logger.warning(f"Prüfanweisung-XML wurde seit dem Öffnen verändert, Eigenschaften unverändert: {self.xmlPfad}")
+            except Exception as e:
+                # Nichts merken: Vorlage und Kopien teilen sich den Nachlader, der nächste Zugriff
+                # soll es erneut versuchen statt dauerhaft leere Texte und Bilder zu liefern
+                _pruefanweisungCache.entfernen(self.xmlPfad)
+                logger.error(f"Fehler beim Nachladen der Prüfanweisung {self.xmlPfad}: {e}", exc_info=True)
+                raise
+            self._bilder = bilder
+            self._texte = texte
+
+    def _lesen(self) -> tuple[dict[str, str], list[list[tuple[str, str]]], list[tuple[str, str]]]:
+        texte = {"vorgabenText": "", "pruefablaufText": ""}
+        bilder: list[list[tuple[str, str]]] = []
+        eigenschaften: list[tuple[str, str]] = []
+        eigenschaftBilder = []
+        with _oeffnePruefanweisungXml(self.xmlPfad) as datei:
+            ereignisse = ET.iterparse(datei, events=("start", "end"))
+            _, root = next(ereignisse)
+            # Version aus der Datei selbst: v1 hat den Rich-Text vor dem Schreiben zusätzlich maskiert
+            entschluesseln = html.unescape if root.get("version", "1") == "1" else str
+            for ereignis, element in ereignisse:
+                if ereignis == "start":
+                    continue
+                if element.tag == "VorgabenText":
+                    texte["vorgabenText"] = entschluesseln(element.text or "")
+                elif element.tag == "PruefablaufText":
+                    texte["pruefablaufText"] = entschluesseln(element.text or "")
+                elif element.tag == "Bild":
+                    eigenschaftBilder.append((_text(element, "BildPfad"), _text(element, "BildBeschreibung")))
+                elif element.tag == "Eigenschaft":
+                    eigenschaften.append((_text(element, "Kategorie"), _text(element, "Beschreibung")))
+                    bilder.append(eigenschaftBilder)
+                    eigenschaftBilder = []
+                    element.clear()
+        return texte, bilder, eigenschaften
+
+    def text(self, name: str) -> str:
+        self._laden()
+        return self._texte[name]
+
+    def bilder(self, index: int) -> list[tuple[str, str]]:
+        self._laden()
+        return list(self._bilder[index]) if index < len(self._bilder) else []
+
+def _ladePruefanweisungStreaming(xmlPfad: str, signatur: Optional[tuple[int, int, int]]) -> Pruefanweisung:
+    """Liest eine Prüfanweisungs-XML mit iterparse. Vorgaben- und Prüfablauftext sowie die Bilder
+    der Eigenschaften werden übersprungen und erst beim ersten Zugriff nachgeladen."""
+    felder: dict[str, str] = {}
+    eigenschaften: list[Eigenschaft] = []
+    with _oeffnePruefanweisungXml(xmlPfad) as datei:
+        ereignisse = ET.iterparse(datei, events=("start", "end"))
+        _, root = next(ereignisse)
+        abschnitte = _AufgeschobeneAbschnitte(xmlPfad, signatur)
+        for ereignis, element in ereignisse:
+            if ereignis == "start":
+                continue
+            if element.tag == "Eigenschaft":
+                bilderLader = lambda index=len(eigenschaften): abschnitte.bilder(index)
+                eigenschaften.append(Eigenschaft(_text(element, "Kategorie"), _text(element, "Beschreibung"), bilderLader=bilderLader))
+                abschnitte.eigenschaften.append((eigenschaften[-1].kategorie, eigenschaften[-1].beschreibung))
+                element.clear()
+            elif element.tag in ("VorgabenText", "PruefablaufText", "Bilder"):
+                element.clear()
+            elif element.tag in _infoTags and element.tag not in felder:
+                felder[element.tag] = element.text or ""
+
+    pruefanweisung = Pruefanweisung()
+    pruefanweisung.auswahlHinzufuegen(felder.get("VorschauBildPfad", ""), felder.get("Name", ""))
+    pruefanweisung.infosHinzufuegen(*[felder.get(tag, "") for tag in _infoTags[2:10]])
+    pruefanweisung.texteNachladbar(abschnitte.text)
+    pruefanweisung.eigenschaften = eigenschaften
+    pruefanweisung.hinweisHinzufuegen(felder.get("Hinweis", ""))
+    return pruefanweisung
+
 def ladePruefanweisungXml(xmlPfad):
+    if speicherBackend == "sqlite":
+        logger.info(f"Lade Prüfanweisung aus Datenbank: {xmlPfad}")
+        pruefanweisung = sqliteSpeicher.ladePruefanweisung(xmlPfad)
+        if pruefanweisung is None:
+            raise FileNotFoundError(f"Prüfanweisung nicht in der Datenbank gefunden: {xmlPfad}")
+        return sichtpruefungAusPruefanweisung(pruefanweisung, xmlPfad)
+
+    signatur = _dateiSignatur(xmlPfad)
+    zwischengespeichert = _pruefanweisungCache.get(xmlPfad)
+    if signatur is not None and zwischengespeichert is not None and zwischengespeichert[0] == signatur:
+        logger.debug(f"Prüfanweisung aus Cache: {xmlPfad}")
+        return sichtpruefungAusPruefanweisung(_pruefanweisungKopieren(zwischengespeichert[1]), xmlPfad)
+
     logger.info(f"Lade Prüfanweisung aus XML: {xmlPfad}")
     try:
-        with open(xmlPfad, "r", encoding="utf-8") as file:
-            xmlInhalt = file.read()
-        
-        root = ET.fromstring(xmlInhalt)  # XML parsen
-        logger.debug(f"XML erfolgreich geparst: {xmlPfad}")
-
-        sichtpruefung = Sichtpruefung()
-
-        # Tags richtig auslesen
-        namePruefobjekt = root.find("Name").text
-        pfadVorschauBild = root.find("VorschauBildPfad").text
-        pruefart = root.find("Pruefart").text
-        pruefvorgabe = root.find("Pruefvorgabe").text
-        pruefvorgabeZusatz = root.find("PruefvorgabeZusatz").text
-        prueffrist = root.find("Prueffrist").text
-        sachkundiger = root.find("Sachkundiger").text
-        zusatzausbildung = root.find("Zusatzausbildung").text
-        hersteller = root.find("Hersteller").text
-        aussonderungsfrist = root.find("Aussonderungsfrist").text
-        vorgabenText = html.unescape(root.find("VorgabenText").text)
-        pruefablaufText = html.unescape(root.find("PruefablaufText").text)
-
-        pruefanweisung = Pruefanweisung()
-        pruefanweisung.auswahlHinzufuegen(pfadVorschauBild, namePruefobjekt)
-        pruefanweisung.infosHinzufuegen(pruefart, pruefvorgabe, pruefvorgabeZusatz, prueffrist, sachkundiger, zusatzausbildung, hersteller, aussonderungsfrist)
-        pruefanweisung.vorgabenHinzufuegen(vorgabenText)
-        pruefanweisung.pruefablaufHinzufuegen(pruefablaufText)
-
-        eigenschaften = root.find("Eigenschaften")
-        eigenschafts_count = 0
-        for eigenschaft in eigenschaften.findall("Eigenschaft"):
-            kategorie = eigenschaft.find("Kategorie").text
-            beschreibung = eigenschaft.find("Beschreibung").text
-
-            eigenschaftBilder = []
-            bilder = eigenschaft.find("Bilder")
-            for bild in bilder.findall("Bild"):
-                bildPfad = bild.find("BildPfad").text
-                bildBeschreibung = bild.find("BildBeschreibung").text
-                eigenschaftBilder.append((bildPfad, bildBeschreibung))
-
-            sichtpruefung.eigenschaftspruefungHinzufuegen(kategorie, beschreibung, eigenschaftBilder)
-            eigenschafts_count += 1
-            logger.debug(f"Eigenschaft geladen: {kategorie} ({len(eigenschaftBilder)} Bilder)")
-            
-        hinweis = root.find("Hinweis").text
-        pruefanweisung.hinweisHinzufuegen(hinweis)
-        sichtpruefung.labelsBefuellen(pruefanweisung)
+        pruefanweisung = _ladePruefanweisungStreaming(xmlPfad, signatur)
+        if signatur is not None:
+            _pruefanweisungCache.put(xmlPfad, (signatur, pruefanweisung), signatur[1])
+        sichtpruefung = sichtpruefungAusPruefanweisung(_pruefanweisungKopieren(pruefanweisung), xmlPfad)
 
-        logger.info(f"Prüfanweisung erfolgreich geladen: {pruefanweisung.namePruefobjekt} ({eigenschafts_count} Eigenschaften)")
+        logger.info(f"Prüfanweisung erfolgreich geladen: {pruefanweisung.namePruefobjekt} ({len(pruefanweisung.eigenschaften)} Eigenschaften)")
         return sichtpruefung
     except Exception as e:
         logger.error(f"Fehler beim Laden der XML-Datei: {e}", exc_info=True)
         raise
 
-def addToPruefanweisungenXml(pruefanweisung: Pruefanweisung, pruefanweisungXmlPfad: str):
-    logger.info(f"Füge Prüfanweisung zur Übersichts-XML hinzu: {pruefanweisung.namePruefobjekt}")
+def _dateiSignatur(pfad: str) -> Optional[tuple[int, int, int]]:
     try:
-        tree = ET.parse(pruefanweisungenXmlPfad)
-        root = tree.getroot()
-        logger.debug(f"Bestehende Prüfanweisungen-XML geladen: {pruefanweisungenXmlPfad}")
+        stat = os.stat(pfad)
     except FileNotFoundError:
-        logger.info(f"Prüfanweisungen-XML nicht gefunden, erstelle neue Datei: {pruefanweisungenXmlPfad}")
-        root = ET.Element("Pruefanweisungen")
-        tree = ET.ElementTree(root)
-
-    # Neue Prüfanweisung erstellen
-    pruefanweisungElement = ET.SubElement(root, "Pruefanweisung")
-    ET.SubElement(pruefanweisungElement, "Name").text = pruefanweisung.namePruefobjekt
-    ET.SubElement(pruefanweisungElement, "VorschauBildPfad").text = pruefanweisung.pfadVorschauBild
-    ET.SubElement(pruefanweisungElement, "PruefanweisungXmlPfad").text = pruefanweisungXmlPfad
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+def _journalPfad() -> str:
+    return os.path.splitext(pruefanweisungenXmlPfad)[0] + ".journal"
+
+def _uebersichtSignatur() -> tuple:
+    return (_dateiSignatur(pruefanweisungenXmlPfad), _dateiSignatur(_journalPfad()))
+
+def _uebersichtCacheSetzen(eintraege: list[dict]) -> None:
+    _uebersichtCache["pfad"] = pruefanweisungenXmlPfad
+    _uebersichtCache["signatur"] = _uebersichtSignatur()
+    _uebersichtCache["eintraege"] = eintraege
+
+def _uebersichtCacheGueltig(signatur: tuple) -> bool:
+    return (signatur != (None, None)
+            and _uebersichtCache["pfad"] == pruefanweisungenXmlPfad
+            and _uebersichtCache["signatur"] == signatur)
+
+def uebersichtCacheLeeren() -> None:
+    _uebersichtCache["pfad"] = None
+    _uebersichtCache["signatur"] = None
+    _uebersichtCache["eintraege"] = []
+
+def _uebersichtEintrag(pruefanweisung: Pruefanweisung, pruefanweisungXmlPfad: str) -> dict:
+    return {
+        "Name": pruefanweisung.namePruefobjekt,
+        "VorschauBildPfad": pruefanweisung.pfadVorschauBild,
+        "PruefanweisungXmlPfad": pruefanweisungXmlPfad
+    }
+
+def _journalEintragAnwenden(eintraege: list[dict], journalEintrag: dict) -> None:
+    """Wendet einen Journal-Eintrag auf die Übersicht an. Einträge sind über ihren
+    PruefanweisungXmlPfad eindeutig, dadurch ist das Wiederholen eines Eintrags harmlos."""
+    pfad = journalEintrag["PruefanweisungXmlPfad"]
+    position = next((i for i, eintrag in enumerate(eintraege) if eintrag["PruefanweisungXmlPfad"] == pfad), None)
+    if journalEintrag["aktion"] == "hinzufuegen":
+        eintrag = {schluessel: journalEintrag.get(schluessel) for schluessel in ("Name", "VorschauBildPfad", "PruefanweisungXmlPfad")}
+        if position is None:
+            eintraege.append(eintrag)
+        else:
+            eintraege[position] = eintrag
+    elif journalEintrag["aktion"] == "entfernen" and position is not None:
+        del eintraege[position]
+
+def _ladeSnapshot() -> list[dict]:
+    try:
+        root = ET.parse(pruefanweisungenXmlPfad).getroot()
+    except FileNotFoundError:
+        return []
+    eintraege = []
+    for pruefanweisung in root.findall("Pruefanweisung"):
+        eintraege.append({
+            "Name": pruefanweisung.find("Name").text,
+            "VorschauBildPfad": pruefanweisung.find("VorschauBildPfad").text,
+            "PruefanweisungXmlPfad": pruefanweisung.find("PruefanweisungXmlPfad").text
+        })
+    return eintraege
+
+def _journalAbspielen(eintraege: list[dict]) -> int:
+    try:
+        with open(_journalPfad(), "r", encoding="utf-8") as journal:
+            zeilen = journal.readlines()
+    except FileNotFoundError:
+        return 0
+    for zeilenNummer, zeile in enumerate(zeilen, start=1):
+        if not zeile.strip():
+            continue
+        try:
+            _journalEintragAnwenden(eintraege, json.loads(zeile))
+        except (ValueError, KeyError):
+            # Unvollständig geschriebene Zeile, z.B. nach einem Absturz beim Anhängen
+            logger.warning(f"Ungültiger Journal-Eintrag in Zeile {zeilenNummer} wird übersprungen: {_journalPfad()}")
+    return len(zeilen)
+
+def _schreibeSnapshot(eintraege: list[dict]) -> None:
+    root = ET.Element("Pruefanweisungen")
+    for eintrag in eintraege:
+        pruefanweisungElement = ET.SubElement(root, "Pruefanweisung")
+        ET.SubElement(pruefanweisungElement, "Name").text = eintrag["Name"]
+        ET.SubElement(pruefanweisungElement, "VorschauBildPfad").text = eintrag["VorschauBildPfad"]
+        ET.SubElement(pruefanweisungElement, "PruefanweisungXmlPfad").text = eintrag["PruefanweisungXmlPfad"]
+    verzeichnis = os.path.dirname(pruefanweisungenXmlPfad)
+    if verzeichnis:
+        os.makedirs(verzeichnis, exist_ok=True)
+    tmpPfad = pruefanweisungenXmlPfad + ".tmp"
+    ET.ElementTree(root).write(tmpPfad, encoding="utf-8", xml_declaration=True)
+    os.replace(tmpPfad, pruefanweisungenXmlPfad)
+
+def _aktuelleEintraege() -> list[dict]:
+    if _uebersichtCacheGueltig(_uebersichtSignatur()):
+        return [dict(eintrag) for eintrag in _uebersichtCache["eintraege"]]
+    eintraege = _ladeSnapshot()
+    _journalAbspielen(eintraege)
+    return eintraege
+
+def kompaktierePruefanweisungenJournal() -> None:
+    """Faltet das Journal in die Übersichts-XML (Snapshot) und entfernt es anschließend.
+    Stürzt das Programm zwischen beiden Schritten ab, wird das Journal beim nächsten Laden
+    erneut angewendet, was durch die eindeutigen Pfade keine Duplikate erzeugt."""
+    logger.info(f"Kompaktiere Prüfanweisungen-Journal in: {pruefanweisungenXmlPfad}")
+    eintraege = _aktuelleEintraege()
+    _schreibeSnapshot(eintraege)
+    if os.path.exists(_journalPfad()):
+        os.remove(_journalPfad())
+    _uebersichtCacheSetzen(eintraege)
+    logger.debug(f"Journal kompaktiert, {len(eintraege)} Prüfanweisungen im Snapshot")
+
+def _journalEintragAnhaengen(journalEintrag: dict) -> None:
+    signaturVorher = _uebersichtSignatur()
+    if signaturVorher[0] is None:
+        # Ohne Snapshot wird direkt kompaktiert, damit die Übersichts-XML immer existiert
+        eintraege = _aktuelleEintraege()
+        _journalEintragAnwenden(eintraege, journalEintrag)
+        _schreibeSnapshot(eintraege)
+        if os.path.exists(_journalPfad()):
+            os.remove(_journalPfad())
+        _uebersichtCacheSetzen(eintraege)
+        return
+
+    cacheGueltig = _uebersichtCacheGueltig(signaturVorher)
+    zeile = (json.dumps(journalEintrag, ensure_ascii=False) + "\n").encode("utf-8")
+    with open(_journalPfad(), "a+b") as journal:
+        # Endet das Journal nach einem Absturz mitten in einer Zeile, würde der neue Eintrag
+        # sonst mit ihr zu einer ungültigen Zeile verschmelzen und beim Laden verloren gehen
+        if journal.seek(0, os.SEEK_END) > 0:
+            journal.seek(-1, os.SEEK_END)
+            if journal.read(1) != b"\n":
+                zeile = b"\n" + zeile
+        journal.write(zeile)
+    if cacheGueltig:
+        _journalEintragAnwenden(_uebersichtCache["eintraege"], journalEintrag)
+        _uebersichtCache["signatur"] = _uebersichtSignatur()
+    else:
+        uebersichtCacheLeeren()
+
+    if os.path.getsize(_journalPfad()) > journalMaxBytes:
+        kompaktierePruefanweisungenJournal()
 
+def addToPruefanweisungenXml(pruefanweisung: Pruefanweisung, pruefanweisungXmlPfad: str):
+    logger.info(f"Füge Prüfanweisung zur Übersicht hinzu: {pruefanweisung.namePruefobjekt}")
+    if speicherBackend == "sqlite":
+        # Die Tabelle pruefanweisung ist selbst die Übersicht
+        logger.debug("Übersicht wird von der Datenbank geführt, nichts zu tun")
+        return
+    journalEintrag = {"aktion": "hinzufuegen", **_uebersichtEintrag(pruefanweisung, pruefanweisungXmlPfad)}
     try:
-        tree.write(pruefanweisungenXmlPfad, encoding="utf-8", xml_declaration=True)
-        logger.info(f"Prüfanweisung erfolgreich zur Übersichts-XML hinzugefügt")
+        _journalEintragAnhaengen(journalEintrag)
+        logger.info(f"Prüfanweisung erfolgreich zur Übersicht hinzugefügt")
     except Exception as e:
-        logger.error(f"Fehler beim Schreiben der Prüfanweisungen-XML: {e}", exc_info=True)
+        uebersichtCacheLeeren()
+        logger.error(f"Fehler beim Schreiben der Prüfanweisungen-Übersicht: {e}", exc_info=True)
         raise
 
 def ladePruefanweisungenXml():
-    logger.info(f"Lade Prüfanweisungen-Übersicht aus: {pruefanweisungenXmlPfad}")
-    try:
-        tree = ET.parse(pruefanweisungenXmlPfad)
-        root = tree.getroot()
-
-        pruefanweisungen = []
-        for pruefanweisung in root.findall("Pruefanweisung"):
-            name = pruefanweisung.find("Name").text
-            vorschau_bild = pruefanweisung.find("VorschauBildPfad").text
-            pfad = pruefanweisung.find("PruefanweisungXmlPfad").text
-            pruefanweisungen.append({
-                "Name": name,
-                "VorschauBildPfad": vorschau_bild,
-                "PruefanweisungXmlPfad": pfad
-            })
-
-        logger.info(f"{len(pruefanweisungen)} Prüfanweisungen geladen")
-        return pruefanweisungen
-    except FileNotFoundError:
+    if speicherBackend == "sqlite":
+        try:
+            pruefanweisungen = sqliteSpeicher.ladeUebersicht()
+            logger.info(f"{len(pruefanweisungen)} Prüfanweisungen aus Datenbank geladen")
+            return pruefanweisungen
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der Prüfanweisungen aus der Datenbank: {e}", exc_info=True)
+            return []
+
+    signatur = _uebersichtSignatur()
+    if _uebersichtCacheGueltig(signatur):
+        logger.debug(f"Prüfanweisungen-Übersicht aus Cache: {pruefanweisungenXmlPfad}")
+        return [dict(eintrag) for eintrag in _uebersichtCache["eintraege"]]
+    if signatur == (None, None):
+        uebersichtCacheLeeren()
         logger.warning(f"Prüfanweisungen-XML nicht gefunden: {pruefanweisungenXmlPfad}")
         return []
+
+    logger.info(f"Lade Prüfanweisungen-Übersicht aus: {pruefanweisungenXmlPfad}")
+    try:
+        pruefanweisungen = _ladeSnapshot()
+        anzahlJournalEintraege = _journalAbspielen(pruefanweisungen)
+        _uebersichtCache["pfad"] = pruefanweisungenXmlPfad
+        _uebersichtCache["signatur"] = signatur
+        _uebersichtCache["eintraege"] = pruefanweisungen
+
+        logger.info(f"{len(pruefanweisungen)} Prüfanweisungen geladen ({anzahlJournalEintraege} Journal-Einträge)")
+        return [dict(eintrag) for eintrag in pruefanweisungen]
     except Exception as e:
         logger.error(f"Fehler beim Laden der Prüfanweisungen-XML: {e}", exc_info=True)
         return []
 
 
+def _bildReferenzenPfad() -> str:
+    basis = sqliteSpeicher.datenbankPfad if speicherBackend == "sqlite" else pruefanweisungenXmlPfad
+    return os.path.splitext(basis)[0] + ".bilder.json"
+
+def bildReferenzIndex() -> bildReferenzen.BildReferenzIndex:
+    """Referenzindex der Bilder für das aktuelle Speicher-Backend. Bilder archivierter
+    Sichtprüfungen bleiben erhalten, auch wenn keine Prüfanweisung mehr auf sie verweist."""
+    index = bildReferenzen.index(_bildReferenzenPfad())
+    index.externReferenziert = ergebnisArchiv.bildArchiviert
+    return index
+
+def bildPfadeVon(pruefanweisung: Pruefanweisung) -> list[str]:
+    """Alle Bilddateien, auf die eine Prüfanweisung verweist (Vorschau, Eigenschaften, Rich-Text)."""
+    bildPfade = [pruefanweisung.pfadVorschauBild]
+    bildPfade += [bildPfad for eigenschaft in pruefanweisung.eigenschaften for bildPfad, _ in eigenschaft.bilder]
+    bildPfade += richText.bildPfade(pruefanweisung.vorgabenText) + richText.bildPfade(pruefanweisung.pruefablaufText)
+    return [bildPfad for bildPfad in bildPfade if bildPfad]
+
+def _bildReferenzenSetzen(pruefanweisung: Pruefanweisung, pfad: str) -> None:
+    # Ohne Index enthält ihn der spätere Aufbau (Programmstart, erstes Löschen) auch mit dieser Datei
+    index = bildReferenzIndex()
+    if index.vorhanden() or index.imAufbau():
+        index.referenzenSetzen(pfad, bildPfadeVon(pruefanweisung))
+
+def _bildReferenzenErmitteln() -> dict[str, list[str]]:
+    logger.info(f"Ermittle Bildverweise aller Prüfanweisungen für {_bildReferenzenPfad()}")
+    referenzen = {}
+    for eintrag in ladePruefanweisungenXml():
+        pfad = eintrag["PruefanweisungXmlPfad"]
+        try:
+            referenzen[pfad] = bildPfadeVon(ladePruefanweisungXml(pfad).pruefanweisung)
+        except Exception:
+            logger.warning(f"Bilder der Prüfanweisung konnten nicht ermittelt werden: {pfad}", exc_info=True)
+    return referenzen
+
+def bildReferenzIndexBereitstellen() -> bildReferenzen.BildReferenzIndex:
+    """Referenzindex des aktuellen Backends. Fehlt er, wird er aus allen Prüfanweisungen
+    aufgebaut: im Hintergrund, wenn auch im Hintergrund aufgeräumt wird, sonst sofort."""
+    index = bildReferenzIndex()
+    if not index.vorhanden():
+        if bilderImHintergrundAufraeumen:
+            index.imHintergrundAufbauen(_bildReferenzenErmitteln)
+        else:
+            index.aufbauen(_bildReferenzenErmitteln())
+    return index
+
+def _unbenutzteBilderEntfernen(index: bildReferenzen.BildReferenzIndex) -> None:
+    if bilderImHintergrundAufraeumen:
+        index.imHintergrundAufraeumen()
+    else:
+        index.aufraeumen()
+
+def verwaisteBilderAufraeumen() -> None:
+    """Baut einen fehlenden Referenzindex auf und setzt ein unterbrochenes Aufräumen
+    (z.B. nach einem Absturz) im Hintergrund fort."""
+    index = bildReferenzIndexBereitstellen()
+    if index.vorhanden() and index.kandidaten():
+        logger.info(f"{len(index.kandidaten())} vorgemerkte Bilder werden aufgeräumt")
+        _unbenutzteBilderEntfernen(index)
+
 def loeschePruefanweisung(xmlPfad: str) -> list[str]:
-    """Löscht eine Prüfanweisung-XML sowie assoziierte Bilder und entfernt den Eintrag
-    aus der Übersichts-XML. Gibt die Liste der gelöschten Dateipfade zurück.
+    """Löscht eine Prüfanweisung und entfernt den Eintrag aus der Übersicht. Zugehörige Bilder
+    werden nur aus dem Referenzindex ausgetragen; Bilder, auf die danach keine Prüfanweisung
+    mehr verweist, löscht der Aufräumer. Gibt die Liste dieser Bildpfade zurück (leer, solange
+    der Referenzindex noch im Hintergrund aufgebaut wird; das Austragen wird dann nachgeholt).
     """
     logger.info(f"Lösche Prüfanweisung: {xmlPfad}")
-    geloeschte_dateien: list[str] = []
-    try:
-        # Parse die Prüfanweisung XML, sammle Bildpfade
+    _pruefanweisungCache.entfernen(xmlPfad)
+    index = bildReferenzIndexBereitstellen()
+
+    if speicherBackend == "sqlite":
         try:
-            tree = ET.parse(xmlPfad)
-            root = tree.getroot()
+            bildPfade = sqliteSpeicher.loeschePruefanweisung(xmlPfad)
         except Exception:
-            logger.warning(f"Prüfanweisung-XML konnte nicht geparst werden: {xmlPfad}")
-            root = None
-
-        if root is not None:
-            vorschau = root.find('VorschauBildPfad')
-            if vorschau is not None and vorschau.text:
-                geloeschte_dateien.append(vorschau.text)
-
-            eigenschaften = root.find('Eigenschaften')
-            if eigenschaften is not None:
-                for eigenschaft in eigenschaften.findall('Eigenschaft'):
-                    bilder = eigenschaft.find('Bilder')
-                    if bilder is not None:
-                        for bild in bilder.findall('Bild'):
-                            bildPfad = bild.find('BildPfad')
-                            if bildPfad is not None and bildPfad.text:
-                                geloeschte_dateien.append(bildPfad.text)
+            logger.error("Fehler beim Löschen der Prüfanweisung", exc_info=True)
+            raise
+        unbenutzteBilder = index.referenzenEntfernen(xmlPfad, bildPfade)
+        _unbenutzteBilderEntfernen(index)
+        return unbenutzteBilder
+
+    try:
+        # Bilder einer Prüfanweisung, die nicht in der Übersicht (und damit nicht im Index) steht
+        bildPfade: list[str] = []
+        if index.bilderVon(xmlPfad) is None:
+            try:
+                bildPfade = bildPfadeVon(_ladePruefanweisungStreaming(xmlPfad, _dateiSignatur(xmlPfad)))
+            except Exception:
+                logger.warning(f"Prüfanweisung-XML konnte nicht geparst werden: {xmlPfad}")
 
         # Entfernen der XML-Datei der Prüfanweisung
         try:
@@ -207,41 +584,89 @@ def loeschePruefanweisung(xmlPfad: str) -> list[str]:
             logger.error(f"Fehler beim Löschen der Prüfanweisung-XML: {e}", exc_info=True)
             raise
 
-        # Entfernen des Eintrags aus der Übersichts-XML
+        # Entfernen des Eintrags aus der Übersicht
         try:
-            tree = ET.parse(pruefanweisungenXmlPfad)
-            root = tree.getroot()
-            removed = False
-            for pruefanweisung in root.findall('Pruefanweisung'):
-                pruefanweisungXmlPfad = pruefanweisung.find('PruefanweisungXmlPfad')
-                if pruefanweisungXmlPfad is not None and pruefanweisungXmlPfad.text == xmlPfad:
-                    root.remove(pruefanweisung)
-                    removed = True
-                    break
-            if removed:
-                tree.write(pruefanweisungenXmlPfad, encoding='utf-8', xml_declaration=True)
-                logger.info(f"Eintrag aus {pruefanweisungenXmlPfad} entfernt: {xmlPfad}")
-        except FileNotFoundError:
-            logger.warning(f"Übersichts-XML nicht gefunden beim Löschen: {pruefanweisungenXmlPfad}")
+            if _uebersichtSignatur() == (None, None):
+                logger.warning(f"Übersichts-XML nicht gefunden beim Löschen: {pruefanweisungenXmlPfad}")
+            else:
+                _journalEintragAnhaengen({"aktion": "entfernen", "PruefanweisungXmlPfad": xmlPfad})
+                logger.info(f"Eintrag aus Übersicht entfernt: {xmlPfad}")
         except Exception as e:
-            logger.error(f"Fehler beim Entfernen des Eintrags aus Übersichts-XML: {e}", exc_info=True)
+            uebersichtCacheLeeren()
+            logger.error(f"Fehler beim Entfernen des Eintrags aus der Übersicht: {e}", exc_info=True)
             raise
 
-        # Lösche die Bilddateien (falls vorhanden). Fehler beim Löschen einzelner Dateien werden geloggt,
-        # aber nicht den gesamten Vorgang abbrechen.
-        for datei in geloeschte_dateien:
-            try:
-                if datei and os.path.exists(datei):
-                    os.remove(datei)
-                    logger.info(f"Bild gelöscht: {datei}")
-            except Exception as e:
-                logger.error(f"Fehler beim Löschen der Bilddatei {datei}: {e}", exc_info=True)
-
-        return geloeschte_dateien
+        unbenutzteBilder = index.referenzenEntfernen(xmlPfad, bildPfade)
+        _unbenutzteBilderEntfernen(index)
+        return unbenutzteBilder
     except Exception:
         logger.error("Fehler beim Löschen der Prüfanweisung", exc_info=True)
         raise
 
+def migriereXmlNachSqlite() -> int:
+    """Importiert alle Prüfanweisungen der Übersichts-XML in die SQLite-Datenbank. Die Pfade
+    bleiben als Schlüssel erhalten, sodass bestehende Verweise weiter funktionieren.
+    Gibt die Anzahl der importierten Prüfanweisungen zurück."""
+    global speicherBackend
+    vorherigesBackend = speicherBackend
+    speicherBackend = "xml"
+    try:
+        uebersicht = ladePruefanweisungenXml()
+        logger.info(f"Migriere {len(uebersicht)} Prüfanweisungen nach {sqliteSpeicher.datenbankPfad}")
+        referenzen = {}
+        for eintrag in uebersicht:
+            xmlPfad = eintrag["PruefanweisungXmlPfad"]
+            try:
+                pruefanweisung = ladePruefanweisungXml(xmlPfad).pruefanweisung
+            except Exception:
+                logger.error(f"Prüfanweisung konnte nicht migriert werden: {xmlPfad}", exc_info=True)
+                continue
+            sqliteSpeicher.speicherePruefanweisung(pruefanweisung, xmlPfad)
+            referenzen[xmlPfad] = bildPfadeVon(pruefanweisung)
+        logger.info(f"{len(referenzen)} Prüfanweisungen migriert")
+
+        # Referenzindex der Datenbank gleich mit anlegen, damit ihn nicht erst das erste Löschen aufbaut
+        speicherBackend = "sqlite"
+        index = bildReferenzIndex()
+        if index.vorhanden():
+            for xmlPfad, bildPfade in referenzen.items():
+                index.referenzenSetzen(xmlPfad, bildPfade)
+        else:
+            index.aufbauen(_bildReferenzenErmitteln())
+        return len(referenzen)
+    finally:
+        speicherBackend = vorherigesBackend
+
+def konvertiereNachV2(verzeichnis: Optional[str] = None, komprimieren: bool = False) -> int:
+    """Schreibt alle Prüfanweisungs-XMLs in `verzeichnis` (Standard: pruefanweisungenDir) an Ort
+    und Stelle im Format v2. Dateien, die bereits in v2 mit der gewünschten Komprimierung
+    vorliegen, bleiben unverändert. Gibt die Anzahl der umgeschriebenen Dateien zurück."""
+    verzeichnis = verzeichnis or pruefanweisungenDir
+    anzahl = 0
+    for dateiName in sorted(os.listdir(verzeichnis)):
+        xmlPfad = os.path.join(verzeichnis, dateiName)
+        if not dateiName.endswith(".xml") or not os.path.isfile(xmlPfad):
+            continue
+        try:
+            with _oeffnePruefanweisungXml(xmlPfad) as datei:
+                komprimiert = isinstance(datei, gzip.GzipFile)
+                _, root = next(ET.iterparse(datei, events=("start",)))
+                version = root.get("version", "1")
+            if version == xmlFormatVersion and komprimiert == komprimieren:
+                continue
+            pruefanweisung = _ladePruefanweisungStreaming(xmlPfad, _dateiSignatur(xmlPfad))
+            tmpPfad = xmlPfad + ".tmp"
+            _schreibePruefanweisungXml(pruefanweisung, tmpPfad, komprimieren)
+            os.replace(tmpPfad, xmlPfad)
+        except Exception:
+            logger.error(f"Prüfanweisung konnte nicht konvertiert werden: {xmlPfad}", exc_info=True)
+            continue
+        _pruefanweisungCache.entfernen(xmlPfad)
+        anzahl += 1
+        logger.debug(f"Prüfanweisung nach v{xmlFormatVersion} konvertiert: {xmlPfad} (v{version})")
+    logger.info(f"{anzahl} Prüfanweisungen nach v{xmlFormatVersion} konvertiert")
+    return anzahl
+
 def eigenschaftenNachKategorienGruppieren(eigenschaften):
     kategorien = {}
     for eigenschaft in eigenschaften:
@@ -3,11 +3,13 @@
 # - Speichern als PDF
 # - Prüferdaten übernehmen
 
+import os
 import logging
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 from src.gui.pages import Page
+from src.logic.ergebnisArchiv import archiviereSichtpruefung
 from src.models.sichtpruefung import Sichtpruefung
-from src.pdfGenerator import PdfGenerator
+from src.pdfGenerator import PdfAbgebrochen, PdfGenerator
 from ui.ui_main import Ui_MainWindow
 
 if TYPE_CHECKING:
@@ -60,12 +62,34 @@ class SichtpruefungManager:
         if self.sichtpruefung is None:
             raise ValueError("Sichtpruefung wurde nicht initialisiert")
         self.sichtpruefung.finalesErgebnisEinfuegen(lagerort, nummer, einsatzbereit, pruefer, datum, bemerkungen)
-        logger.info(f"Erstelle PDF: {self.pdfPfad}")
-        try:
-            PdfGenerator().erstelle_pdf(self.pdfPfad, self.sichtpruefung)
-            logger.info(f"PDF erfolgreich erstellt: {self.pdfPfad}")
-        except Exception as e:
-            logger.error(f"Fehler beim Erstellen des PDFs: {e}", exc_info=True)
-            raise
+        # Das PDF erstellt anschließend pdfErstellen, in der Oberfläche über den PdfWorker im Hintergrund
 
-        
\ No newline at end of file
+
+def pdfErstellen(pdfPfad: str, sichtpruefung: Sichtpruefung, fortschritt: Optional[Callable[[int], None]] = None) -> None:
+    """Erstellt das PDF und archiviert die Sichtprüfung. Das PDF wird zuerst in eine temporäre
+    Datei geschrieben und ersetzt pdfPfad erst, wenn es vollständig ist. Archiviert wird auch,
+    wenn das PDF fehlschlägt oder abgebrochen wird, dann ohne PDF-Pfad."""
+    tmpPfad = pdfPfad + ".tmp"
+    erstellt = False
+    logger.info(f"Erstelle PDF: {pdfPfad}")
+    try:
+        PdfGenerator().erstelle_pdf(tmpPfad, sichtpruefung, fortschritt)
+        os.replace(tmpPfad, pdfPfad)
+        erstellt = True
+        logger.info(f"PDF erfolgreich erstellt: {pdfPfad}")
+    except PdfAbgebrochen:
+        raise
+    except Exception as e:
+        logger.error(f"Fehler beim Erstellen des PDFs: {e}", exc_info=True)
+        raise
+    finally:
+        if os.path.exists(tmpPfad):
+            os.remove(tmpPfad)
+        _archivieren(sichtpruefung, pdfPfad if erstellt else "")
+
+def _archivieren(sichtpruefung: Sichtpruefung, pdfPfad: str) -> None:
+    # Die Sichtprüfung ist abgeschlossen, ein Fehler beim Archivieren soll das nicht verhindern
+    try:
+        archiviereSichtpruefung(sichtpruefung, pdfPfad)
+    except Exception as e:
+        logger.error(f"Fehler beim Archivieren der Sichtprüfung: {e}", exc_info=True)
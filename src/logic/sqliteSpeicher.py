@@ -0,0 +1,157 @@
+import os
+import logging
+import sqlite3
+import threading
+from typing import Optional
+
+from src.models.pruefanweisung import Pruefanweisung
+
+logger = logging.getLogger(__name__)
+
+datenbankPfad = "data/pruefanweisungen.sqlite3"
+
+# Eine Verbindung pro Thread und Datenbankdatei, sqlite3-Verbindungen dürfen nicht geteilt werden
+_lokal = threading.local()
+
+_schema = """
+CREATE TABLE IF NOT EXISTS pruefanweisung (
+    id INTEGER PRIMARY KEY,
+    pfad TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    vorschauBildPfad TEXT,
+    pruefart TEXT,
+    pruefvorgabe TEXT,
+    pruefvorgabeZusatz TEXT,
+    prueffrist TEXT,
+    sachkundiger TEXT,
+    zusatzausbildung TEXT,
+    hersteller TEXT,
+    aussonderungsfrist TEXT,
+    vorgabenText TEXT,
+    pruefablaufText TEXT,
+    hinweis TEXT
+);
+CREATE TABLE IF NOT EXISTS eigenschaft (
+    id INTEGER PRIMARY KEY,
+    pruefanweisungId INTEGER NOT NULL REFERENCES pruefanweisung(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    kategorie TEXT,
+    beschreibung TEXT
+);
+CREATE INDEX IF NOT EXISTS eigenschaftNachPruefanweisung ON eigenschaft(pruefanweisungId, position);
+CREATE TABLE IF NOT EXISTS bild (
+    id INTEGER PRIMARY KEY,
+    eigenschaftId INTEGER NOT NULL REFERENCES eigenschaft(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    bildPfad TEXT,
+    bildBeschreibung TEXT
+);
+CREATE INDEX IF NOT EXISTS bildNachEigenschaft ON bild(eigenschaftId, position);
+"""
+
+_infoSpalten = ["pruefart", "pruefvorgabe", "pruefvorgabeZusatz", "prueffrist", "sachkundiger",
+                "zusatzausbildung", "hersteller", "aussonderungsfrist"]
+
+
+def _verbindung() -> sqlite3.Connection:
+    verbindungen = getattr(_lokal, "verbindungen", None)
+    if verbindungen is None:
+        verbindungen = _lokal.verbindungen = {}
+    verbindung = verbindungen.get(datenbankPfad)
+    if verbindung is None:
+        logger.info(f"Öffne Prüfanweisungen-Datenbank: {datenbankPfad}")
+        verzeichnis = os.path.dirname(datenbankPfad)
+        if verzeichnis:
+            os.makedirs(verzeichnis, exist_ok=True)
+        verbindung = sqlite3.connect(datenbankPfad)
+        verbindung.row_factory = sqlite3.Row
+        verbindung.execute("PRAGMA journal_mode=WAL")
+        verbindung.execute("PRAGMA synchronous=NORMAL")
+        verbindung.execute("PRAGMA foreign_keys=ON")
+        verbindung.executescript(_schema)
+        verbindungen[datenbankPfad] = verbindung
+    return verbindung
+
+def schliesseVerbindungen() -> None:
+    verbindungen = getattr(_lokal, "verbindungen", {})
+    for verbindung in verbindungen.values():
+        verbindung.close()
+    verbindungen.clear()
+
+def pfadVergeben(pfad: str) -> bool:
+    zeile = _verbindung().execute("SELECT 1 FROM pruefanweisung WHERE pfad = ?", (pfad,)).fetchone()
+    return zeile is not None
+
+def speicherePruefanweisung(pruefanweisung: Pruefanweisung, pfad: str) -> None:
+    """Speichert die Prüfanweisung unter `pfad`. Ein bestehender Eintrag mit gleichem Pfad
+    wird samt Eigenschaften und Bildern ersetzt."""
+    verbindung = _verbindung()
+    with verbindung:
+        verbindung.execute("DELETE FROM pruefanweisung WHERE pfad = ?", (pfad,))
+        cursor = verbindung.execute(
+            f"INSERT INTO pruefanweisung (pfad, name, vorschauBildPfad, {', '.join(_infoSpalten)}, vorgabenText, pruefablaufText, hinweis) "
+            f"VALUES ({', '.join('?' * (len(_infoSpalten) + 6))})",
+            (pfad, pruefanweisung.namePruefobjekt, pruefanweisung.pfadVorschauBild,
+             *[getattr(pruefanweisung, spalte) for spalte in _infoSpalten],
+             pruefanweisung.vorgabenText, pruefanweisung.pruefablaufText, pruefanweisung.hinweis)
+        )
+        pruefanweisungId = cursor.lastrowid
+        for position, eigenschaft in enumerate(pruefanweisung.eigenschaften):
+            cursor = verbindung.execute(
+                "INSERT INTO eigenschaft (pruefanweisungId, position, kategorie, beschreibung) VALUES (?, ?, ?, ?)",
+                (pruefanweisungId, position, eigenschaft.kategorie, eigenschaft.beschreibung)
+            )
+            verbindung.executemany(
+                "INSERT INTO bild (eigenschaftId, position, bildPfad, bildBeschreibung) VALUES (?, ?, ?, ?)",
+                [(cursor.lastrowid, bildPosition, bildPfad, bildBeschreibung)
+                 for bildPosition, (bildPfad, bildBeschreibung) in enumerate(eigenschaft.bilder)]
+            )
+    logger.debug(f"Prüfanweisung in Datenbank gespeichert: {pfad} ({len(pruefanweisung.eigenschaften)} Eigenschaften)")
+
+def ladePruefanweisung(pfad: str) -> Optional[Pruefanweisung]:
+    verbindung = _verbindung()
+    zeile = verbindung.execute("SELECT * FROM pruefanweisung WHERE pfad = ?", (pfad,)).fetchone()
+    if zeile is None:
+        return None
+
+    pruefanweisung = Pruefanweisung()
+    pruefanweisung.auswahlHinzufuegen(zeile["vorschauBildPfad"] or "", zeile["name"])
+    pruefanweisung.infosHinzufuegen(*[zeile[spalte] or "" for spalte in _infoSpalten])
+    pruefanweisung.vorgabenHinzufuegen(zeile["vorgabenText"] or "")
+    pruefanweisung.pruefablaufHinzufuegen(zeile["pruefablaufText"] or "")
+    pruefanweisung.hinweisHinzufuegen(zeile["hinweis"] or "")
+
+    bilderNachEigenschaft: dict[int, list[tuple[str, str]]] = {}
+    for bild in verbindung.execute(
+            "SELECT bild.eigenschaftId, bild.bildPfad, bild.bildBeschreibung FROM bild "
+            "JOIN eigenschaft ON eigenschaft.id = bild.eigenschaftId "
+            "WHERE eigenschaft.pruefanweisungId = ? ORDER BY bild.eigenschaftId, bild.position", (zeile["id"],)):
+        bilderNachEigenschaft.setdefault(bild["eigenschaftId"], []).append((bild["bildPfad"], bild["bildBeschreibung"]))
+
+    for eigenschaft in verbindung.execute(
+            "SELECT id, kategorie, beschreibung FROM eigenschaft WHERE pruefanweisungId = ? ORDER BY position", (zeile["id"],)):
+        pruefanweisung.eigenschaftHinzufuegen(eigenschaft["kategorie"], eigenschaft["beschreibung"],
+                                              bilderNachEigenschaft.get(eigenschaft["id"], []))
+    return pruefanweisung
+
+def ladeUebersicht() -> list[dict]:
+    return [
+        {"Name": zeile["name"], "VorschauBildPfad": zeile["vorschauBildPfad"], "PruefanweisungXmlPfad": zeile["pfad"]}
+        for zeile in _verbindung().execute("SELECT name, vorschauBildPfad, pfad FROM pruefanweisung ORDER BY id")
+    ]
+
+def loeschePruefanweisung(pfad: str) -> list[str]:
+    """Entfernt die Prüfanweisung aus der Datenbank und gibt die referenzierten Bildpfade zurück."""
+    verbindung = _verbindung()
+    with verbindung:
+        zeile = verbindung.execute("SELECT id, vorschauBildPfad FROM pruefanweisung WHERE pfad = ?", (pfad,)).fetchone()
+        if zeile is None:
+            logger.warning(f"Prüfanweisung nicht in der Datenbank gefunden: {pfad}")
+            return []
+        bildPfade = [zeile["vorschauBildPfad"]] if zeile["vorschauBildPfad"] else []
+        bildPfade += [bild["bildPfad"] for bild in verbindung.execute(
+            "SELECT bild.bildPfad FROM bild JOIN eigenschaft ON eigenschaft.id = bild.eigenschaftId "
+            "WHERE eigenschaft.pruefanweisungId = ? AND bild.bildPfad IS NOT NULL "
+            "ORDER BY eigenschaft.position, bild.position", (zeile["id"],))]
+        verbindung.execute("DELETE FROM pruefanweisung WHERE id = ?", (zeile["id"],))
+    return bildPfade
@@ -0,0 +1,153 @@
+import os
+import re
+import hashlib
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+from PIL import Image as PilImage
+
+logger = logging.getLogger(__name__)
+
+# Verkleinerte Vorschaubilder für das Auswahl-Raster: <vorschauDir>/ab/<sha256>_<groesse>.jpg (.png bei
+# Transparenz). Der Name hängt am Inhalt des Originals, ein geändertes Bild bekommt so ein neues Vorschaubild.
+vorschauDir = "data/vorschau"
+
+_bildEndungen = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tif", ".tiff"}
+_hashName = re.compile(r"[0-9a-f]{64}")
+# Inhalts-Hash je (Pfad, Änderungszeit, Größe), damit große Fotos nicht bei jedem Öffnen gelesen werden
+_hashes: dict[tuple, str] = {}
+_lock = threading.Lock()
+
+
+def inhaltsHash(bildPfad: str) -> str:
+    """SHA-256 des Bildinhalts. Bilder aus dem Bildspeicher sind bereits danach benannt."""
+    name = os.path.splitext(os.path.basename(bildPfad))[0]
+    if _hashName.fullmatch(name):
+        return name
+    stat = os.stat(bildPfad)
+    schluessel = (os.path.abspath(bildPfad), stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        hashWert = _hashes.get(schluessel)
+    if hashWert is None:
+        sha256 = hashlib.sha256()
+        with open(bildPfad, "rb") as datei:
+            for block in iter(lambda: datei.read(1024 * 1024), b""):
+                sha256.update(block)
+        hashWert = sha256.hexdigest()
+        with _lock:
+            _hashes[schluessel] = hashWert
+    return hashWert
+
+def _vorschauPfade(hashWert: str, groesse: int) -> tuple[str, str]:
+    basis = os.path.join(vorschauDir, hashWert[:2], f"{hashWert}_{groesse}")
+    return basis + ".jpg", basis + ".png"
+
+def vorschauBild(bildPfad: str, groesse: int = 371) -> str:
+    """Pfad eines Vorschaubilds von höchstens groesse × groesse Pixeln, beim ersten Aufruf erzeugt.
+    Lässt sich das Original nicht lesen, wird sein Pfad unverändert zurückgegeben."""
+    try:
+        hashWert = inhaltsHash(bildPfad)
+    except OSError:
+        return bildPfad
+    for pfad in _vorschauPfade(hashWert, groesse):
+        if os.path.exists(pfad):
+            return pfad
+    try:
+        return _erzeugen(bildPfad, hashWert, groesse)
+    except Exception as e:
+        logger.warning(f"Vorschaubild für {bildPfad} konnte nicht erzeugt werden: {e}")
+        return bildPfad
+
+def _erzeugen(bildPfad: str, hashWert: str, groesse: int) -> str:
+    jpgPfad, pngPfad = _vorschauPfade(hashWert, groesse)
+    with PilImage.open(bildPfad) as bild:
+        bild.draft(None, (groesse, groesse))  # JPEGs gleich verkleinert dekodieren
+        transparent = bild.mode in ("RGBA", "LA", "PA") or "transparency" in bild.info
+        bild.thumbnail((groesse, groesse), PilImage.Resampling.LANCZOS)
+        zielPfad = pngPfad if transparent else jpgPfad
+        os.makedirs(os.path.dirname(zielPfad), exist_ok=True)
+        # Eindeutiger tmp-Name: beim Vorwärmen erzeugen mehrere Prozesse gleichzeitig
+        tmpPfad = f"{zielPfad}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if transparent:
+            bild.convert("RGBA").save(tmpPfad, format="PNG")
+        else:
+            bild.convert("RGB").save(tmpPfad, format="JPEG", quality=90)
+    os.replace(tmpPfad, zielPfad)
+    logger.debug(f"Vorschaubild erzeugt: {zielPfad}")
+    return zielPfad
+
+def vorschauBilderEntfernen(bildPfad: str) -> int:
+    """Löscht die Vorschaubilder eines Bildes in allen Größen, bevor das Original gelöscht wird.
+    Hat ein anderes Bild denselben Inhalt, wird sein Vorschaubild beim nächsten Anzeigen neu erzeugt."""
+    try:
+        hashWert = inhaltsHash(bildPfad)
+    except OSError:
+        return 0
+    verzeichnis = os.path.join(vorschauDir, hashWert[:2])
+    try:
+        namen = [name for name in os.listdir(verzeichnis) if name.startswith(f"{hashWert}_")]
+    except FileNotFoundError:
+        return 0
+    return _loeschen(os.path.join(verzeichnis, name) for name in namen)
+
+def vorschauBilderAufraeumen(bildPfade: Iterable[str]) -> int:
+    """Löscht alle Vorschaubilder, deren Original keines der verwendeten bildPfade ist (gleicher
+    Inhalt genügt), und gibt ihre Anzahl zurück. bildPfade müssen alle verwendeten Bilder enthalten,
+    z.B. die Vorschaubilder aller Prüfanweisungen und den Bildspeicher."""
+    hashes = set()
+    for bildPfad in bildPfade:
+        try:
+            hashes.add(inhaltsHash(bildPfad))
+        except OSError:
+            pass
+    verwaist = []
+    for wurzel, _, namen in os.walk(vorschauDir):
+        for name in namen:
+            hashWert = name.split("_", 1)[0]
+            if _hashName.fullmatch(hashWert) and hashWert not in hashes:
+                verwaist.append(os.path.join(wurzel, name))
+    anzahl = _loeschen(verwaist)
+    logger.info(f"{anzahl} verwaiste Vorschaubilder gelöscht")
+    return anzahl
+
+def _loeschen(pfade: Iterable[str]) -> int:
+    anzahl = 0
+    for pfad in pfade:
+        try:
+            os.remove(pfad)
+            anzahl += 1
+            logger.debug(f"Vorschaubild gelöscht: {pfad}")
+        except FileNotFoundError:
+            pass
+    return anzahl
+
+def bildDateien(verzeichnisse: Iterable[str]) -> list[str]:
+    """Alle Bilddateien unter den Verzeichnissen, ohne die Vorschaubilder selbst."""
+    vorschau = os.path.abspath(vorschauDir)
+    dateien = []
+    for verzeichnis in verzeichnisse:
+        for wurzel, unterverzeichnisse, namen in os.walk(verzeichnis):
+            unterverzeichnisse[:] = [name for name in unterverzeichnisse if os.path.abspath(os.path.join(wurzel, name)) != vorschau]
+            dateien.extend(os.path.join(wurzel, name) for name in namen if os.path.splitext(name)[1].lower() in _bildEndungen)
+    return sorted(set(dateien))
+
+def _arbeiterStarten(verzeichnis: str) -> None:
+    global vorschauDir
+    vorschauDir = verzeichnis
+
+def vorschauBilderErzeugen(bildPfade: list[str], groessen: Iterable[int] = (371,), prozesse: Optional[int] = None) -> int:
+    """Erzeugt fehlende Vorschaubilder parallel auf allen Kernen und gibt ihre Anzahl zurück."""
+    auftraege = [(pfad, groesse) for pfad in bildPfade for groesse in groessen]
+    if not auftraege:
+        return 0
+    prozesse = max(1, min(prozesse or os.cpu_count() or 1, len(auftraege)))
+    logger.info(f"Erzeuge Vorschaubilder für {len(bildPfade)} Bilder mit {prozesse} Prozessen")
+    with ProcessPoolExecutor(max_workers=prozesse, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_arbeiterStarten, initargs=(vorschauDir,)) as executor:
+        ergebnisse = executor.map(vorschauBild, *zip(*auftraege), chunksize=max(1, len(auftraege) // (prozesse * 8)))
+        erzeugt = sum(1 for (pfad, _), vorschau in zip(auftraege, ergebnisse) if vorschau != pfad)
+    logger.info(f"{erzeugt} Vorschaubilder vorhanden oder erzeugt")
+    return erzeugt
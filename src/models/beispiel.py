@@ -0,0 +1,30 @@
+from src.models.eigenschaftpruefung import Eigenschaftspruefung
+from src.models.pruefanweisung import Pruefanweisung
+from src.models.sichtpruefung import Sichtpruefung
+
+# Beispieldaten für pdf-benchmark und die Tests: Ergebnis der Sichtprüfung (Lagerort, Nummer,
+# einsatzbereit, Prüfer, Datum, Bemerkungen)
+beispielErgebnis = ("Gerätehaus", "4711", True, "Max Mustermann", "01.01.2025", "Keine")
+
+
+def beispielPruefanweisung(kategorien: int = 5, eigenschaften: int = 8) -> Pruefanweisung:
+    """Prüfanweisung mit `kategorien` × `eigenschaften` Eigenschaften und etwas Vorgaben- und Ablauftext."""
+    pruefanweisung = Pruefanweisung()
+    pruefanweisung.auswahlHinzufuegen("", "Benchmark-Prüfobjekt")
+    pruefanweisung.infosHinzufuegen("Sichtprüfung", "DGUV 305-002", "", "jährlich", "Gerätewart", "-", "-", "10 Jahre")
+    pruefanweisung.vorgabenHinzufuegen("<p>Vorgaben für die Prüfung.</p>" * 20)
+    pruefanweisung.pruefablaufHinzufuegen("<p>Ablauf der Prüfung.</p>" * 20)
+    pruefanweisung.hinweisHinzufuegen("Bei Mängeln aussondern.")
+    for nummer in range(kategorien * eigenschaften):
+        pruefanweisung.eigenschaftHinzufuegen(f"Kategorie {nummer // eigenschaften + 1}", f"Eigenschaft {nummer + 1} auf Beschädigungen prüfen")
+    return pruefanweisung
+
+def beispielSichtpruefung(kategorien: int = 5, eigenschaften: int = 8) -> Sichtpruefung:
+    """Abgeschlossene Sichtprüfung der beispielPruefanweisung, alle Eigenschaften ohne Handlungsbedarf."""
+    pruefanweisung = beispielPruefanweisung(kategorien, eigenschaften)
+    sichtpruefung = Sichtpruefung()
+    for eigenschaft in pruefanweisung.eigenschaften:
+        sichtpruefung.eigenschaftspruefungen.append(Eigenschaftspruefung(eigenschaft.kopieren()))
+    sichtpruefung.labelsBefuellen(pruefanweisung)
+    sichtpruefung.finalesErgebnisEinfuegen(*beispielErgebnis)
+    return sichtpruefung
@@ -1,10 +1,29 @@
+from typing import Callable, Optional
 
 
 class Eigenschaft:
-    def __init__(self, kategorie: str, beschreibung: str, bilder = []):
+    def __init__(self, kategorie: str, beschreibung: str, bilder = [], bilderLader: Optional[Callable[[], list]] = None):
         self.kategorie = kategorie
         self.beschreibung = beschreibung
-        self.bilder = bilder
+        # Mit bilderLader werden die Bilder erst beim ersten Zugriff geladen
+        self._bilder = None if bilderLader else bilder
+        self._bilderLader = bilderLader
+
+    @property
+    def bilder(self):
+        if self._bilder is None:
+            self._bilder = list(self._bilderLader())
+        return self._bilder
+
+    @bilder.setter
+    def bilder(self, bilder) -> None:
+        self._bilder = bilder
+
+    def kopieren(self) -> "Eigenschaft":
+        """Kopie mit eigener Bilderliste. Noch nicht geladene Bilder bleiben nachladbar."""
+        if self._bilder is None:
+            return Eigenschaft(self.kategorie, self.beschreibung, bilderLader=self._bilderLader)
+        return Eigenschaft(self.kategorie, self.beschreibung, list(self._bilder))
 
     def __str__(self):
         return f"- [{self.kategorie}] {self.beschreibung} {self.bilder}"
\ No newline at end of file
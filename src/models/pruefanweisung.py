@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Callable, Optional
 from src.models.eigenschaft import Eigenschaft
 
 
@@ -14,11 +14,39 @@ class Pruefanweisung:
         self.zusatzausbildung: str = ''
         self.hersteller: str = ''
         self.aussonderungsfrist: str = ''
-        self.vorgabenText: str = ''
-        self.pruefablaufText: str = ''
+        self._vorgabenText: Optional[str] = ''
+        self._pruefablaufText: Optional[str] = ''
+        self._textLader: Optional[Callable[[str], str]] = None
         self.eigenschaften: list[Eigenschaft] = []
         self.hinweis: str = ''
 
+    @property
+    def vorgabenText(self) -> str:
+        if self._vorgabenText is None:
+            self._vorgabenText = self._textLader("vorgabenText")
+        return self._vorgabenText
+
+    @vorgabenText.setter
+    def vorgabenText(self, text: str) -> None:
+        self._vorgabenText = text
+
+    @property
+    def pruefablaufText(self) -> str:
+        if self._pruefablaufText is None:
+            self._pruefablaufText = self._textLader("pruefablaufText")
+        return self._pruefablaufText
+
+    @pruefablaufText.setter
+    def pruefablaufText(self, text: str) -> None:
+        self._pruefablaufText = text
+
+    def texteNachladbar(self, textLader: Callable[[str], str]) -> None:
+        """Vorgaben- und Prüfablauftext werden erst beim ersten Zugriff über
+        textLader("vorgabenText") bzw. textLader("pruefablaufText") geladen."""
+        self._textLader = textLader
+        self._vorgabenText = None
+        self._pruefablaufText = None
+
     def auswahlHinzufuegen(self, pfadVorschauBild: str, namePruefobjekt: str) -> None:
         self.pfadVorschauBild = pfadVorschauBild
         self.namePruefobjekt = namePruefobjekt
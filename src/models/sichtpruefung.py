@@ -7,6 +7,7 @@ from src.models.pruefanweisung import Pruefanweisung
 class Sichtpruefung:
     def __init__(self) -> None:
         self.pruefanweisung: Optional[Pruefanweisung] = None
+        self.pruefanweisungPfad: str = ''
         self.lagerort: str = ''
         self.nummer: str = ''
         self.einsatzbereit: bool = False
@@ -1,47 +1,82 @@
+import io
 import os
 import sys
+import json
+import hashlib
 import logging
+import functools
+import threading
+from typing import BinaryIO, Callable, Optional
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfgen import canvas
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image, Flowable
+from reportlab.lib.utils import ImageReader
+from PIL import Image as PilImage
 from reportlab.lib.colors import HexColor
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_RIGHT, TA_CENTER, TA_LEFT
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import NameObject
 
+from src.logic.richText import abschnitteMitBildern, bloecke
 from src.logic.serializer import eigenschaftspruefungenNachKategorienGruppieren
 from src.models.pruefanweisung import Pruefanweisung
 from src.models.sichtpruefung import Sichtpruefung
-from src.util import cleanHtml
+from src.util import LruCache, cleanHtml
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 logger = logging.getLogger(__name__)
 
-
-class PdfGenerator():
-    def __init__(self):
-        logger.debug("PdfGenerator wird initialisiert")
-        # Seitenbreite und -höhe
-        self.PAGE_WIDTH, self.PAGE_HEIGHT = A4
-        self.logo_path = "assets/pdf_Feuerwehr_Logo.png"
-        logger.debug(f"Logo-Pfad: {self.logo_path}")
-
-        # SourceSans3-Schriftarten registrieren
+# Schriftarten und Stile werden einmal pro Prozess aufgebaut und von allen PdfGeneratoren geteilt.
+# Das Einlesen der sechs TTF-Dateien kostet sonst bei jedem Bericht spürbar Zeit.
+schriftartenDir = "resources/fonts/Source_Sans_3/static"
+_schriftarten = {
+    "SourceSans3": "SourceSans3-Regular.ttf",
+    "SourceSans3-SemiBold": "SourceSans3-SemiBold.ttf",
+    "SourceSans3-SemiBold-Italic": "SourceSans3-SemiBoldItalic.ttf",
+    "SourceSans3-Italic": "SourceSans3-Italic.ttf",
+    "SourceSans3-Light": "SourceSans3-Light.ttf",
+    "SourceSans3-Light-Italic": "SourceSans3-LightItalic.ttf",
+}
+
+_registryLock = threading.RLock()
+_schriftartenRegistriert = False
+_stylesheet = None
+_absatzStile: dict[tuple, ParagraphStyle] = {}
+_tabellenStile: dict[tuple, TableStyle] = {}
+
+# Das Logo im Kopf jeder Seite wird einmal pro Prozess auf die gedruckte Größe verkleinert und
+# je Dokument nur einmal als Form-XObject eingebettet, auf das alle Seiten verweisen.
+logoDpi = 200
+_logoForm = "logo"
+_logoBilder: dict[tuple, ImageReader] = {}
+
+# Fertig gesetzte Vorspann-PDFs (Deckblatt, Vorgaben, Prüfablauf) je Inhalt der Prüfanweisung,
+# zusammen mit der Zeichenbelegung ihrer Schrift-Teilmengen (siehe SchriftCanvas).
+# Bei Änderungen am Layout des Vorspanns vorspannVersion erhöhen.
+vorspannVersion = 2
+_vorspannCache = LruCache(maxEintraege=32, maxBytes=64 * 1024 * 1024)
+
+
+def registriereSchriftarten() -> None:
+    """Registriert die SourceSans3-Schriftarten bei ReportLab, nur beim ersten Aufruf im Prozess."""
+    global _schriftartenRegistriert
+    with _registryLock:
+        if _schriftartenRegistriert:
+            return
         try:
-            pdfmetrics.registerFont(TTFont("SourceSans3", "resources/fonts/Source_Sans_3/static/SourceSans3-Regular.ttf"))
-            pdfmetrics.registerFont(TTFont("SourceSans3-SemiBold", "resources/fonts/Source_Sans_3/static/SourceSans3-SemiBold.ttf"))
-            pdfmetrics.registerFont(TTFont("SourceSans3-SemiBold-Italic", "resources/fonts/Source_Sans_3/static/SourceSans3-SemiBoldItalic.ttf"))
-            pdfmetrics.registerFont(TTFont("SourceSans3-Italic", "resources/fonts/Source_Sans_3/static/SourceSans3-Italic.ttf"))
-            pdfmetrics.registerFont(TTFont("SourceSans3-Light", "resources/fonts/Source_Sans_3/static/SourceSans3-Light.ttf"))
-            pdfmetrics.registerFont(TTFont("SourceSans3-Light-Italic", "resources/fonts/Source_Sans_3/static/SourceSans3-LightItalic.ttf"))
+            for name, datei in _schriftarten.items():
+                pdfmetrics.registerFont(TTFont(name, os.path.join(schriftartenDir, datei)))
             logger.debug("Schriftarten erfolgreich registriert")
         except Exception as e:
             logger.error(f"Fehler beim Registrieren der Schriftarten: {e}", exc_info=True)
             raise
-        
+
         pdfmetrics.registerFontFamily(
             "SourceSans3",
             normal="SourceSans3",
@@ -49,62 +84,367 @@ class PdfGenerator():
             italic="SourceSans3-Italic",
             boldItalic="SourceSans3-SemiBold-Italic"
         )
+        _schriftartenRegistriert = True
+
+def stylesheet():
+    """Beispiel-Stylesheet von ReportLab mit den SourceSans3-Schriftarten, einmal pro Prozess erzeugt."""
+    global _stylesheet
+    with _registryLock:
+        if _stylesheet is None:
+            styles = getSampleStyleSheet()
+            styles["Title"].fontName = "SourceSans3"
+            styles["Heading2"].fontName = "SourceSans3"
+            styles["Normal"].fontName = "SourceSans3-Light"
+            _stylesheet = styles
+        return _stylesheet
+
+def absatzStil(name: str, parent: str = "Title", **eigenschaften) -> ParagraphStyle:
+    """ParagraphStyle aus dem Stylesheet abgeleitet. Gleiche Angaben liefern dasselbe Objekt,
+    statt es für jede Tabellenzeile neu anzulegen."""
+    schluessel = (name, parent, tuple(sorted(eigenschaften.items())))
+    with _registryLock:
+        stil = _absatzStile.get(schluessel)
+        if stil is None:
+            stil = ParagraphStyle(name=name, parent=stylesheet()[parent], **eigenschaften)
+            _absatzStile[schluessel] = stil
+        return stil
+
+def tabellenStil(*befehle: tuple) -> TableStyle:
+    """TableStyle für die angegebenen Befehle, je Befehlsliste nur einmal erzeugt."""
+    with _registryLock:
+        stil = _tabellenStile.get(befehle)
+        if stil is None:
+            stil = TableStyle(list(befehle))
+            _tabellenStile[befehle] = stil
+        return stil
+
+def logoBild(pfad: str, breite: float, hoehe: float) -> ImageReader:
+    """Logo verkleinert auf breite × hoehe (pt) bei logoDpi. Vergrößert wird nicht."""
+    schluessel = (pfad, breite, hoehe, logoDpi)
+    with _registryLock:
+        bild = _logoBilder.get(schluessel)
+        if bild is None:
+            with PilImage.open(pfad) as original:
+                original.load()
+                groesse = (round(breite / 72 * logoDpi), round(hoehe / 72 * logoDpi))
+                if groesse[0] < original.width and groesse[1] < original.height:
+                    verkleinert = original.resize(groesse, PilImage.Resampling.LANCZOS)
+                else:
+                    verkleinert = original.copy()
+            logger.debug(f"Logo {pfad} auf {verkleinert.width}x{verkleinert.height} Pixel verkleinert ({logoDpi} dpi)")
+            bild = ImageReader(verkleinert)
+            _logoBilder[schluessel] = bild
+        return bild
+
+def vorspannSchluessel(pruefanweisung: Pruefanweisung) -> str:
+    """Inhalts-Hash über alles, was im Vorspann erscheint. Bilder liegen nach Inhalt abgelegt
+    im Bildspeicher, ihr Pfad ändert sich also mit dem Bild."""
+    inhalt = [vorspannVersion, logoDpi, pruefanweisung.namePruefobjekt, pruefanweisung.pruefart, pruefanweisung.pruefvorgabe,
+              pruefanweisung.pruefvorgabeZusatz, pruefanweisung.prueffrist, pruefanweisung.sachkundiger,
+              pruefanweisung.zusatzausbildung, pruefanweisung.hersteller, pruefanweisung.aussonderungsfrist,
+              pruefanweisung.vorgabenText, pruefanweisung.pruefablaufText]
+    return hashlib.sha256(json.dumps(inhalt, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+@functools.cache
+def schriftBelegungTeilbar() -> bool:
+    """Ob sich die Zeichenbelegung der TrueType-Schriften zwischen Vorspann und Checkliste teilen
+    lässt. SchriftCanvas greift dafür auf ReportLab-Interna zu (TTFont._assignState, state[doc]
+    mit assignments, subsets und nextCode). Fehlen sie, z.B. nach einem Update, bekommt jeder
+    Teil wie früher eigene Teilmengen."""
+    class Probe:  # Steht für ein Dokument; ReportLab hält die Belegung schwach referenziert
+        pass
+
+    registriereSchriftarten()
+    try:
+        for name in _schriftarten:
+            schrift = pdfmetrics.getFont(name)
+            probe = Probe()
+            state = schrift._assignState(probe)
+            try:
+                if not (isinstance(state.assignments, dict) and isinstance(state.subsets, list)
+                        and isinstance(state.nextCode, int) and not getattr(state, "frozen", False)):
+                    raise TypeError(f"unerwartete Zeichenbelegung in {name}")
+            finally:
+                schrift.state.pop(probe, None)
+    except Exception as e:
+        logger.warning(f"Schriften werden nicht zwischen Vorspann und Checkliste geteilt: {e}")
+        return False
+    return True
+
+
+class SchriftCanvas(canvas.Canvas):
+    """Canvas, dessen TrueType-Teilmengen mit der Zeichenbelegung eines anderen Dokuments
+    beginnen (`schriftVorgabe`) und die eigene Belegung beim Speichern in `schriftStand` festhält.
+    Die Checkliste übernimmt so die Codes des Vorspanns; ihre Teilmengen enthalten alle Zeichen
+    des Vorspanns und können beim Zusammenfügen für beide Teile verwendet werden."""
+
+    def __init__(self, *args, schriftVorgabe: Optional[dict] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.schriftStand: dict[str, tuple] = {}
+        if not schriftBelegungTeilbar():
+            return
+        for name, (zuordnung, teilmengen, naechsterCode) in (schriftVorgabe or {}).items():
+            state = pdfmetrics.getFont(name)._assignState(self._doc)
+            state.assignments = dict(zuordnung)
+            state.subsets = [list(teilmenge) for teilmenge in teilmengen]
+            state.nextCode = naechsterCode
+
+    def save(self) -> None:
+        # Nach save() hat ReportLab die Belegung verworfen
+        for name in _schriftarten if schriftBelegungTeilbar() else ():
+            state = pdfmetrics.getFont(name).state.get(self._doc)
+            if state is not None:
+                self.schriftStand[name] = (dict(state.assignments), [list(teilmenge) for teilmenge in state.subsets], state.nextCode)
+        super().save()
+
+
+class PdfAbgebrochen(Exception):
+    """Wird aus dem Fortschritts-Callback geworfen, um das Erstellen eines PDFs abzubrechen."""
+
+
+class BeschrifteteCheckbox(Flowable):
+    """Beschriftung mit nachgestellter Checkbox, z.B. "Ja" in der Einsatzbereit-Zeile. Die
+    Checkbox wird mit dem Text gesetzt und steht so immer in ihrer Tabellenzelle."""
+
+    def __init__(self, text: str, style: ParagraphStyle, checked: bool = False, size: float = 9.5, abstand: float = 3) -> None:
+        super().__init__()
+        self.absatz = Paragraph(text, style)
+        self.textBreite = stringWidth(text, style.fontName, style.fontSize)
+        self.fontSize = style.fontSize
+        self.checked = checked
+        self.size = size
+        self.abstand = abstand
+
+    def wrap(self, availWidth: float, availHeight: float) -> tuple[float, float]:
+        _, self.height = self.absatz.wrap(availWidth, availHeight)
+        self.width = availWidth
+        return self.width, self.height
+
+    def draw(self) -> None:
+        self.absatz.drawOn(self.canv, 0, 0)
+        # Checkbox rechts neben dem Text, knapp über der Grundlinie der ersten Zeile
+        x = self.textBreite + self.abstand
+        y = self.height - self.fontSize + 1
+        self.canv.setLineWidth(0.8)
+        self.canv.rect(x, y, self.size, self.size, stroke=1, fill=0)  # Zeichne Quadrat (Checkbox)
+
+        if self.checked:
+            self.canv.line(x + 2, y + 2, x + self.size - 2, y + self.size - 2)  # Erste Linie für Haken
+            self.canv.line(x + 2, y + self.size - 2, x + self.size - 2, y + 2)  # Zweite Linie für Haken
+
+
+class PdfGenerator():
+    def __init__(self):
+        logger.debug("PdfGenerator wird initialisiert")
+        # Seitenbreite und -höhe
+        self.PAGE_WIDTH, self.PAGE_HEIGHT = A4
+        self.logo_path = "assets/pdf_Feuerwehr_Logo.png"
+        logger.debug(f"Logo-Pfad: {self.logo_path}")
 
-        self.checkboxJaX = 194.5
-        self.checkboxNeinX = 246.5
-        self.checkboxY = 654.4
-        self.checkboxYPos = 0
+        registriereSchriftarten()
 
         self.sichtpruefung = None
         self.pruefungenNachKategorienGruppiert = {}
-        self.hinweisHoehe = 0
-        self.bemerkungenHoehe = 0
 
 
-    def erstelle_pdf(self, pdfPfad: str, sichtpruefung: Sichtpruefung) -> None:
+    def erstelle_pdf(self, pdfPfad: str, sichtpruefung: Sichtpruefung, fortschritt: Optional[Callable[[int], None]] = None) -> None:
+        """Erstellt das PDF der Sichtprüfung unter pdfPfad, siehe erstelle_pdf_stream."""
         logger.info(f"Erstelle PDF: {pdfPfad}")
+        with open(pdfPfad, "wb") as datei:
+            self.erstelle_pdf_stream(datei, sichtpruefung, fortschritt)
+        logger.info(f"PDF erfolgreich erstellt: {pdfPfad}")
+
+    def erstelle_pdf_stream(self, ziel: BinaryIO, sichtpruefung: Sichtpruefung,
+                            fortschritt: Optional[Callable[[int], None]] = None) -> tuple[int, int]:
+        """Schreibt das PDF der Sichtprüfung in einen beschreibbaren Stream, z.B. ein BytesIO,
+        und gibt Seitenzahl und Größe in Bytes zurück. `fortschritt` wird während des Layouts
+        mit dem Fortschritt in Prozent aufgerufen und kann mit PdfAbgebrochen abbrechen."""
         logger.debug(f"Prüfobjekt: {sichtpruefung.pruefanweisung.namePruefobjekt}")
-        
-        self.checkboxYPos = self.checkboxY
+        self.sichtpruefungSetzen(sichtpruefung)
+        return self.berichtSchreiben(ziel, sichtpruefung.pruefanweisung, self.checklisteElemente(), fortschritt)
+
+    def erstelle_sammelbericht(self, pdfPfad: str, sichtpruefungen: list[Sichtpruefung],
+                               fortschritt: Optional[Callable[[int], None]] = None) -> None:
+        """Erstellt den Sammelbericht unter pdfPfad, siehe erstelle_sammelbericht_stream."""
+        logger.info(f"Erstelle Sammelbericht: {pdfPfad}")
+        with open(pdfPfad, "wb") as datei:
+            self.erstelle_sammelbericht_stream(datei, sichtpruefungen, fortschritt)
+        logger.info(f"Sammelbericht erfolgreich erstellt: {pdfPfad}")
+
+    def erstelle_sammelbericht_stream(self, ziel: BinaryIO, sichtpruefungen: list[Sichtpruefung],
+                                      fortschritt: Optional[Callable[[int], None]] = None) -> tuple[int, int]:
+        """Ein PDF für mehrere Sichtprüfungen derselben Prüfanweisung: Deckblatt, Vorgaben und
+        Prüfablauf nur einmal, danach eine Übersicht und die Checkliste jedes Prüfobjekts."""
+        if not sichtpruefungen:
+            raise ValueError("Sammelbericht ohne Sichtprüfungen")
+        pruefanweisung = sichtpruefungen[0].pruefanweisung
+        schluessel = vorspannSchluessel(pruefanweisung)
+        for sichtpruefung in sichtpruefungen[1:]:
+            if sichtpruefung.pruefanweisung is not pruefanweisung and vorspannSchluessel(sichtpruefung.pruefanweisung) != schluessel:
+                raise ValueError(f"Sammelbericht nur für Sichtprüfungen derselben Prüfanweisung "
+                                 f"({pruefanweisung.namePruefobjekt}), nicht {sichtpruefung.pruefanweisung.namePruefobjekt}")
+        logger.debug(f"Sammelbericht für {len(sichtpruefungen)} Sichtprüfungen: {pruefanweisung.namePruefobjekt}")
+
+        elemente = self.uebersichtElemente(sichtpruefungen)
+        for sichtpruefung in sichtpruefungen:
+            self.sichtpruefungSetzen(sichtpruefung)
+            elemente.append(PageBreak())
+            elemente.extend(self.checklisteElemente())
+        return self.berichtSchreiben(ziel, pruefanweisung, elemente, fortschritt)
+
+    def sichtpruefungSetzen(self, sichtpruefung: Sichtpruefung) -> None:
         self.sichtpruefung = sichtpruefung
         self.pruefungenNachKategorienGruppiert = eigenschaftspruefungenNachKategorienGruppieren(self.sichtpruefung.eigenschaftspruefungen)
         logger.debug(f"Eigenschaftsprüfungen gruppiert in {len(self.pruefungenNachKategorienGruppiert)} Kategorien")
-        
-        doc = SimpleDocTemplate(pdfPfad, pagesize=A4)
+
+    def berichtSchreiben(self, ziel: BinaryIO, pruefanweisung: Pruefanweisung, elemente: list,
+                         fortschritt: Optional[Callable[[int], None]] = None) -> tuple[int, int]:
+        """Setzt `elemente` hinter den (gecachten) Vorspann der Prüfanweisung und schreibt das PDF."""
+        try:
+            # Muss der Vorspann erst gesetzt werden, meldet er seinen Anteil, die Checkliste den Rest
+            gemeldet = [0]
+
+            def vorspannFortschritt(prozent: int) -> None:
+                gemeldet[0] = prozent
+                fortschritt(prozent)
+
+            vorspann, schriftStand = self.vorspannPdf(pruefanweisung, vorspannFortschritt if fortschritt is not None else None,
+                                                      folgende=len(elemente))
+            logger.debug("Baue Checkliste auf")
+            checkliste = io.BytesIO()
+            doc = SimpleDocTemplate(checkliste, pagesize=A4)
+            if fortschritt is not None:
+                doc.setProgressCallBack(self.fortschrittMelden(fortschritt, von=gemeldet[0]))
+            doc.build(elemente, onFirstPage=self.draw_header, onLaterPages=self.draw_header,
+                      canvasmaker=functools.partial(SchriftCanvas, schriftVorgabe=schriftStand))
+
+            # Deckblatt, Vorgaben und Prüfablauf aus dem Cache vor die Checkliste setzen
+            writer = PdfWriter()
+            vorspannReader = PdfReader(io.BytesIO(vorspann))
+            checklisteReader = PdfReader(checkliste)
+            if schriftStand:
+                self.schriftenTeilen(writer, vorspannReader, checklisteReader)
+            writer.append(vorspannReader)
+            self.checklisteAnhaengen(writer, checklisteReader)
+            if vorspannReader.metadata:
+                writer.add_metadata(vorspannReader.metadata)
+            groesse = self.pdfSchreiben(writer, ziel)
+            logger.debug(f"PDF mit {len(writer.pages)} Seiten und {groesse} Bytes erstellt")
+            return len(writer.pages), groesse
+        except PdfAbgebrochen:
+            logger.info("Erstellen des PDFs abgebrochen")
+            raise
+        except Exception as e:
+            logger.error(f"Fehler beim Erstellen des PDFs: {e}", exc_info=True)
+            raise
+
+    @staticmethod
+    def pdfSchreiben(writer: PdfWriter, ziel: BinaryIO) -> int:
+        """pypdf braucht für die Querverweistabelle tell(). Nicht positionierbare Ziele
+        (Pipes, Sockets) bekommen das fertige PDF daher in einem Stück."""
+        if ziel.seekable():
+            anfang = ziel.tell()
+            writer.write(ziel)
+            return ziel.tell() - anfang
+        puffer = io.BytesIO()
+        writer.write(puffer)
+        ziel.write(puffer.getbuffer())
+        return puffer.tell()
+
+    @staticmethod
+    def checklisteAnhaengen(writer: PdfWriter, checkliste: PdfReader) -> None:
+        """Hängt die Seiten der Checkliste an. Sie verweisen auf das Logo des Vorspanns,
+        statt es ein zweites Mal ins PDF zu übernehmen."""
+        logoName = NameObject(f"/FormXob.{_logoForm}")
+        logo = writer.pages[0]["/Resources"]["/XObject"].raw_get(logoName) if writer.pages else None
+        for seite in checkliste.pages:
+            xObjekte = seite["/Resources"].get("/XObject")
+            if logo is None or xObjekte is None or logoName not in xObjekte:
+                writer.add_page(seite)
+                continue
+            del xObjekte[logoName]
+            writer.add_page(seite)["/Resources"]["/XObject"][logoName] = logo
+
+    @staticmethod
+    def schriftenTeilen(writer: PdfWriter, vorspann: PdfReader, checkliste: PdfReader) -> None:
+        """Lässt die Seiten des Vorspanns die Schriften der Checkliste verwenden. Deren Teilmengen
+        beginnen mit der Belegung des Vorspanns (SchriftCanvas) und enthalten so auch alle seine
+        Zeichen. Vor dem Anhängen aufrufen: die Schriften des Vorspanns werden dann gar nicht
+        erst ins PDF übernommen."""
+        def seitenSchriftenVon(seite) -> dict:
+            seitenSchriften = seite["/Resources"].get("/Font")
+            return seitenSchriften.get_object() if seitenSchriften is not None else {}
+
+        schriften = {}
+        for seite in checkliste.pages:
+            seitenSchriften = seitenSchriftenVon(seite)
+            for name in seitenSchriften:
+                basis = seitenSchriften[name]["/BaseFont"]
+                if basis not in schriften:
+                    # Schon jetzt in den Writer kopieren; add_page verwendet die Kopie wieder
+                    schriften[basis] = seitenSchriften.raw_get(name).clone(writer)
+        for seite in vorspann.pages:
+            seitenSchriften = seitenSchriftenVon(seite)
+            for name in list(seitenSchriften):
+                schrift = schriften.get(seitenSchriften[name]["/BaseFont"])
+                if schrift is not None:
+                    seitenSchriften[NameObject(name)] = schrift
+
+    def vorspannPdf(self, pruefanweisung: Pruefanweisung, fortschritt: Optional[Callable[[int], None]] = None,
+                    folgende: int = 0) -> tuple[bytes, dict]:
+        """Deckblatt, Vorgaben und Prüfablauf als eigenes PDF samt Zeichenbelegung der Schriften.
+        Sie hängen nur von der Prüfanweisung ab und werden je Inhalt (vorspannSchluessel) nur
+        einmal gesetzt. Beim Setzen meldet `fortschritt` den Anteil des Vorspanns, gemessen an
+        seinen und `folgende` weiteren Flowables, und kann mit PdfAbgebrochen abbrechen."""
+        schluessel = vorspannSchluessel(pruefanweisung)
+        vorspann = _vorspannCache.get(schluessel)
+        if vorspann is not None:
+            logger.debug(f"Vorspann aus dem Cache: {schluessel[:12]}")
+            return vorspann
+        logger.debug(f"Baue Vorspann auf: {schluessel[:12]}")
+        puffer = io.BytesIO()
+        doc = SimpleDocTemplate(puffer, pagesize=A4)
+        if fortschritt is not None:
+            doc.setProgressCallBack(self.fortschrittMelden(fortschritt, folgende=folgende))
+        doc.build(self.vorspannElemente(pruefanweisung), onFirstPage=self.draw_header, onLaterPages=self.draw_header,
+                  canvasmaker=SchriftCanvas)
+        vorspann = (puffer.getvalue(), doc.canv.schriftStand)
+        _vorspannCache.put(schluessel, vorspann, len(vorspann[0]))
+        return vorspann
+
+    def vorspannElemente(self, pruefanweisung: Pruefanweisung) -> list:
         elements = []
-        styles = getSampleStyleSheet()
-        styles["Title"].fontName = "SourceSans3"
-        styles["Heading2"].fontName = "SourceSans3"
-        styles["Normal"].fontName = "SourceSans3-Light"
+        styles = stylesheet()
 
         # Titel "Prüfanweisung"
         elements.append(Spacer(1, 32))
-        elements.append(Paragraph("Prüfanweisung", ParagraphStyle(name="RightAligned", textColor=HexColor("#4472C4"), fontSize=38, parent=styles["Title"], alignment=TA_RIGHT, rightIndent=-40)))
+        elements.append(Paragraph("Prüfanweisung", absatzStil("RightAligned", textColor=HexColor("#4472C4"), fontSize=38, parent="Title", alignment=TA_RIGHT, rightIndent=-40)))
         elements.append(Spacer(1, 18))
 
         # Titel "Prüfobjekt Name"
-        elements.append(Paragraph(f"<b>{self.sichtpruefung.pruefanweisung.namePruefobjekt}</b>", ParagraphStyle("RightAligned", textColor=HexColor("#4472C4"), fontSize=36, fontName="SourceSans3-Light", parent=styles["Title"], alignment=TA_RIGHT, rightIndent=-40)))
+        elements.append(Paragraph(f"<b>{pruefanweisung.namePruefobjekt}</b>", absatzStil("RightAligned", textColor=HexColor("#4472C4"), fontSize=36, fontName="SourceSans3-Light", parent="Title", alignment=TA_RIGHT, rightIndent=-40)))
         elements.append(Spacer(1, 36.5))
 
         # Titel "Prüfobjekt Name"
-        elements.append(Paragraph(f"<b>{self.sichtpruefung.pruefanweisung.pruefart}</b>", ParagraphStyle("RightAligned", textColor=HexColor("#575756"), fontSize=21, fontName="SourceSans3-SemiBold", parent=styles["Title"], alignment=TA_RIGHT, rightIndent=-40)))
+        elements.append(Paragraph(f"<b>{pruefanweisung.pruefart}</b>", absatzStil("RightAligned", textColor=HexColor("#575756"), fontSize=21, fontName="SourceSans3-SemiBold", parent="Title", alignment=TA_RIGHT, rightIndent=-40)))
         elements.append(Spacer(1, -2.5))
 
         # Titel "Prüfobjekt Name"
-        elements.append(Paragraph(f"<b>gemäß {self.sichtpruefung.pruefanweisung.pruefvorgabe}</b>", ParagraphStyle("RightAligned", textColor=HexColor("#575756"), fontSize=21, fontName="SourceSans3-SemiBold", parent=styles["Title"], alignment=TA_RIGHT, rightIndent=-40)))
+        elements.append(Paragraph(f"<b>gemäß {pruefanweisung.pruefvorgabe}</b>", absatzStil("RightAligned", textColor=HexColor("#575756"), fontSize=21, fontName="SourceSans3-SemiBold", parent="Title", alignment=TA_RIGHT, rightIndent=-40)))
 
         # Prüfinformationen in einer Tabelle
         prueftabelle = [
-            ["Prüfvorgabe", f"{self.sichtpruefung.pruefanweisung.pruefvorgabe or '-'} {self.sichtpruefung.pruefanweisung.pruefvorgabeZusatz or ''}"],
-            ["Prüffrist", f"{self.sichtpruefung.pruefanweisung.prueffrist or '-'}"],
-            ["Sachkundiger", f"{self.sichtpruefung.pruefanweisung.sachkundiger or '-'}"],
-            [Paragraph("<b>Weitergehende Prüfungen</b><br/>(mit Zusatzausbildung)", ParagraphStyle(name="TableText", fontName="SourceSans3", fontSize=12, parent=styles["Normal"], alignment=TA_CENTER, leading=13)), f"{self.sichtpruefung.pruefanweisung.zusatzausbildung or '-'}"],
-            [Paragraph("<b>Weitergehende Prüfungen</b><br/>(nur durch Hersteller)", ParagraphStyle(name="TableText", fontName="SourceSans3", fontSize=12, parent=styles["Normal"], alignment=TA_CENTER, leading=13)), f"{self.sichtpruefung.pruefanweisung.hersteller or '-'}"],
-            ["Aussonderungsfrist", f"{self.sichtpruefung.pruefanweisung.aussonderungsfrist or '-'}"],
+            ["Prüfvorgabe", f"{pruefanweisung.pruefvorgabe or '-'} {pruefanweisung.pruefvorgabeZusatz or ''}"],
+            ["Prüffrist", f"{pruefanweisung.prueffrist or '-'}"],
+            ["Sachkundiger", f"{pruefanweisung.sachkundiger or '-'}"],
+            [Paragraph("<b>Weitergehende Prüfungen</b><br/>(mit Zusatzausbildung)", absatzStil("TableText", fontName="SourceSans3", fontSize=12, parent="Normal", alignment=TA_CENTER, leading=13)), f"{pruefanweisung.zusatzausbildung or '-'}"],
+            [Paragraph("<b>Weitergehende Prüfungen</b><br/>(nur durch Hersteller)", absatzStil("TableText", fontName="SourceSans3", fontSize=12, parent="Normal", alignment=TA_CENTER, leading=13)), f"{pruefanweisung.hersteller or '-'}"],
+            ["Aussonderungsfrist", f"{pruefanweisung.aussonderungsfrist or '-'}"],
         ]
 
         tabelle = Table(prueftabelle, colWidths=[219.5, 249])
-        tabelle.setStyle(TableStyle([
+        tabelle.setStyle(tabellenStil(
             ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
             ("ALIGN", (0, 0), (-1, -1), "CENTER"),
             ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
@@ -115,7 +455,7 @@ class PdfGenerator():
             ("BOTTOMPADDING", (0, 0), (-1, -1), 8.5),
             ("BACKGROUND", (0, 1), (-1, -1), colors.whitesmoke),
             ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-        ]))
+        ))
 
         # Berechne, wie viel Platz über der Tabelle bleibt
         margin = 72
@@ -132,212 +472,235 @@ class PdfGenerator():
 
         # Vorgaben Abschnitt
         header = Table(
-            [[Paragraph("Vorgaben", ParagraphStyle(name="BlauerTitel", textColor=HexColor("#FFFFFF"), fontName="SourceSans3-SemiBold", fontSize=20, parent=styles["Title"], alignment=TA_LEFT))]],  # Text in die Tabelle packen
+            [[Paragraph("Vorgaben", absatzStil("BlauerTitel", textColor=HexColor("#FFFFFF"), fontName="SourceSans3-SemiBold", fontSize=20, parent="Title", alignment=TA_LEFT))]],  # Text in die Tabelle packen
             colWidths=[459]  # Hier die gewünschte Breite setzen
         )
 
-        header.setStyle(TableStyle([
+        header.setStyle(tabellenStil(
             ("BACKGROUND", (0, 0), (-1, -1), HexColor("#4472C4")),  # Blauer Hintergrund
             ("FONTNAME", (0, 0), (-1, -1), "SourceSans3-SemiBold"),
             ("LEFTPADDING", (0, 0), (-1, -1), 1.5),
             ("TOPPADDING", (0, 0), (-1, -1), -1.5),
             ("BOTTOMPADDING", (0, 0), (-1, -1), 3.5),
-        ]))
+        ))
 
         elements.append(header)
         elements.append(Spacer(1, 18))
-        elements.append(Paragraph(f"{cleanHtml(self.sichtpruefung.pruefanweisung.vorgabenText)}", styles["Normal"]))
+        elements.extend(self.richTextElemente(pruefanweisung.vorgabenText, styles["Normal"]))
 
         elements.append(PageBreak())
         elements.append(Spacer(1, -7))
 
         # Prüfablauf Abschnitt
         header = Table(
-            [[Paragraph("Beschreibung des Prüfablaufs", ParagraphStyle(name="BlauerTitel", textColor=HexColor("#FFFFFF"), fontName="SourceSans3-SemiBold", fontSize=20, parent=styles["Title"], alignment=TA_LEFT))]],  # Text in die Tabelle packen
+            [[Paragraph("Beschreibung des Prüfablaufs", absatzStil("BlauerTitel", textColor=HexColor("#FFFFFF"), fontName="SourceSans3-SemiBold", fontSize=20, parent="Title", alignment=TA_LEFT))]],  # Text in die Tabelle packen
             colWidths=[459]  # Hier die gewünschte Breite setzen
         )
 
-        header.setStyle(TableStyle([
+        header.setStyle(tabellenStil(
             ("BACKGROUND", (0, 0), (-1, -1), HexColor("#4472C4")),  # Blauer Hintergrund
             ("FONTNAME", (0, 0), (-1, -1), "SourceSans3-SemiBold"),
             ("LEFTPADDING", (0, 0), (-1, -1), 1.5),
             ("TOPPADDING", (0, 0), (-1, -1), -1.5),
             ("BOTTOMPADDING", (0, 0), (-1, -1), 3.5),
-        ]))
+        ))
 
         elements.append(header)
         elements.append(Spacer(1, 18))
-        elements.append(Paragraph(f"{cleanHtml(self.sichtpruefung.pruefanweisung.pruefablaufText)}", styles["Normal"]))
+        elements.extend(self.richTextElemente(pruefanweisung.pruefablaufText, styles["Normal"]))
 
-        elements.append(PageBreak())
+        return elements
+
+    def uebersichtElemente(self, sichtpruefungen: list[Sichtpruefung]) -> list:
+        """Übersicht des Sammelberichts: eine Zeile je Prüfobjekt und die Anzahl einsatzbereiter."""
+        elements = [Spacer(1, -7)]
+        header = Table(
+            [[Paragraph("Übersicht", absatzStil("BlauerTitel", textColor=HexColor("#FFFFFF"), fontName="SourceSans3-SemiBold", fontSize=20, parent="Title", alignment=TA_LEFT))]],
+            colWidths=[459]
+        )
+        header.setStyle(tabellenStil(
+            ("BACKGROUND", (0, 0), (-1, -1), HexColor("#4472C4")),  # Blauer Hintergrund
+            ("FONTNAME", (0, 0), (-1, -1), "SourceSans3-SemiBold"),
+            ("LEFTPADDING", (0, 0), (-1, -1), 1.5),
+            ("TOPPADDING", (0, 0), (-1, -1), -1.5),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 3.5),
+        ))
+        elements.append(header)
+        elements.append(Spacer(1, 19.5))
+
+        einsatzbereit = sum(1 for sichtpruefung in sichtpruefungen if sichtpruefung.einsatzbereit)
+        kopf = absatzStil("BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent="Title", alignment=TA_LEFT, leading=16)
+        zelle = absatzStil("BlauerTitel", fontName="SourceSans3", fontSize=9, parent="Title", alignment=TA_LEFT, leading=11.5)
+        zeilen = [[Paragraph(f"Prüfobjekt: {sichtpruefungen[0].pruefanweisung.namePruefobjekt}", kopf), "", "", "", "", ""],
+                  [Paragraph(text, kopf) for text in ("Nr.", "Nummer", "Lagerort", "Datum", "Prüfer", "Einsatzbereit")]]
+        for position, sichtpruefung in enumerate(sichtpruefungen, start=1):
+            zeilen.append([Paragraph(text, zelle) for text in (
+                str(position), sichtpruefung.nummer, sichtpruefung.lagerort, sichtpruefung.datum, sichtpruefung.pruefer,
+                "Ja" if sichtpruefung.einsatzbereit else "<b>Nein</b>")])
+        zeilen.append([Paragraph(f"<b>Einsatzbereit:</b> {einsatzbereit} &nbsp; &nbsp; <b>Nicht einsatzbereit:</b> "
+                                 f"{len(sichtpruefungen) - einsatzbereit} &nbsp; &nbsp; <b>Gesamt:</b> {len(sichtpruefungen)}", kopf), "", "", "", "", ""])
+
+        tabelle = Table(zeilen, colWidths=[26, 84, 110, 66, 112, 84], repeatRows=2)
+        tabelle.setStyle(tabellenStil(
+            ("SPAN", (0, 0), (-1, 0)),
+            ("SPAN", (0, -1), (-1, -1)),
+            ("BACKGROUND", (0, 0), (-1, 1), HexColor("#A1C0E4")),  # Blauer Hintergrund
+            ("BACKGROUND", (0, 2), (-1, -1), HexColor("#FFFFFF")),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            ("TOPPADDING", (0, 0), (-1, -1), 0),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
+            ("GRID", (0, 0), (-1, -1), 1, HexColor("#4472C4")),
+        ))
+        elements.append(tabelle)
+        return elements
+
+    def checklisteElemente(self) -> list:
+        elements = []
         elements.append(Spacer(1, -7))
 
         # Checkliste Tabelle
         header = Table(
-            [[Paragraph("Checkliste", ParagraphStyle(name="BlauerTitel", textColor=HexColor("#FFFFFF"), fontName="SourceSans3-SemiBold", fontSize=20, parent=styles["Title"], alignment=TA_LEFT))]],  # Text in die Tabelle packen
+            [[Paragraph("Checkliste", absatzStil("BlauerTitel", textColor=HexColor("#FFFFFF"), fontName="SourceSans3-SemiBold", fontSize=20, parent="Title", alignment=TA_LEFT))]],  # Text in die Tabelle packen
             colWidths=[459]  # Hier die gewünschte Breite setzen
         )
 
-        header.setStyle(TableStyle([
+        header.setStyle(tabellenStil(
             ("BACKGROUND", (0, 0), (-1, -1), HexColor("#4472C4")),  # Blauer Hintergrund
             ("FONTNAME", (0, 0), (-1, -1), "SourceSans3-SemiBold"),
             ("LEFTPADDING", (0, 0), (-1, -1), 1.5),
             ("TOPPADDING", (0, 0), (-1, -1), -1.5),
             ("BOTTOMPADDING", (0, 0), (-1, -1), 3.5),
-        ]))
+        ))
 
         elements.append(header)
         elements.append(Spacer(1, 19.5))
 
         header = Table(
-            [[Paragraph(f"Prüfobjekt: {self.sichtpruefung.pruefanweisung.namePruefobjekt}", ParagraphStyle(name="BlauerTitel", textColor=HexColor("#FFFFFF"), fontName="SourceSans3-SemiBold", fontSize=16, parent=styles["Title"], alignment=TA_LEFT, leading=20.9))]],  # Text in die Tabelle packen
+            [[Paragraph(f"Prüfobjekt: {self.sichtpruefung.pruefanweisung.namePruefobjekt}", absatzStil("BlauerTitel", textColor=HexColor("#FFFFFF"), fontName="SourceSans3-SemiBold", fontSize=16, parent="Title", alignment=TA_LEFT, leading=20.9))]],  # Text in die Tabelle packen
             colWidths=[482]
         )
 
-        header.setStyle(TableStyle([
+        header.setStyle(tabellenStil(
             ("BACKGROUND", (0, 0), (-1, -1), HexColor("#4472C4")),  # Blauer Hintergrund
             ("FONTNAME", (0, 0), (-1, -1), "SourceSans3-SemiBold"),
             ("TOPPADDING", (0, 0), (-1, -1), -0.5),
             ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
             ("GRID", (0, 0), (-1, -1), 1, HexColor("#4472C4")),
-        ]))
+        ))
         
-        _, nameHoehe = header.wrap(0, 0)
-        self.checkboxYPos -= nameHoehe
         elements.append(header)
 
         header = Table(
-            [[Paragraph(f"<b>Lagerort:</b> {self.sichtpruefung.lagerort}", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3", fontSize=16, parent=styles["Title"], alignment=TA_LEFT, leading=21)),
-              Paragraph(f"<b>Nummer:</b> {self.sichtpruefung.nummer}", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3", fontSize=16, parent=styles["Title"], alignment=TA_LEFT, leading=21))]],  # Text in die Tabelle packen
+            [[Paragraph(f"<b>Lagerort:</b> {self.sichtpruefung.lagerort}", absatzStil("BlauerTitel", fontName="SourceSans3", fontSize=16, parent="Title", alignment=TA_LEFT, leading=21)),
+              Paragraph(f"<b>Nummer:</b> {self.sichtpruefung.nummer}", absatzStil("BlauerTitel", fontName="SourceSans3", fontSize=16, parent="Title", alignment=TA_LEFT, leading=21))]],  # Text in die Tabelle packen
             colWidths=[241, 241]  # Hier die gewünschte Breite setzen
         )
 
-        header.setStyle(TableStyle([
+        header.setStyle(tabellenStil(
             ("BACKGROUND", (0, 0), (-1, -1), HexColor("#FFFFFF")),  # Blauer Hintergrund
             ("FONTNAME", (0, 0), (-1, -1), "SourceSans3-SemiBold"),
             ("TOPPADDING", (0, 0), (-1, -1), -0.5),
             ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
             ("GRID", (0, 0), (-1, -1), 1, HexColor("#4472C4")),
-        ]))
+        ))
 
-        _, stammdatenHoehe = header.wrap(0, 0)
-        self.checkboxYPos -= stammdatenHoehe
         elements.append(header)
 
         header = Table(
-            [[Paragraph("Sichtprüfung", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=16, parent=styles["Title"], alignment=TA_CENTER))]],  # Text in die Tabelle packen
+            [[Paragraph("Sichtprüfung", absatzStil("BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=16, parent="Title", alignment=TA_CENTER))]],  # Text in die Tabelle packen
             colWidths=[482]
         )
 
-        header.setStyle(TableStyle([
+        header.setStyle(tabellenStil(
             ("BACKGROUND", (0, 0), (-1, -1), HexColor("#A1C0E4")),  # Blauer Hintergrund
             ("FONTNAME", (0, 0), (-1, -1), "SourceSans3-SemiBold"),
             ("TOPPADDING", (0, 0), (-1, -1), -1),
             ("BOTTOMPADDING", (0, 0), (-1, -1), -1),
             ("GRID", (0, 0), (-1, -1), 1, HexColor("#4472C4")),
-        ]))
+        ))
 
         elements.append(header)
 
         header = Table(
-            [[Paragraph("√ = kein Handlungsbedarf", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=9, parent=styles["Title"], alignment=TA_RIGHT)),
-             Paragraph("Maßnahmen festlegen", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=9, parent=styles["Title"], alignment=TA_LEFT))]],  # Text in die Tabelle packen
+            [[Paragraph("√ = kein Handlungsbedarf", absatzStil("BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=9, parent="Title", alignment=TA_RIGHT)),
+             Paragraph("Maßnahmen festlegen", absatzStil("BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=9, parent="Title", alignment=TA_LEFT))]],  # Text in die Tabelle packen
             colWidths=[283, 199]  # Hier die gewünschte Breite setzen
         )
 
-        header.setStyle(TableStyle([
+        header.setStyle(tabellenStil(
             ("BACKGROUND", (0, 0), (-1, -1), HexColor("#FFFFFF")),  # Blauer Hintergrund
             ("FONTNAME", (0, 0), (-1, -1), "SourceSans3-SemiBold"),
             ("TOPPADDING", (0, 0), (-1, -1), 0),
             ("BOTTOMPADDING", (0, 0), (-1, -1), -10),
             ("GRID", (0, 0), (-1, -1), 1, HexColor("#4472C4")),
-        ]))
+        ))
 
         elements.append(header)
 
         header = Table(
-            [[Paragraph("", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent=styles["Title"], alignment=TA_LEFT)),
-             Paragraph("√", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent=styles["Title"], alignment=TA_CENTER)),
-             Paragraph("Maßnahmen", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent=styles["Title"], alignment=TA_LEFT))]],  # Text in die Tabelle packen
+            [[Paragraph("", absatzStil("BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent="Title", alignment=TA_LEFT)),
+             Paragraph("√", absatzStil("BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent="Title", alignment=TA_CENTER)),
+             Paragraph("Maßnahmen", absatzStil("BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent="Title", alignment=TA_LEFT))]],  # Text in die Tabelle packen
             colWidths=[262, 21, 199]  # Hier die gewünschte Breite setzen
         )
 
-        header.setStyle(TableStyle([
+        header.setStyle(tabellenStil(
             ("BACKGROUND", (0, 0), (-1, -1), HexColor("#FFFFFF")),  # Blauer Hintergrund
             ("FONTNAME", (0, 0), (-1, -1), "SourceSans3-SemiBold"),
             ("TOPPADDING", (0, 0), (-1, -1), 0),
             ("BOTTOMPADDING", (0, 0), (-1, -1), -6.5),
             ("GRID", (0, 0), (-1, -1), 1, HexColor("#4472C4")),
-        ]))
+        ))
 
         elements.append(header)
 
+        # Eine Tabelle je Kategorie: Kopfzeile mit dem Namen, darunter eine Zeile je Eigenschaft.
+        # Reicht eine Kategorie über das Seitenende, wird sie geteilt und der Kopf wiederholt.
         for kategorie, pruefungen in self.pruefungenNachKategorienGruppiert.items():
-            header = Table(
-                [[Paragraph(f"{kategorie}", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent=styles["Title"], alignment=TA_LEFT, leading=16))]],  # Text in die Tabelle packen
-                colWidths=[482]
-            )
-
-            header.setStyle(TableStyle([
-                ("BACKGROUND", (0, 0), (-1, -1), HexColor("#A1C0E4")),  # Blauer Hintergrund
+            zeilen = [[Paragraph(f"{kategorie}", absatzStil("BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent="Title", alignment=TA_LEFT, leading=16)), "", ""]]
+            for pruefung in pruefungen:
+                zeilen.append([Paragraph(f"{pruefung.eigenschaft.beschreibung}", absatzStil("BlauerTitel", fontName="SourceSans3", fontSize=9, parent="Title", alignment=TA_LEFT, leading=11.5)),
+                               Paragraph(f"{'√' if pruefung.keinHandlungsbedarf else ''}", absatzStil("BlauerTitel", fontName="SourceSans3", fontSize=9, parent="Title", alignment=TA_CENTER, leading=11.5)),
+                               Paragraph(f"{pruefung.massnahmen}", absatzStil("BlauerTitel", fontName="SourceSans3", fontSize=9, parent="Title", alignment=TA_LEFT, leading=11.5))])
+
+            tabelle = Table(zeilen, colWidths=[262, 21, 199], repeatRows=1)
+            tabelle.setStyle(tabellenStil(
+                ("SPAN", (0, 0), (-1, 0)),
+                ("BACKGROUND", (0, 0), (-1, 0), HexColor("#A1C0E4")),  # Blauer Hintergrund
+                ("BACKGROUND", (0, 1), (-1, -1), HexColor("#FFFFFF")),
+                ("VALIGN", (0, 1), (2, -1), "MIDDLE"),
                 ("FONTNAME", (0, 0), (-1, -1), "SourceSans3-SemiBold"),
                 ("TOPPADDING", (0, 0), (-1, -1), 0),
                 ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
                 ("GRID", (0, 0), (-1, -1), 1, HexColor("#4472C4")),
-            ]))
-
-            _, kategorieHoehe = header.wrap(0, 0)
-            self.checkboxYPos -= kategorieHoehe
-            elements.append(header)
-
-            for pruefung in pruefungen:
-                header = Table(
-                    [[Paragraph(f"{pruefung.eigenschaft.beschreibung}", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3", fontSize=9, parent=styles["Title"], alignment=TA_LEFT, leading=11.5)),
-                     Paragraph(f"{'√' if pruefung.keinHandlungsbedarf else ''}", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3", fontSize=9, parent=styles["Title"], alignment=TA_CENTER, leading=11.5)),
-                     Paragraph(f"{pruefung.massnahmen}", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3", fontSize=9, parent=styles["Title"], alignment=TA_LEFT, leading=11.5))]],  # Text in die Tabelle packen
-                    colWidths=[262, 21, 199]  # Hier die gewünschte Breite setzen
-                )
-
-                header.setStyle(TableStyle([
-                    ("BACKGROUND", (0, 0), (-1, -1), HexColor("#FFFFFF")),  # Blauer Hintergrund
-                    ("VALIGN", (0, 0), (2, -1), "MIDDLE"),
-                    ("FONTNAME", (0, 0), (-1, -1), "SourceSans3-SemiBold"),
-                    ("TOPPADDING", (0, 0), (-1, -1), 0),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
-                    ("GRID", (0, 0), (-1, -1), 1, HexColor("#4472C4")),
-                ]))
-
-                _, pruefungHoehe = header.wrap(0, 0)
-                self.checkboxYPos -= pruefungHoehe
-                elements.append(header)
+            ))
+            elements.append(tabelle)
         #elements.append(Spacer(1, 14))
 
         header = Table(
-            [[Paragraph(f"<b>Hinweis:</b><br/>{self.sichtpruefung.pruefanweisung.hinweis}", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3", fontSize=9, parent=styles["Title"], alignment=TA_LEFT, leading=10.5))]],  # Text in die Tabelle packen
+            [[Paragraph(f"<b>Hinweis:</b><br/>{self.sichtpruefung.pruefanweisung.hinweis}", absatzStil("BlauerTitel", fontName="SourceSans3", fontSize=9, parent="Title", alignment=TA_LEFT, leading=10.5))]],  # Text in die Tabelle packen
             colWidths=[482]
         )
 
-        header.setStyle(TableStyle([
+        header.setStyle(tabellenStil(
             ("BACKGROUND", (0, 0), (-1, -1), HexColor("#FFFFFF")),  # Blauer Hintergrund
             ("FONTNAME", (0, 0), (-1, -1), "SourceSans3-SemiBold"),
             ("TOPPADDING", (0, 0), (-1, -1), 0.5),
             ("BOTTOMPADDING", (0, 0), (-1, -1), 1.5),
             ("GRID", (0, 0), (-1, -1), 1, HexColor("#4472C4")),
-        ]))
+        ))
 
-        _, hinweisHoehe = header.wrap(0, 0)
-        self.checkboxYPos -= hinweisHoehe
         elements.append(header)
 
         header = Table(
-            [[Paragraph("Einsatzbereit", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent=styles["Title"], alignment=TA_LEFT)),
-             Paragraph("Ja", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent=styles["Title"], alignment=TA_LEFT)),
-             Paragraph("Nein", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent=styles["Title"], alignment=TA_LEFT)),
-             Paragraph(f"<b><u>Bemerkungen:</u></b><br/>{self.sichtpruefung.bemerkungen}", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3", fontSize=12, parent=styles["Title"], alignment=TA_LEFT, leading=13.5))]],  # Text in die Tabelle packen
+            [[Paragraph("Einsatzbereit", absatzStil("BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent="Title", alignment=TA_LEFT)),
+             BeschrifteteCheckbox("Ja", absatzStil("BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent="Title", alignment=TA_LEFT), self.sichtpruefung.einsatzbereit),
+             BeschrifteteCheckbox("Nein", absatzStil("BlauerTitel", fontName="SourceSans3-SemiBold", fontSize=12, parent="Title", alignment=TA_LEFT), not self.sichtpruefung.einsatzbereit),
+             Paragraph(f"<b><u>Bemerkungen:</u></b><br/>{self.sichtpruefung.bemerkungen}", absatzStil("BlauerTitel", fontName="SourceSans3", fontSize=12, parent="Title", alignment=TA_LEFT, leading=13.5))]],  # Text in die Tabelle packen
             colWidths=[117, 40, 46, 279]  # Hier die gewünschte Breite setzen
         )
 
-        header.setStyle(TableStyle([
+        header.setStyle(tabellenStil(
             ("BACKGROUND", (0, 0), (0, -1), HexColor("#A1C0E4")),  # Blauer Hintergrund
             ("BACKGROUND", (3, 0), (-1, -1), HexColor("#FFFFFF")),  # Blauer Hintergrund
             ("VALIGN", (0, 0), (2, -1), "MIDDLE"),
@@ -348,46 +711,78 @@ class PdfGenerator():
             ("TOPPADDING", (3, 0), (3, -1), 0),
             ("BOTTOMPADDING", (3, 0), (3, -1), 4.5),
             ("GRID", (0, 0), (-1, -1), 1, HexColor("#4472C4")),
-        ]))
+        ))
 
-        bemerkungenHoehe = 0
-        _, wrap = header.wrap(0, 0)
-        if wrap > 45:
-            bemerkungenHoehe = (wrap - 45) / 2
-        self.checkboxYPos -= bemerkungenHoehe
         elements.append(header)
 
         header = Table(
-            [[Paragraph(f"<b>{self.sichtpruefung.pruefer}</b><br/>Prüfer", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3", fontSize=12, parent=styles["Title"], alignment=TA_LEFT, leading=25)),
-             Paragraph(f"<b>{self.sichtpruefung.datum}</b><br/>Datum", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3", fontSize=12, parent=styles["Title"], alignment=TA_LEFT, leading=25)),
-             Paragraph("Unterschrift", ParagraphStyle(name="BlauerTitel", fontName="SourceSans3", fontSize=12, parent=styles["Title"], alignment=TA_LEFT, leading=25))]],  # Text in die Tabelle packen
+            [[Paragraph(f"<b>{self.sichtpruefung.pruefer}</b><br/>Prüfer", absatzStil("BlauerTitel", fontName="SourceSans3", fontSize=12, parent="Title", alignment=TA_LEFT, leading=25)),
+             Paragraph(f"<b>{self.sichtpruefung.datum}</b><br/>Datum", absatzStil("BlauerTitel", fontName="SourceSans3", fontSize=12, parent="Title", alignment=TA_LEFT, leading=25)),
+             Paragraph("Unterschrift", absatzStil("BlauerTitel", fontName="SourceSans3", fontSize=12, parent="Title", alignment=TA_LEFT, leading=25))]],  # Text in die Tabelle packen
             colWidths=[188, 131, 163]  # Hier die gewünschte Breite setzen
         )
 
-        header.setStyle(TableStyle([
+        header.setStyle(tabellenStil(
             ("BACKGROUND", (0, 0), (-1, -1), HexColor("#FFFFFF")),  # Blauer Hintergrund
             ("FONTNAME", (0, 0), (-1, -1), "SourceSans3-SemiBold"),
             ("TOPPADDING", (0, 0), (-1, -1), 18.5),
             ("BOTTOMPADDING", (0, 0), (-1, -1), -9.5),
             ("GRID", (0, 0), (-1, -1), 1, HexColor("#4472C4")),
-        ]))
+        ))
 
         elements.append(header)
 
-        # PDF speichern
-        try:
-            logger.debug("Baue PDF-Dokument auf")
-            doc.build(elements, onFirstPage=self.draw_header, onLaterPages=self.weitereDesignElementeHinzufuegen)
-            logger.info(f"PDF erfolgreich erstellt: {pdfPfad}")
-        except Exception as e:
-            logger.error(f"Fehler beim Erstellen des PDFs: {e}", exc_info=True)
-            raise
-
-    def weitereDesignElementeHinzufuegen(self, canvas: canvas.Canvas, doc: SimpleDocTemplate) -> None:
-        self.draw_header(canvas, doc)
-        if self.sichtpruefung and doc.page == 4:  # Prüft, ob aktuelle Seite 3 ist
-            self.draw_checkbox(canvas, self.checkboxJaX, self.checkboxYPos, checked=self.sichtpruefung.einsatzbereit)  # Checkbox in der Mitte
-            self.draw_checkbox(canvas, self.checkboxNeinX, self.checkboxYPos, checked=not self.sichtpruefung.einsatzbereit)  # Checkbox in der Mitte
+        return elements
+
+    @staticmethod
+    def fortschrittMelden(fortschritt: Callable[[int], None], von: int = 0, folgende: int = 0) -> Callable[[str, int], None]:
+        """Übersetzt die Fortschrittsmeldungen von ReportLab (verarbeitete Flowables) in Prozent,
+        beginnend bei `von`. `folgende` Flowables setzt danach noch ein weiteres Dokument."""
+        gesamt = [1]
+
+        def melden(art: str, wert: int) -> None:
+            if art == "SIZE_EST":
+                gesamt[0] = max(1, wert + folgende)
+                fortschritt(von)
+            elif art == "PROGRESS":
+                fortschritt(min(99, von + wert * (100 - von) // gesamt[0]))
+
+        return melden
+
+    def richTextElemente(self, htmlText: str, style: ParagraphStyle, maxBreite: float = 459, maxHoehe: float = 600) -> list:
+        """Wandelt Rich-Text aus QTextEdit in Paragraphen um. Ausgelagerte Bilder (siehe
+        richText.bilderAuslagern) werden als Bild-Flowables an ihrer Position eingefügt."""
+        elemente = []
+        for art, inhalt in abschnitteMitBildern(htmlText):
+            if art == "text":
+                elemente.extend(self.textElemente(inhalt, style))
+                continue
+            try:
+                breite, hoehe = ImageReader(inhalt).getSize()
+            except Exception as e:
+                logger.warning(f"Bild im Rich-Text kann nicht eingefügt werden: {inhalt} ({e})")
+                continue
+            faktor = min(1, maxBreite / breite, maxHoehe / hoehe)
+            elemente.append(Image(inhalt, width=breite * faktor, height=hoehe * faktor))
+        return elemente
+
+    def textElemente(self, htmlText: str, style: ParagraphStyle) -> list:
+        """Ein Paragraph je Absatz, Listenpunkt und Zeile (siehe richText.bloecke). Viele kleine
+        Paragraphen lassen sich linear umbrechen, ein großer wird an jedem Seitenende neu geteilt."""
+        elemente = []
+        for art, inhalt, zeichen in bloecke(htmlText):
+            if art == "leer":
+                elemente.append(Spacer(1, style.leading))
+                continue
+            text = cleanHtml(inhalt).strip()
+            if not text:
+                continue
+            if art == "punkt":
+                listenStil = absatzStil(f"{style.name}Liste", parent=style.name, leftIndent=14, bulletIndent=4, bulletFontName=style.fontName)
+                elemente.append(Paragraph(text, listenStil, bulletText=zeichen or None))
+            else:
+                elemente.append(Paragraph(text, style))
+        return elemente
 
     def draw_header(self, canvas: canvas.Canvas, doc: SimpleDocTemplate) -> None:
         # Bildgröße (angepasst an dein gewünschtes Layout)
@@ -397,14 +792,8 @@ class PdfGenerator():
         # Berechnung für zentrierte Position
         logo_x = (self.PAGE_WIDTH - logo_width) / 2  # Zentriert auf der Seite
         logo_y = self.PAGE_HEIGHT - logo_height - 11  # Abstand vom oberen Rand
-        canvas.drawImage(self.logo_path, logo_x, logo_y, width=logo_width, height=logo_height, mask="auto")
-
-    def draw_checkbox(self, c: canvas.Canvas, x: float, y: float, size: float = 9.5, checked: bool = False) -> None:
-        """Zeichnet eine Checkbox an Position (x, y)"""
-        c.setLineWidth(0.8)
-        c.rect(x, y, size, size, stroke=1, fill=0)  # Zeichne Quadrat (Checkbox)
-
-        if checked:
-            c.line(x + 2, y + 2, x + size - 2, y + size - 2)  # Erste Linie für Haken
-            c.line(x + 2, y + size - 2, x + size - 2, y + 2)  # Zweite Linie für Haken
-
+        if not canvas.hasForm(_logoForm):
+            canvas.beginForm(_logoForm)
+            canvas.drawImage(logoBild(self.logo_path, logo_width, logo_height), logo_x, logo_y, width=logo_width, height=logo_height, mask="auto")
+            canvas.endForm()
+        canvas.doForm(_logoForm)
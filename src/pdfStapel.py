@@ -0,0 +1,89 @@
+import os
+import re
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+
+from src.logic import ergebnisArchiv
+from src.pdfGenerator import PdfGenerator, registriereSchriftarten
+
+logger = logging.getLogger(__name__)
+
+# Generator des Arbeitsprozesses, angelegt von _arbeiterStarten
+_generator: Optional[PdfGenerator] = None
+
+
+class StapelErgebnis():
+    """Ergebnis eines PDF-Stapels: erstellte PDFs, Fehler je Archiv-Id und Durchsatz."""
+
+    def __init__(self) -> None:
+        self.erstellt: list[str] = []
+        self.fehler: dict[int, str] = {}
+        self.seiten = 0
+        self.bytes = 0
+        self.dauer = 0.0
+
+    def pdfsProSekunde(self) -> float:
+        return len(self.erstellt) / self.dauer if self.dauer else 0.0
+
+
+def pdfDateiname(eintrag: dict) -> str:
+    """Dateiname aus Archiv-Id, Prüfobjekt und Nummer, z.B. 12_Helm_HLM-01.pdf"""
+    teile = [str(eintrag["id"]), eintrag.get("namePruefobjekt") or "", eintrag.get("nummer") or ""]
+    return "_".join(re.sub(r"[^\w.-]+", "-", teil).strip("-") for teil in teile if teil) + ".pdf"
+
+def _arbeiterStarten(archivPfad: str) -> None:
+    """Läuft einmal je Arbeitsprozess: Schriftarten registrieren und Generator anlegen."""
+    global _generator
+    ergebnisArchiv.archivPfad = archivPfad
+    registriereSchriftarten()
+    _generator = PdfGenerator()
+
+def _berichtErstellen(sichtpruefungId: int, pdfPfad: str) -> tuple[int, int]:
+    sichtpruefung = ergebnisArchiv.ladeSichtpruefung(sichtpruefungId)
+    if sichtpruefung is None:
+        raise LookupError(f"Sichtprüfung {sichtpruefungId} nicht im Archiv")
+    tmpPfad = pdfPfad + ".tmp"
+    try:
+        with open(tmpPfad, "wb") as datei:
+            seiten, groesse = _generator.erstelle_pdf_stream(datei, sichtpruefung)
+        os.replace(tmpPfad, pdfPfad)
+    finally:
+        if os.path.exists(tmpPfad):
+            os.remove(tmpPfad)
+    return seiten, groesse
+
+def pdfsErstellen(eintraege: list[dict], zielVerzeichnis: str, prozesse: Optional[int] = None) -> StapelErgebnis:
+    """Erstellt die PDFs der archivierten Sichtprüfungen (Einträge aus den Suchen des
+    ergebnisArchiv) parallel in `prozesse` Arbeitsprozessen (Standard: alle Kerne).
+    Ein fehlgeschlagener Bericht hält die übrigen nicht auf."""
+    os.makedirs(zielVerzeichnis, exist_ok=True)
+    ergebnis = StapelErgebnis()
+    prozesse = max(1, min(prozesse or os.cpu_count() or 1, len(eintraege) or 1))
+    logger.info(f"Erstelle {len(eintraege)} PDFs in {zielVerzeichnis} mit {prozesse} Prozessen")
+    start = time.perf_counter()
+    # "spawn" wie unter Windows: Arbeitsprozesse erben keine offenen SQLite-Verbindungen
+    with ProcessPoolExecutor(max_workers=prozesse, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_arbeiterStarten, initargs=(ergebnisArchiv.archivPfad,)) as executor:
+        auftraege = {}
+        for eintrag in eintraege:
+            pdfPfad = os.path.join(zielVerzeichnis, pdfDateiname(eintrag))
+            auftraege[executor.submit(_berichtErstellen, eintrag["id"], pdfPfad)] = (eintrag["id"], pdfPfad)
+        for auftrag in as_completed(auftraege):
+            sichtpruefungId, pdfPfad = auftraege[auftrag]
+            try:
+                seiten, groesse = auftrag.result()
+            except Exception as e:
+                ergebnis.fehler[sichtpruefungId] = str(e)
+                logger.error(f"PDF zu Sichtprüfung {sichtpruefungId} nicht erstellt: {e}")
+                continue
+            ergebnis.erstellt.append(pdfPfad)
+            ergebnis.seiten += seiten
+            ergebnis.bytes += groesse
+            logger.debug(f"PDF erstellt: {pdfPfad} ({seiten} Seiten, {groesse} Bytes)")
+    ergebnis.dauer = time.perf_counter() - start
+    logger.info(f"{len(ergebnis.erstellt)} PDFs in {ergebnis.dauer:.2f} s erstellt "
+                f"({ergebnis.pdfsProSekunde():.1f} PDFs/s), {len(ergebnis.fehler)} Fehler")
+    return ergebnis
@@ -1,9 +1,71 @@
 import os
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+import yaml
 import bleach
 from bs4 import BeautifulSoup
 
 
 
+class LruCache:
+    """Threadsicherer LRU-Cache, begrenzt nach Anzahl der Einträge und ihrer (geschätzten)
+    Größe in Bytes. Eine Grenze von 0 bedeutet unbegrenzt."""
+
+    def __init__(self, maxEintraege: int = 0, maxBytes: int = 0) -> None:
+        self.maxEintraege: int = maxEintraege
+        self.maxBytes: int = maxBytes
+        self.bytes: int = 0
+        self._eintraege: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, schluessel: Hashable, standard: Any = None) -> Any:
+        with self._lock:
+            eintrag = self._eintraege.get(schluessel)
+            if eintrag is None:
+                return standard
+            self._eintraege.move_to_end(schluessel)
+            return eintrag[0]
+
+    def put(self, schluessel: Hashable, wert: Any, groesse: int = 0) -> None:
+        with self._lock:
+            if schluessel in self._eintraege:
+                self.bytes -= self._eintraege.pop(schluessel)[1]
+            if self.maxBytes and groesse > self.maxBytes:
+                return  # Passt auch allein nicht in den Cache
+            self._eintraege[schluessel] = (wert, groesse)
+            self.bytes += groesse
+            while ((self.maxEintraege and len(self._eintraege) > self.maxEintraege)
+                   or (self.maxBytes and self.bytes > self.maxBytes)):
+                _, (_, verdraengtGroesse) = self._eintraege.popitem(last=False)
+                self.bytes -= verdraengtGroesse
+
+    def entfernen(self, schluessel: Hashable) -> None:
+        with self._lock:
+            eintrag = self._eintraege.pop(schluessel, None)
+            if eintrag is not None:
+                self.bytes -= eintrag[1]
+
+    def leeren(self) -> None:
+        with self._lock:
+            self._eintraege.clear()
+            self.bytes = 0
+
+    def __contains__(self, schluessel: Hashable) -> bool:
+        with self._lock:
+            return schluessel in self._eintraege
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._eintraege)
+
+def ladeKonfiguration(pfad: str = "config.yaml") -> dict:
+    with open(pfad, "r", encoding="utf-8") as config:
+        return yaml.safe_load(config) or {}
+
 def getUniqueFilename(directory: str, filename: str) -> str:
     base, ext = os.path.splitext(filename)  # Trennt Name und Endung (z.B. "bild", ".jpg")
     counter = 1
@@ -15,14 +77,41 @@ def getUniqueFilename(directory: str, filename: str) -> str:
     
     return newFilename
 
+# Erlaubte HTML-Tags und Attribute für ReportLab
+_erlaubteTags = ["b", "i", "u", "br", "font"]
+_erlaubteAttribute = {"font": ["color"]}
+_bodyAnfang = re.compile(r"<body\b[^>]*>", re.IGNORECASE)
+_bodyEnde = re.compile(r"</body\s*>", re.IGNORECASE)
+# Bereinigte Texte nach Inhalts-Hash. Vorgaben und Prüfablauf wiederholen sich von PDF zu PDF,
+# für den PDF-Export werden sie absatzweise bereinigt (siehe richText.bloecke).
+_cleanHtmlCache = LruCache(maxEintraege=4096, maxBytes=8 * 1024 * 1024)
+# bleach-Cleaner sind nicht threadsicher, daher einer je Thread
+_lokal = threading.local()
+
+def _bodyInhalt(htmlText: str) -> str:
+    """<body>-Element samt Inhalt, ohne <head> (z.B. das CSS von QTextEdit). Ohne <body> der ganze Text."""
+    anfang = _bodyAnfang.search(htmlText)
+    if anfang is None:
+        return htmlText
+    if 'name="qrichtext"' not in htmlText[:anfang.start()]:
+        # Kein QTextEdit.toHtml(): BeautifulSoup kommt auch mit verschachteltem oder kaputtem HTML zurecht
+        soup = BeautifulSoup(htmlText, "html.parser")
+        return str(soup.body) if soup.body else htmlText
+    # QTextEdit schreibt genau ein <body> ohne Verschachtelung, Suchen reicht
+    ende = _bodyEnde.search(htmlText, anfang.end())
+    return htmlText[anfang.start():ende.end() if ende else len(htmlText)]
+
 def cleanHtml(htmlText: str) -> str:
-    # Erlaubte HTML-Tags und Attribute für ReportLab
-    allowed_tags = ["b", "i", "u", "br", "font"]
-    allowed_attrs = {"font": ["color"]}
-    # 🔥 1. Mit BeautifulSoup den <body>-Inhalt extrahieren
-    soup = BeautifulSoup(htmlText, "html.parser")
-    body_content = str(soup.body) if soup.body else htmlText  # Falls kein <body>, dann originaler Text
+    """Rich-Text als ReportLab-Markup: nur <b>, <i>, <u>, <font color> bleiben, <br> wird zu Zeilenumbruch."""
+    schluessel = hashlib.sha256(htmlText.encode("utf-8", "surrogatepass")).digest()
+    clean_text = _cleanHtmlCache.get(schluessel)
+    if clean_text is not None:
+        return clean_text
     # Bereinigter HTML-Text für ReportLab
-    clean_text = bleach.clean(body_content, tags=allowed_tags, attributes=allowed_attrs, strip=True)
+    cleaner = getattr(_lokal, "cleaner", None)
+    if cleaner is None:
+        cleaner = _lokal.cleaner = bleach.sanitizer.Cleaner(tags=_erlaubteTags, attributes=_erlaubteAttribute, strip=True)
+    clean_text = cleaner.clean(_bodyInhalt(htmlText))
     clean_text = clean_text.replace("<br>", "\n").replace("<br/>", "\n")
-    return clean_text
\ No newline at end of file
+    _cleanHtmlCache.put(schluessel, clean_text, len(clean_text))
+    return clean_text
@@ -0,0 +1,187 @@
+import sys
+import os
+import time
+import argparse
+import logging
+import tempfile
+import statistics
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+logger = logging.getLogger(__name__)
+
+from src.logic import serializer, sqliteSpeicher
+from src.util import ladeKonfiguration
+
+
+def migriereSqlite(args: argparse.Namespace) -> int:
+    config = ladeKonfiguration(args.config)
+    sqliteSpeicher.datenbankPfad = args.datenbank or config.get("datenbankPfad", sqliteSpeicher.datenbankPfad)
+    anzahl = serializer.migriereXmlNachSqlite()
+    print(f"{anzahl} Prüfanweisungen nach {sqliteSpeicher.datenbankPfad} übernommen.")
+    print('Zum Verwenden der Datenbank in der config.yaml speicherBackend: "sqlite" setzen.')
+    return 0
+
+def konvertiereV2(args: argparse.Namespace) -> int:
+    config = ladeKonfiguration(args.config)
+    komprimieren = args.gzip or bool(config.get("pruefanweisungenKomprimieren", False))
+    anzahl = serializer.konvertiereNachV2(args.verzeichnis, komprimieren)
+    print(f"{anzahl} Prüfanweisungen in {args.verzeichnis or serializer.pruefanweisungenDir} nach v{serializer.xmlFormatVersion} konvertiert.")
+    return 0
+
+def _benchmarkSichtpruefung(pruefanweisungPfad: str | None, kategorien: int, eigenschaften: int):
+    from src.models import beispiel
+    if not pruefanweisungPfad:
+        return beispiel.beispielSichtpruefung(kategorien, eigenschaften)
+    sichtpruefung = serializer.ladePruefanweisungXml(pruefanweisungPfad)
+    sichtpruefung.finalesErgebnisEinfuegen(*beispiel.beispielErgebnis)
+    return sichtpruefung
+
+def pdfBenchmark(args: argparse.Namespace) -> int:
+    from src.pdfGenerator import PdfGenerator
+    sichtpruefung = _benchmarkSichtpruefung(args.pruefanweisung, args.kategorien, args.eigenschaften)
+    dauern = []
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        for nummer in range(args.anzahl):
+            start = time.perf_counter()
+            # Wie im SichtpruefungManager: je Bericht ein neuer Generator
+            PdfGenerator().erstelle_pdf(os.path.join(verzeichnis, f"bericht_{nummer}.pdf"), sichtpruefung)
+            dauern.append(time.perf_counter() - start)
+    print(f"{args.anzahl} PDFs in {sum(dauern):.2f} s")
+    print(f"Erstes PDF:     {dauern[0] * 1000:.1f} ms")
+    if len(dauern) > 1:
+        print(f"Weitere PDFs:   Mittel {statistics.mean(dauern[1:]) * 1000:.1f} ms, Median {statistics.median(dauern[1:]) * 1000:.1f} ms")
+    return 0
+
+def _archivEintraege(args: argparse.Namespace) -> list[dict]:
+    """Sichtprüfungen aus dem Ergebnis-Archiv gemäß --ids, --nummer, --lagerort oder --von/--bis."""
+    import datetime
+    from src.logic import ergebnisArchiv
+    config = ladeKonfiguration(args.config)
+    ergebnisArchiv.archivPfad = args.archiv or config.get("archivPfad", ergebnisArchiv.archivPfad)
+    if args.ids:
+        return [{"id": sichtpruefungId} for sichtpruefungId in args.ids]
+    if args.nummer:
+        return ergebnisArchiv.sucheNachNummer(args.nummer)
+    if args.lagerort:
+        return ergebnisArchiv.sucheNachLagerort(args.lagerort)
+    if args.von or args.bis:
+        von = datetime.date.fromisoformat(args.von) if args.von else datetime.date.min
+        bis = datetime.date.fromisoformat(args.bis) if args.bis else datetime.date.max
+        return ergebnisArchiv.sucheNachZeitraum(von, bis)
+    return ergebnisArchiv.sucheAlle()
+
+def _archivFilter(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--archiv", help="Ergebnis-Archiv (Standard: archivPfad aus der config.yaml)")
+    parser.add_argument("--ids", type=int, nargs="+", help="Nur diese Archiv-Ids")
+    parser.add_argument("--nummer", help="Nur Sichtprüfungen mit dieser Nummer")
+    parser.add_argument("--lagerort", help="Nur Sichtprüfungen an diesem Lagerort")
+    parser.add_argument("--von", help="Nur Sichtprüfungen ab diesem Datum (JJJJ-MM-TT)")
+    parser.add_argument("--bis", help="Nur Sichtprüfungen bis zu diesem Datum (JJJJ-MM-TT)")
+
+def pdfStapel(args: argparse.Namespace) -> int:
+    from src import pdfStapel
+    eintraege = _archivEintraege(args)
+    if not eintraege:
+        print("Keine passenden Sichtprüfungen im Archiv.")
+        return 0
+    ergebnis = pdfStapel.pdfsErstellen(eintraege, args.ziel, args.prozesse)
+    print(f"{len(ergebnis.erstellt)} PDFs ({ergebnis.seiten} Seiten, {ergebnis.bytes / 1024 / 1024:.1f} MB) "
+          f"in {ergebnis.dauer:.2f} s: {ergebnis.pdfsProSekunde():.1f} PDFs/s")
+    for sichtpruefungId, fehler in sorted(ergebnis.fehler.items()):
+        print(f"Fehler bei Sichtprüfung {sichtpruefungId}: {fehler}")
+    return 1 if ergebnis.fehler else 0
+
+def sammelbericht(args: argparse.Namespace) -> int:
+    from src.logic import ergebnisArchiv
+    from src.pdfGenerator import PdfGenerator
+    eintraege = _archivEintraege(args)
+    sichtpruefungen = [ergebnisArchiv.ladeSichtpruefung(eintrag["id"]) for eintrag in eintraege]
+    fehlend = [eintrag["id"] for eintrag, sichtpruefung in zip(eintraege, sichtpruefungen) if sichtpruefung is None]
+    if fehlend:
+        print(f"Nicht im Archiv: {', '.join(map(str, fehlend))}")
+        return 1
+    if not sichtpruefungen:
+        print("Keine passenden Sichtprüfungen im Archiv.")
+        return 0
+    start = time.perf_counter()
+    try:
+        PdfGenerator().erstelle_sammelbericht(args.pdf, sichtpruefungen)
+    except ValueError as e:
+        print(e)
+        return 1
+    print(f"Sammelbericht mit {len(sichtpruefungen)} Sichtprüfungen in {time.perf_counter() - start:.2f} s: {args.pdf}")
+    return 0
+
+def vorschauErzeugen(args: argparse.Namespace) -> int:
+    from src.logic import bildSpeicher, vorschauBilder
+    verzeichnisse = args.verzeichnisse or ["data", bildSpeicher.bilderDir]
+    bildPfade = vorschauBilder.bildDateien(verzeichnisse)
+    start = time.perf_counter()
+    anzahl = vorschauBilder.vorschauBilderErzeugen(bildPfade, args.groessen, args.prozesse)
+    print(f"{anzahl} Vorschaubilder für {len(bildPfade)} Bilder in {time.perf_counter() - start:.2f} s unter {vorschauBilder.vorschauDir}")
+    if args.aufraeumen:
+        # Verwendet werden die Vorschaubilder der Prüfanweisungen, egal wo sie liegen, und die des Bildspeichers
+        serializer.konfiguriereSpeicher(ladeKonfiguration(args.config))
+        verwendet = [eintrag["VorschauBildPfad"] for eintrag in serializer.ladePruefanweisungenXml() if eintrag.get("VorschauBildPfad")]
+        if not verwendet:
+            print("Keine Prüfanweisungen mit Vorschaubild gefunden, Vorschaubilder bleiben erhalten.")
+            return 1
+        verwendet += vorschauBilder.bildDateien([bildSpeicher.bilderDir])
+        print(f"{vorschauBilder.vorschauBilderAufraeumen(verwendet)} verwaiste Vorschaubilder gelöscht")
+    return 0
+
+def main(argv: list[str] | None = None) -> int:
+    # Erst hier statt beim Import, damit z.B. Tests das Logging nicht umkonfiguriert bekommen
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+        handlers=[
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+    parser = argparse.ArgumentParser(prog="python -m src.werkzeuge", description="Wartungswerkzeuge für den Sichtpruefer")
+    parser.add_argument("--config", default="config.yaml", help="Pfad zur config.yaml")
+    befehle = parser.add_subparsers(dest="befehl", required=True)
+
+    migration = befehle.add_parser("migriere-sqlite", help="Bestehende XML-Prüfanweisungen in die SQLite-Datenbank übernehmen")
+    migration.add_argument("--datenbank", help="Zieldatenbank (Standard: datenbankPfad aus der config.yaml)")
+    migration.set_defaults(ausfuehren=migriereSqlite)
+
+    konvertierung = befehle.add_parser("konvertiere-v2", help="Prüfanweisungs-XMLs an Ort und Stelle ins Format v2 umschreiben")
+    konvertierung.add_argument("--verzeichnis", help=f"Verzeichnis der Prüfanweisungen (Standard: {serializer.pruefanweisungenDir})")
+    konvertierung.add_argument("--gzip", action="store_true", help="Dateien gzip-komprimiert schreiben")
+    konvertierung.set_defaults(ausfuehren=konvertiereV2)
+
+    benchmark = befehle.add_parser("pdf-benchmark", help="Mittlere Erzeugungsdauer je PDF-Bericht messen")
+    benchmark.add_argument("--anzahl", type=int, default=50, help="Anzahl der erzeugten Berichte (Standard: 50)")
+    benchmark.add_argument("--pruefanweisung", help="Prüfanweisung als Vorlage (Standard: erzeugte Beispiel-Prüfanweisung)")
+    benchmark.add_argument("--kategorien", type=int, default=5, help="Kategorien der Beispiel-Prüfanweisung")
+    benchmark.add_argument("--eigenschaften", type=int, default=8, help="Eigenschaften je Kategorie der Beispiel-Prüfanweisung")
+    benchmark.set_defaults(ausfuehren=pdfBenchmark)
+
+    stapel = befehle.add_parser("pdf-stapel", help="PDFs archivierter Sichtprüfungen parallel neu erstellen")
+    stapel.add_argument("ziel", help="Verzeichnis für die PDFs")
+    _archivFilter(stapel)
+    stapel.add_argument("--prozesse", type=int, help="Anzahl paralleler Prozesse (Standard: alle Kerne)")
+    stapel.set_defaults(ausfuehren=pdfStapel)
+
+    sammel = befehle.add_parser("sammelbericht", help="Ein PDF für viele Sichtprüfungen derselben Prüfanweisung")
+    sammel.add_argument("pdf", help="Zieldatei des Sammelberichts")
+    _archivFilter(sammel)
+    sammel.set_defaults(ausfuehren=sammelbericht)
+
+    vorschau = befehle.add_parser("vorschau-erzeugen", help="Vorschaubilder für das Auswahl-Raster vorab erzeugen")
+    vorschau.add_argument("verzeichnisse", nargs="*", help="Verzeichnisse mit Bildern (Standard: data und der Bildspeicher)")
+    vorschau.add_argument("--groessen", type=int, nargs="+", default=[371], help="Kantenlängen in Pixeln (Standard: 371, HiDPI z.B. 742)")
+    vorschau.add_argument("--prozesse", type=int, help="Anzahl paralleler Prozesse (Standard: alle Kerne)")
+    vorschau.add_argument("--aufraeumen", action="store_true",
+                          help="Vorschaubilder löschen, deren Original weder Vorschaubild einer Prüfanweisung ist noch im Bildspeicher liegt")
+    vorschau.set_defaults(ausfuehren=vorschauErzeugen)
+
+    args = parser.parse_args(argv)
+    return args.ausfuehren(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
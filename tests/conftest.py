@@ -0,0 +1,14 @@
+"""
+Gemeinsame Fixtures der Tests.
+"""
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Fixture: Eine QApplication für alle Tests mit Qt-Widgets, Pixmaps oder Signalen aus Threads"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,139 @@
+"""
+Tests für das Auswahl-Raster (Modell und Listenansicht der Prüfanweisungen).
+"""
+import time
+
+import pytest
+from PIL import Image as PilImage
+from PySide6.QtCore import Qt
+
+from src.gui.auswahlRaster import AuswahlModell, AuswahlRaster, XmlPfadRolle, kachelGroesse, namenUmbrechen
+from src.gui.bildLader import BildLader
+from src.logic import vorschauBilder
+
+
+@pytest.fixture
+def vorschau_dir(tmp_path, monkeypatch):
+    """Fixture: Vorschaubilder in einem temporären Verzeichnis"""
+    monkeypatch.setattr(vorschauBilder, "vorschauDir", str(tmp_path / "vorschau"))
+
+
+@pytest.fixture
+def modell(app, vorschau_dir):
+    """Fixture: Modell mit eigenem BildLader (ein Thread), dessen Aufträge am Ende abgeschlossen sind"""
+    modell = AuswahlModell(BildLader(maxThreads=1))
+    yield modell
+    modell.bilderAbbrechen()
+    modell.bildLader.warten()
+
+
+def eintraege(tmp_path, anzahl, bilder=True):
+    ergebnis = []
+    for index in range(anzahl):
+        bildPfad = tmp_path / f"foto{index}.jpg"
+        if bilder:
+            PilImage.new("RGB", (800, 600), "red").save(bildPfad)
+        ergebnis.append({"Name": f"Atemschutzgeräteträger Prüfung Nummer {index}", "VorschauBildPfad": str(bildPfad),
+                         "PruefanweisungXmlPfad": f"pruefanweisung{index}.xml"})
+    return ergebnis
+
+
+def warte_auf_bilder(app, modell):
+    modell.bildLader.warten()
+    ende = time.monotonic() + 5
+    while modell.bildLader.wartend() and time.monotonic() < ende:
+        app.processEvents()
+
+
+class TestAuswahlModell:
+    """Test-Klasse für das AuswahlModell"""
+
+    def test_zeilen_und_rollen(self, tmp_path, modell):
+        """Test: Jede Prüfanweisung ist eine Zeile mit umbrochenem Namen und XML-Pfad"""
+        modell.eintraegeSetzen(eintraege(tmp_path, 5, bilder=False))
+
+        assert modell.rowCount() == 5
+        index = modell.index(3)
+        assert index.data(Qt.ItemDataRole.DisplayRole) == "Atemschutzgeräteträger Prüfung\nNummer 3"
+        assert index.data(XmlPfadRolle) == "pruefanweisung3.xml"
+
+    def test_bilder_nur_fuer_angefragte_zeilen(self, app, tmp_path, modell):
+        """Test: Geladen werden nur die Bilder der Zeilen, die die Ansicht zeichnet"""
+        modell.eintraegeSetzen(eintraege(tmp_path, 50))
+        geaendert = []
+        modell.dataChanged.connect(lambda oben, unten, rollen: geaendert.append(oben.row()))
+
+        assert modell.index(2).data(Qt.ItemDataRole.DecorationRole) is None  # Platzhalter, Bild wird geladen
+        warte_auf_bilder(app, modell)
+
+        assert geaendert == [2]
+        pixmap = modell.index(2).data(Qt.ItemDataRole.DecorationRole)
+        assert max(pixmap.width(), pixmap.height()) == kachelGroesse
+        assert modell.index(3).data(Qt.ItemDataRole.DecorationRole) is None
+
+    def test_fehlendes_bild_ergibt_leere_pixmap(self, app, tmp_path, modell):
+        """Test: Ein fehlendes Bild wird nicht immer wieder angefordert, sondern bleibt leer"""
+        modell.eintraegeSetzen(eintraege(tmp_path, 1, bilder=False))
+
+        modell.index(0).data(Qt.ItemDataRole.DecorationRole)
+        warte_auf_bilder(app, modell)
+
+        assert modell.index(0).data(Qt.ItemDataRole.DecorationRole).isNull()
+        assert modell.bildLader.wartend() == 0
+
+    def test_neue_eintraege_verwerfen_alte_bilder(self, app, tmp_path, modell):
+        """Test: Nach dem Neubefüllen landen keine Bilder der alten Einträge in den neuen Zeilen"""
+        modell.eintraegeSetzen(eintraege(tmp_path, 10))
+        for zeile in range(10):
+            modell.index(zeile).data(Qt.ItemDataRole.DecorationRole)
+
+        modell.eintraegeSetzen(eintraege(tmp_path, 10, bilder=False))
+        warte_auf_bilder(app, modell)
+
+        assert all(modell.index(zeile).data(Qt.ItemDataRole.DecorationRole) is None for zeile in range(10))
+
+
+class TestAuswahlRaster:
+    """Test-Klasse für die Listenansicht des Auswahl-Rasters"""
+
+    def test_viele_eintraege_nur_sichtbare_bilder(self, app, tmp_path, modell):
+        """Test: Bei 2000 Einträgen werden nur die Bilder der sichtbaren Kacheln geladen"""
+        bild = eintraege(tmp_path, 1)[0]["VorschauBildPfad"]
+        modell.eintraegeSetzen([{"Name": f"Prüfanweisung {index}", "VorschauBildPfad": bild,
+                                 "PruefanweisungXmlPfad": f"{index}.xml"} for index in range(2000)])
+        raster = AuswahlRaster()
+        raster.setModel(modell)
+        raster.resize(1400, 900)
+
+        raster.grab()  # Zeichnet die sichtbaren Kacheln
+        warte_auf_bilder(app, modell)
+
+        geladen = [zeile for zeile in range(2000) if modell._bilder.get(zeile) is not None]
+        assert 0 < len(geladen) <= 9
+        assert raster.indexAt(raster.visualRect(modell.index(0)).center()).row() == 0
+
+
+    def test_beim_scrollen_werden_sichtbare_bilder_vorgezogen(self, app, tmp_path, modell, monkeypatch):
+        """Test: Nach dem Scrollen werden genau die Bilder der sichtbaren Kacheln vorgezogen"""
+        modell.eintraegeSetzen(eintraege(tmp_path, 200, bilder=False))
+        raster = AuswahlRaster()
+        raster.setModel(modell)
+        raster.resize(1400, 900)
+        raster.grab()
+        vorgezogen = []
+        monkeypatch.setattr(modell.bildLader, "priorisieren", lambda zeilen, prioritaet: vorgezogen.append(list(zeilen)))
+
+        raster.verticalScrollBar().setValue(raster.verticalScrollBar().maximum() // 2)
+
+        sichtbar = [zeile for zeile in range(200)
+                    if raster.visualRect(modell.index(zeile)).intersects(raster.viewport().rect())]
+        assert vorgezogen == [sichtbar]
+        assert 0 < len(sichtbar) <= 9 and sichtbar[0] > 0
+
+class TestNamenUmbrechen:
+    """Test-Klasse für den Zeilenumbruch der Namen"""
+
+    def test_umbruch_an_wortgrenzen(self):
+        """Test: Zeilen werden nach etwa 30 Zeichen an Wortgrenzen umbrochen"""
+        assert namenUmbrechen("Helm") == "Helm"
+        assert namenUmbrechen("Feuerwehrhelm nach DIN EN 443 mit Nackenschutz") == "Feuerwehrhelm nach DIN EN 443\nmit Nackenschutz"
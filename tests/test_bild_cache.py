@@ -0,0 +1,101 @@
+"""
+Tests für den Cache der skalierten Bilder auf den Eigenschaft-Seiten (BildCache).
+"""
+import os
+import time
+from unittest.mock import patch
+
+from PIL import Image as PilImage
+
+from src.gui import bildCache
+from src.gui.bildCache import BildCache
+
+
+def foto(pfad, groesse=(2000, 1500), farbe="red"):
+    PilImage.new("RGB", groesse, farbe).save(pfad)
+    return str(pfad)
+
+
+def warte_auf_vorladen(app, cache):
+    cache.warten()
+    ende = time.monotonic() + 5
+    while cache._auftraege and time.monotonic() < ende:
+        app.processEvents()
+
+
+class TestBildCache:
+    """Test-Klasse für den BildCache"""
+
+    def test_pixmap_wird_auf_breite_skaliert_und_gecacht(self, app, tmp_path):
+        """Test: Das Bild hat 540 Pixel Breite bei gleichem Seitenverhältnis und wird nur einmal dekodiert"""
+        cache = BildCache()
+        pfad = foto(tmp_path / "foto.jpg")
+
+        with patch.object(bildCache, "skaliertesBild", wraps=bildCache.skaliertesBild) as skalieren:
+            erste = cache.pixmap(pfad)
+            zweite = cache.pixmap(pfad)
+
+        assert (erste.width(), erste.height()) == (540, 405)
+        assert zweite.cacheKey() == erste.cacheKey()
+        assert skalieren.call_count == 1
+
+    def test_vorgeladene_bilder_ohne_dekodieren(self, app, tmp_path):
+        """Test: Nach dem Vorladen liefert pixmap() die Bilder, ohne sie im GUI-Thread zu dekodieren"""
+        cache = BildCache(maxThreads=1)
+        pfade = [foto(tmp_path / f"foto{index}.jpg") for index in range(3)]
+
+        cache.vorladen(pfade)
+        warte_auf_vorladen(app, cache)
+
+        with patch.object(bildCache, "skaliertesBild") as skalieren:
+            pixmaps = [cache.pixmap(pfad) for pfad in pfade]
+        skalieren.assert_not_called()
+        assert all(pixmap.width() == 540 for pixmap in pixmaps)
+
+    def test_pixmap_holt_laufendes_vorladen_ab(self, app, tmp_path):
+        """Test: Ein noch ausstehender Vorlade-Auftrag wird übernommen statt doppelt dekodiert"""
+        cache = BildCache(maxThreads=1)
+        pfade = [foto(tmp_path / f"foto{index}.jpg") for index in range(4)]
+
+        cache.vorladen(pfade)
+        pixmap = cache.pixmap(pfade[-1])
+        warte_auf_vorladen(app, cache)
+
+        assert pixmap.width() == 540
+        assert not cache._auftraege and not cache._abgeholt
+        assert cache.pixmap(pfade[-1]).cacheKey() == pixmap.cacheKey()
+
+    def test_fehlende_datei_ergibt_leere_pixmap(self, app, tmp_path):
+        """Test: Fehlende oder unlesbare Bilder ergeben eine leere Pixmap statt eines Fehlers"""
+        cache = BildCache()
+        kaputt = tmp_path / "kaputt.jpg"
+        kaputt.write_bytes(b"kein Bild")
+
+        assert cache.pixmap(str(tmp_path / "fehlt.jpg")).isNull()
+        assert cache.pixmap(str(kaputt)).isNull()
+        assert cache.pixmap(None).isNull()
+
+    def test_geaenderte_datei_wird_neu_geladen(self, app, tmp_path):
+        """Test: Wird die Datei ersetzt, liefert der Cache das neue Bild"""
+        cache = BildCache()
+        pfad = foto(tmp_path / "foto.png", (1080, 1080), "red")
+        assert cache.pixmap(pfad).height() == 540
+
+        foto(tmp_path / "foto.png", (1080, 540), "blue")
+        os.utime(pfad, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+        assert cache.pixmap(pfad).height() == 270
+
+    def test_byte_grenze(self, app, tmp_path):
+        """Test: Über der Byte-Grenze werden die am längsten nicht genutzten Bilder verdrängt"""
+        cache = BildCache(maxBytes=2 * 540 * 405 * 4)
+        pfade = [foto(tmp_path / f"foto{index}.jpg") for index in range(3)]
+
+        for pfad in pfade:
+            cache.pixmap(pfad)
+
+        assert cache._pixmaps.bytes <= 2 * 540 * 405 * 4
+        with patch.object(bildCache, "skaliertesBild", wraps=bildCache.skaliertesBild) as skalieren:
+            cache.pixmap(pfade[2])
+            cache.pixmap(pfade[0])
+        assert skalieren.call_count == 1
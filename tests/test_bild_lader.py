@@ -0,0 +1,88 @@
+"""
+Tests für das Laden der Kachelbilder im Hintergrund (BildLader).
+"""
+import time
+
+import pytest
+from PIL import Image as PilImage
+
+from src.gui.bildLader import BildLader
+from src.logic import vorschauBilder
+
+
+@pytest.fixture
+def vorschau_dir(tmp_path, monkeypatch):
+    """Fixture: Vorschaubilder in einem temporären Verzeichnis"""
+    monkeypatch.setattr(vorschauBilder, "vorschauDir", str(tmp_path / "vorschau"))
+
+
+def foto(pfad, groesse=(800, 600)):
+    PilImage.new("RGB", groesse, "red").save(pfad)
+    return str(pfad)
+
+
+def lader_mit_ergebnissen(maxThreads=1):
+    lader = BildLader(maxThreads=maxThreads)
+    ergebnisse = {}
+    lader.geladen.connect(lambda schluessel, bild: ergebnisse.__setitem__(schluessel, bild))
+    return lader, ergebnisse
+
+
+def warte_auf_lader(app, lader):
+    lader.warten()
+    ende = time.monotonic() + 5
+    while time.monotonic() < ende:
+        app.processEvents()
+        if not lader.wartend():
+            break
+
+
+class TestBildLader:
+    """Test-Klasse für den BildLader"""
+
+    def test_bilder_werden_verkleinert_geladen(self, app, tmp_path, vorschau_dir):
+        """Test: Jedes Bild wird einmal mit seinem Schlüssel und höchstens in Zielgröße gemeldet"""
+        lader, ergebnisse = lader_mit_ergebnissen()
+        for index in range(3):
+            lader.laden(index, foto(tmp_path / f"foto{index}.jpg"), 100)
+
+        warte_auf_lader(app, lader)
+
+        assert sorted(ergebnisse) == [0, 1, 2]
+        assert all(max(bild.width(), bild.height()) == 100 for bild in ergebnisse.values())
+        assert lader.wartend() == 0
+
+    def test_fehlendes_bild_liefert_leeres_bild(self, app, tmp_path, vorschau_dir):
+        """Test: Eine fehlende Datei wird als leeres Bild gemeldet, statt den Lader aufzuhalten"""
+        lader, ergebnisse = lader_mit_ergebnissen()
+        lader.laden(7, str(tmp_path / "fehlt.jpg"), 100)
+
+        warte_auf_lader(app, lader)
+
+        assert ergebnisse[7].isNull()
+
+    def test_nach_abbrechen_keine_alten_ergebnisse(self, app, tmp_path, vorschau_dir):
+        """Test: Nach abbrechen() werden weder wartende noch laufende Aufträge gemeldet"""
+        lader, ergebnisse = lader_mit_ergebnissen()
+        for index in range(20):
+            lader.laden(index, foto(tmp_path / f"foto{index}.jpg"), 100)
+
+        lader.abbrechen()
+        lader.laden(99, foto(tmp_path / "neu.jpg"), 100)
+        warte_auf_lader(app, lader)
+
+        assert list(ergebnisse) == [99]
+
+    def test_priorisierte_bilder_zuerst(self, app, tmp_path, vorschau_dir):
+        """Test: Vorgezogene Aufträge werden vor den übrigen wartenden gemeldet"""
+        lader, ergebnisse = lader_mit_ergebnissen()
+        fotos = [foto(tmp_path / f"foto{index}.jpg") for index in range(10)]
+        for index, pfad in enumerate(fotos):
+            lader.laden(index, pfad, 100)
+
+        lader.priorisieren([8, 9])
+        warte_auf_lader(app, lader)
+
+        reihenfolge = list(ergebnisse)
+        assert sorted(reihenfolge) == list(range(10))
+        assert set(reihenfolge[:3]) >= {8, 9}  # Auftrag 0 kann schon gelaufen sein
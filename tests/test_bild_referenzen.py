@@ -0,0 +1,186 @@
+"""
+Tests für den Referenzindex der Bilder und das Aufräumen beim Löschen.
+"""
+import os
+import threading
+
+import pytest
+from PIL import Image as PilImage
+
+import src.logic.serializer as serializer
+from src.logic import bildReferenzen, bildSpeicher, ergebnisArchiv, vorschauBilder
+from src.models.pruefanweisung import Pruefanweisung
+from src.models.sichtpruefung import Sichtpruefung
+
+
+@pytest.fixture
+def ablage(tmp_path, monkeypatch):
+    """Fixture: Prüfanweisungen, Übersicht und Bilder in einem temporären Verzeichnis"""
+    monkeypatch.setattr(serializer, "pruefanweisungenDir", str(tmp_path / "pruefanweisungen"))
+    monkeypatch.setattr(serializer, "pruefanweisungenXmlPfad", str(tmp_path / "pruefanweisungen.xml"))
+    monkeypatch.setattr(serializer, "speicherBackend", "xml")
+    serializer.uebersichtCacheLeeren()
+    yield tmp_path
+    serializer.bildReferenzIndex().warten(5)
+    serializer.uebersichtCacheLeeren()
+
+
+def erstelle_bild(verzeichnis, name):
+    pfad = verzeichnis / name
+    pfad.write_bytes(b"bild")
+    return pfad
+
+
+def speichere(name, vorschau, bilder):
+    pruefanweisung = Pruefanweisung()
+    pruefanweisung.auswahlHinzufuegen(str(vorschau), name)
+    pruefanweisung.eigenschaftHinzufuegen("Kategorie", "Beschreibung", [(str(bild), "") for bild in bilder])
+    pfad = serializer.speicherePruefanweisungXml(pruefanweisung)
+    serializer.addToPruefanweisungenXml(pruefanweisung, pfad)
+    return pfad
+
+
+class TestBildReferenzen:
+    """Test-Klasse für den Bild-Referenzindex"""
+
+    def test_gemeinsames_bild_bleibt_erhalten(self, ablage, monkeypatch):
+        """Test: Ein Bild, das eine andere Prüfanweisung noch nutzt, wird nicht gelöscht"""
+        monkeypatch.setattr(serializer, "bilderImHintergrundAufraeumen", False)
+        gemeinsam = erstelle_bild(ablage, "gemeinsam.jpg")
+        eigenes = erstelle_bild(ablage, "eigenes.jpg")
+        helm = speichere("Helm", gemeinsam, [eigenes])
+        speichere("Jacke", gemeinsam, [])
+
+        geloescht = serializer.loeschePruefanweisung(helm)
+
+        assert geloescht == [str(eigenes)]
+        assert gemeinsam.exists()
+        assert not eigenes.exists()
+        assert serializer.bildReferenzIndex().istReferenziert(str(gemeinsam))
+
+    def test_index_wird_nach_aufbau_beim_speichern_gepflegt(self, ablage, monkeypatch):
+        """Test: Nach dem ersten Löschen tragen neue Prüfanweisungen ihre Bilder selbst ein"""
+        monkeypatch.setattr(serializer, "bilderImHintergrundAufraeumen", False)
+        bild = erstelle_bild(ablage, "bild.jpg")
+        serializer.loeschePruefanweisung(speichere("Helm", erstelle_bild(ablage, "helm.jpg"), []))
+
+        jacke = speichere("Jacke", bild, [])
+        hose = speichere("Hose", bild, [])
+        serializer.loeschePruefanweisung(jacke)
+        assert bild.exists()
+        serializer.loeschePruefanweisung(hose)
+        assert not bild.exists()
+
+    def test_aufraeumen_im_hintergrund(self, ablage):
+        """Test: Der Hintergrund-Aufräumer löscht vorgemerkte Bilder stapelweise"""
+        bilder = [erstelle_bild(ablage, f"bild{i}.jpg") for i in range(5)]
+        helm = speichere("Helm", bilder[0], bilder[1:])
+
+        serializer.loeschePruefanweisung(helm)
+        serializer.bildReferenzIndex().warten(5)
+
+        assert not any(bild.exists() for bild in bilder)
+        assert serializer.bildReferenzIndex().kandidaten() == []
+
+    def test_wieder_verwendetes_bild_wird_nicht_geloescht(self, tmp_path):
+        """Test: Wird ein vorgemerktes Bild vor dem Aufräumen erneut referenziert, bleibt es erhalten"""
+        bild = erstelle_bild(tmp_path, "bild.jpg")
+        index = bildReferenzen.BildReferenzIndex(str(tmp_path / "index.json"))
+        index.aufbauen({"a.xml": [str(bild)]})
+
+        assert index.referenzenEntfernen("a.xml") == [str(bild)]
+        index.referenzenSetzen("b.xml", [str(bild)])
+
+        assert index.aufraeumen() == []
+        assert bild.exists()
+
+    def test_vorschaubilder_werden_mit_geloescht(self, tmp_path, monkeypatch):
+        """Test: Mit einem aufgeräumten Bild verschwinden auch seine Vorschaubilder"""
+        monkeypatch.setattr(vorschauBilder, "vorschauDir", str(tmp_path / "vorschau"))
+        bild, anderes = tmp_path / "bild.jpg", tmp_path / "anderes.jpg"
+        PilImage.new("RGB", (800, 600), "red").save(bild)
+        PilImage.new("RGB", (800, 600), "blue").save(anderes)
+        vorschauen = [vorschauBilder.vorschauBild(str(pfad), groesse) for pfad in (bild, anderes) for groesse in (371, 742)]
+        index = bildReferenzen.BildReferenzIndex(str(tmp_path / "index.json"))
+        index.aufbauen({"a.xml": [str(bild)], "b.xml": [str(anderes)]})
+
+        index.referenzenEntfernen("a.xml")
+        assert index.aufraeumen() == [str(bild)]
+
+        assert [os.path.exists(pfad) for pfad in vorschauen] == [False, False, True, True]
+
+    def test_kandidaten_ueberstehen_neustart(self, tmp_path):
+        """Test: Vorgemerkte Bilder werden nach einem Neustart weiter aufgeräumt"""
+        bild = erstelle_bild(tmp_path, "bild.jpg")
+        index = bildReferenzen.BildReferenzIndex(str(tmp_path / "index.json"))
+        index.aufbauen({"a.xml": [str(bild)]})
+        index.referenzenEntfernen("a.xml")
+
+        neu = bildReferenzen.BildReferenzIndex(str(tmp_path / "index.json"))
+
+        assert neu.kandidaten() == [str(bild)]
+        assert neu.aufraeumen() == [str(bild)]
+        assert not bild.exists()
+
+    def test_erneut_abgelegtes_bild_wird_nicht_geloescht(self, tmp_path, monkeypatch):
+        """Test: Legt der Bildspeicher ein vorgemerktes Bild erneut ab, löscht der Aufräumer es nicht"""
+        monkeypatch.setattr(bildSpeicher, "bilderDir", str(tmp_path / "images"))
+        bild = bildSpeicher.speichereBildDaten(b"bild", ".jpg")
+        index = bildReferenzen.index(str(tmp_path / "index.json"))
+        index.aufbauen({"a.xml": [bild]})
+        index.referenzenEntfernen("a.xml")
+
+        assert bildSpeicher.speichereBildDaten(b"bild", ".jpg") == bild
+        assert index.kandidaten() == []
+
+        # Auch ein schon vorher ermittelter Stapel lässt das Bild liegen, bis es gespeichert ist
+        index._kandidaten.append(os.path.normpath(bild))
+        assert index.aufraeumen() == []
+        assert os.path.exists(bild)
+
+        index.referenzenSetzen("b.xml", [bild])
+        index.referenzenEntfernen("b.xml")
+        assert index.aufraeumen() == [os.path.normpath(bild)]
+
+    def test_bild_im_archiv_bleibt_erhalten(self, ablage, monkeypatch):
+        """Test: Bilder, auf die eine archivierte Sichtprüfung verweist, werden nicht gelöscht"""
+        monkeypatch.setattr(serializer, "bilderImHintergrundAufraeumen", False)
+        monkeypatch.setattr(ergebnisArchiv, "archivPfad", str(ablage / "archiv.sqlite3"))
+        archiviert = erstelle_bild(ablage, "archiviert.jpg")
+        eigenes = erstelle_bild(ablage, "eigenes.jpg")
+        helm = speichere("Helm", archiviert, [eigenes])
+        sichtpruefung = Sichtpruefung()
+        sichtpruefung.labelsBefuellen(serializer.ladePruefanweisungXml(helm).pruefanweisung)
+        ergebnisArchiv.archiviereSichtpruefung(sichtpruefung)
+
+        try:
+            assert serializer.loeschePruefanweisung(helm) == [str(eigenes)]
+        finally:
+            ergebnisArchiv.schliesseVerbindungen()
+        assert archiviert.exists()
+        assert not eigenes.exists()
+
+    def test_aufbau_im_hintergrund_holt_aenderungen_nach(self, tmp_path):
+        """Test: Während des Aufbaus im Hintergrund gesetzte und entfernte Verweise werden danach nachgeholt"""
+        alt = erstelle_bild(tmp_path, "alt.jpg")
+        gemeinsam = erstelle_bild(tmp_path, "gemeinsam.jpg")
+        freigabe = threading.Event()
+
+        def ermitteln():
+            freigabe.wait(5)
+            return {"a.xml": [str(alt), str(gemeinsam)]}
+
+        index = bildReferenzen.BildReferenzIndex(str(tmp_path / "index.json"))
+        index.imHintergrundAufbauen(ermitteln)
+        assert index.imAufbau()
+        index.referenzenSetzen("b.xml", [str(gemeinsam)])
+        assert index.referenzenEntfernen("a.xml") == []
+
+        freigabe.set()
+        index.warten(5)
+
+        assert not index.imAufbau()
+        assert index.bilderVon("a.xml") is None
+        assert index.bilderVon("b.xml") == [str(gemeinsam)]
+        assert not alt.exists()
+        assert gemeinsam.exists()
@@ -0,0 +1,54 @@
+"""
+Tests für den inhaltsadressierten Bildspeicher.
+"""
+import os
+
+import pytest
+
+from src.logic import bildSpeicher
+
+
+@pytest.fixture
+def bilder_dir(tmp_path, monkeypatch):
+    """Fixture: Leitet den Bildspeicher in ein temporäres Verzeichnis um"""
+    pfad = tmp_path / "images"
+    monkeypatch.setattr(bildSpeicher, "bilderDir", str(pfad))
+    return pfad
+
+
+def erstelle_bild(verzeichnis, name, inhalt=b"\x89PNG bilddaten"):
+    verzeichnis.mkdir(parents=True, exist_ok=True)
+    pfad = verzeichnis / name
+    pfad.write_bytes(inhalt)
+    return str(pfad)
+
+
+class TestBildSpeicher:
+    """Test-Klasse für den Bildspeicher"""
+
+    def test_ablage_nach_hash(self, bilder_dir, tmp_path):
+        """Test: Bilder werden unter ihrem SHA-256 in einem Unterverzeichnis abgelegt"""
+        pfad = bildSpeicher.speichereBild(erstelle_bild(tmp_path / "quelle", "Helm.JPEG"))
+
+        name = os.path.basename(pfad)
+        assert os.path.dirname(pfad) == os.path.join(str(bilder_dir), name[:2])
+        assert name.endswith(".jpg") and len(name) == 64 + 4
+        assert open(pfad, "rb").read() == b"\x89PNG bilddaten"
+
+    def test_gleicher_inhalt_wird_einmal_gespeichert(self, bilder_dir, tmp_path):
+        """Test: Dasselbe Bild unter verschiedenen Namen ergibt denselben Pfad"""
+        erster = bildSpeicher.speichereBild(erstelle_bild(tmp_path / "a", "foto.png"))
+        zweiter = bildSpeicher.speichereBild(erstelle_bild(tmp_path / "b", "kopie.png"))
+        anderer = bildSpeicher.speichereBild(erstelle_bild(tmp_path / "c", "foto.png", b"anderes bild"))
+
+        assert erster == zweiter
+        assert anderer != erster
+        assert len(list(bilder_dir.rglob("*.png"))) == 2
+
+    def test_originalname_fuer_anzeige(self, bilder_dir, tmp_path):
+        """Test: Der ursprüngliche Dateiname bleibt über den Nebenindex abrufbar"""
+        pfad = bildSpeicher.speichereBild(erstelle_bild(tmp_path / "quelle", "Reflexstreifen.png"))
+        bildSpeicher.speichereBild(erstelle_bild(tmp_path / "quelle2", "Duplikat.png"))
+
+        assert bildSpeicher.originalName(pfad) == "Reflexstreifen.png"
+        assert bildSpeicher.originalName("assets/images/ab/unbekannt.png") is None
@@ -0,0 +1,112 @@
+"""
+Tests für das Archiv abgeschlossener Sichtprüfungen.
+"""
+import datetime
+import sqlite3
+
+import pytest
+
+from src.logic import ergebnisArchiv
+from src.models.pruefanweisung import Pruefanweisung
+from src.models.sichtpruefung import Sichtpruefung
+
+
+@pytest.fixture
+def archiv(tmp_path, monkeypatch):
+    """Fixture: Ergebnis-Archiv in einer temporären Datenbank"""
+    monkeypatch.setattr(ergebnisArchiv, "archivPfad", str(tmp_path / "archiv.sqlite3"))
+    yield tmp_path
+    ergebnisArchiv.schliesseVerbindungen()
+
+
+def erstelle_sichtpruefung(nummer="HLM-01", lagerort="HLF 20", datum="15.01.2024"):
+    pruefanweisung = Pruefanweisung()
+    pruefanweisung.auswahlHinzufuegen("assets/images/helm.jpg", "Helm")
+    pruefanweisung.vorgabenHinzufuegen("<p>Vorgaben</p>")
+    pruefanweisung.eigenschaftHinzufuegen("Schale", "Keine Risse", [("assets/images/riss.jpg", "Riss")])
+    pruefanweisung.eigenschaftHinzufuegen("Visier", "Klar", [])
+    sichtpruefung = Sichtpruefung()
+    sichtpruefung.pruefanweisungPfad = "data/pruefanweisungen/Helm.xml"
+    sichtpruefung.labelsBefuellen(pruefanweisung)
+    for eigenschaft in pruefanweisung.eigenschaften:
+        sichtpruefung.eigenschaftspruefungHinzufuegen(eigenschaft.kategorie, eigenschaft.beschreibung, eigenschaft.bilder)
+    sichtpruefung.pruefErgebnisEinfuegen(1, False, "Visier tauschen")
+    sichtpruefung.finalesErgebnisEinfuegen(lagerort, nummer, False, "Max Mustermann", datum, "Bemerkung")
+    return sichtpruefung
+
+
+class TestErgebnisArchiv:
+    """Test-Klasse für das Ergebnis-Archiv"""
+
+    def test_archivieren_und_wiederherstellen(self, archiv):
+        """Test: Eine archivierte Sichtprüfung wird vollständig wiederhergestellt"""
+        sichtpruefungId = ergebnisArchiv.archiviereSichtpruefung(erstelle_sichtpruefung(), "Helm.pdf")
+
+        sichtpruefung = ergebnisArchiv.ladeSichtpruefung(sichtpruefungId)
+
+        assert sichtpruefung.pruefanweisungPfad == "data/pruefanweisungen/Helm.xml"
+        assert sichtpruefung.pruefanweisung.namePruefobjekt == "Helm"
+        assert sichtpruefung.pruefanweisung.vorgabenText == "<p>Vorgaben</p>"
+        assert sichtpruefung.nummer == "HLM-01"
+        assert sichtpruefung.einsatzbereit is False
+        assert sichtpruefung.eigenschaftspruefungen[0].eigenschaft.bilder == [("assets/images/riss.jpg", "Riss")]
+        assert sichtpruefung.eigenschaftspruefungen[1].massnahmen == "Visier tauschen"
+        assert [p["massnahmen"] for p in ergebnisArchiv.ladeEigenschaftspruefungen(sichtpruefungId)] == ["", "Visier tauschen"]
+
+    def test_texte_der_pruefanweisung_nur_einmal(self, archiv):
+        """Test: Vorgaben und Prüfablauf derselben Prüfanweisung werden nur einmal gespeichert"""
+        erste = erstelle_sichtpruefung("HLM-01")
+        zweite = erstelle_sichtpruefung("HLM-02")
+        geaendert = erstelle_sichtpruefung("HLM-03")
+        geaendert.pruefanweisung.vorgabenText = "<p>Neue Vorgaben</p>"
+        ids = [ergebnisArchiv.archiviereSichtpruefung(sichtpruefung) for sichtpruefung in (erste, zweite, geaendert)]
+
+        verbindung = ergebnisArchiv._verbindung()
+        assert verbindung.execute("SELECT COUNT(*) FROM pruefanweisungText").fetchone()[0] == 2
+        assert all("Vorgaben" not in zeile[0] for zeile in verbindung.execute("SELECT daten FROM sichtpruefung"))
+        assert [ergebnisArchiv.ladeSichtpruefung(i).pruefanweisung.vorgabenText for i in ids] == [
+            "<p>Vorgaben</p>", "<p>Vorgaben</p>", "<p>Neue Vorgaben</p>"]
+
+    def test_suche_nach_nummer_lagerort_und_zeitraum(self, archiv):
+        """Test: Die Suchen liefern die passenden Sichtprüfungen nach Datum sortiert"""
+        ergebnisArchiv.archiviereSichtpruefung(erstelle_sichtpruefung("HLM-01", "HLF 20", "15.03.2024"))
+        ergebnisArchiv.archiviereSichtpruefung(erstelle_sichtpruefung("HLM-01", "LF 10", "15.01.2024"))
+        ergebnisArchiv.archiviereSichtpruefung(erstelle_sichtpruefung("HLM-02", "HLF 20", "2024-02-01"))
+
+        assert [e["datumIso"] for e in ergebnisArchiv.sucheNachNummer("HLM-01")] == ["2024-01-15", "2024-03-15"]
+        assert [e["nummer"] for e in ergebnisArchiv.sucheNachLagerort("HLF 20")] == ["HLM-02", "HLM-01"]
+        zeitraum = ergebnisArchiv.sucheNachZeitraum(datetime.date(2024, 1, 1), datetime.date(2024, 2, 1))
+        assert [e["lagerort"] for e in zeitraum] == ["LF 10", "HLF 20"]
+
+    def test_suchen_nutzen_indizes(self, archiv):
+        """Test: Die Suchabfragen werden über die Sekundärindizes beantwortet"""
+        ergebnisArchiv.archiviereSichtpruefung(erstelle_sichtpruefung())
+        verbindung = ergebnisArchiv._verbindung()
+
+        for bedingung, parameter, index in [("nummer = ?", ("HLM-01",), "sichtpruefungNachNummer"),
+                                            ("lagerort = ?", ("HLF 20",), "sichtpruefungNachLagerort"),
+                                            ("datumIso BETWEEN ? AND ?", ("2024-01-01", "2024-12-31"), "sichtpruefungNachDatum")]:
+            plan = " ".join(zeile[3] for zeile in verbindung.execute(
+                f"EXPLAIN QUERY PLAN SELECT id FROM sichtpruefung WHERE {bedingung} ORDER BY datumIso, id", parameter))
+            assert index in plan
+
+    def test_archiv_ist_nur_anhaengend(self, archiv):
+        """Test: Archivierte Einträge können weder geändert noch gelöscht werden"""
+        ergebnisArchiv.archiviereSichtpruefung(erstelle_sichtpruefung())
+        verbindung = ergebnisArchiv._verbindung()
+
+        with pytest.raises(sqlite3.DatabaseError, match="nur anhängend"):
+            verbindung.execute("UPDATE sichtpruefung SET nummer = 'X'")
+        with pytest.raises(sqlite3.DatabaseError, match="nur anhängend"):
+            verbindung.execute("DELETE FROM eigenschaftspruefung")
+
+    def test_bildverweise_archivierter_sichtpruefungen(self, archiv):
+        """Test: Vorschau, Eigenschaftsbilder und Bilder im Rich-Text gelten als archiviert"""
+        sichtpruefung = erstelle_sichtpruefung()
+        sichtpruefung.pruefanweisung.pruefablaufText = '<p><img src="assets/images/ab/ablauf.png" /></p>'
+        ergebnisArchiv.archiviereSichtpruefung(sichtpruefung)
+
+        assert ergebnisArchiv.bildArchiviert("assets/images/helm.jpg")
+        assert ergebnisArchiv.bildArchiviert("assets/images/riss.jpg")
+        assert ergebnisArchiv.bildArchiviert("assets/images/ab/ablauf.png")
+        assert not ergebnisArchiv.bildArchiviert("assets/images/anderes.jpg")
@@ -4,8 +4,9 @@ Hier verwenden wir ausführliches Mocking für UI-Komponenten.
 """
 import pytest
 from unittest.mock import Mock, MagicMock, patch
+from src.logic import ergebnisArchiv
 from src.logic.pruefanweisungManager import PruefanweisungManager
-from src.logic.sichtpruefungManager import SichtpruefungManager
+from src.logic.sichtpruefungManager import SichtpruefungManager, pdfErstellen
 from src.logic.state import AppState
 from src.models.pruefanweisung import Pruefanweisung
 from src.models.sichtpruefung import Sichtpruefung
@@ -154,11 +155,13 @@ class TestSichtpruefungManager:
         return state
     
     @pytest.fixture
-    def sichtpruefung_manager(self, mock_ui, mock_app_state):
-        """Fixture: Erstellt einen SichtpruefungManager"""
+    def sichtpruefung_manager(self, mock_ui, mock_app_state, tmp_path, monkeypatch):
+        """Fixture: Erstellt einen SichtpruefungManager mit temporärem Ergebnis-Archiv"""
+        monkeypatch.setattr(ergebnisArchiv, "archivPfad", str(tmp_path / "archiv.sqlite3"))
         manager = SichtpruefungManager(mock_ui, mock_app_state)
         manager.sichtpruefung = Sichtpruefung()
-        return manager
+        yield manager
+        ergebnisArchiv.schliesseVerbindungen()
     
     def test_speichere_sichtpruefung_eigenschaft(self, sichtpruefung_manager, mock_ui, mock_app_state):
         """Test: Speichern einer Sichtprüfung-Eigenschaft"""
@@ -184,10 +187,8 @@ class TestSichtpruefungManager:
     
     @patch('src.logic.sichtpruefungManager.PdfGenerator')
     def test_speichere_sichtpruefung_zusammenfassung(self, mock_pdf_generator, sichtpruefung_manager, mock_ui):
-        """Test: Speichern der Sichtprüfung-Zusammenfassung"""
+        """Test: Speichern der Sichtprüfung-Zusammenfassung übernimmt die Ergebnisse, das PDF entsteht im Worker"""
         sichtpruefung_manager.pdfPfad = "test.pdf"
-        mock_pdf_instance = Mock()
-        mock_pdf_generator.return_value = mock_pdf_instance
         
         sichtpruefung_manager.speichereSichtpruefungZusammenfassung()
         
@@ -196,7 +197,23 @@ class TestSichtpruefungManager:
         assert sichtpruefung_manager.sichtpruefung.einsatzbereit is True
         assert sichtpruefung_manager.sichtpruefung.pruefer == "Max Mustermann"
         assert sichtpruefung_manager.sichtpruefung.datum == "2024-01-15"
-        mock_pdf_instance.erstelle_pdf.assert_called_once_with("test.pdf", sichtpruefung_manager.sichtpruefung)
+        mock_pdf_generator.assert_not_called()
+
+    @patch('src.logic.sichtpruefungManager.PdfGenerator')
+    def test_pdf_erstellen(self, mock_pdf_generator, sichtpruefung_manager, tmp_path):
+        """Test: pdfErstellen schreibt das PDF über eine temporäre Datei und archiviert die Sichtprüfung"""
+        pdfPfad = str(tmp_path / "test.pdf")
+        mock_pdf_generator.return_value.erstelle_pdf.side_effect = lambda pfad, *_: open(pfad, "wb").write(b"%PDF")
+        sichtpruefung = sichtpruefung_manager.sichtpruefung
+        sichtpruefung.finalesErgebnisEinfuegen("Lager 1", "12345", True, "Max Mustermann", "2024-01-15")
+        fortschritt = Mock()
+
+        pdfErstellen(pdfPfad, sichtpruefung, fortschritt)
+
+        mock_pdf_generator.return_value.erstelle_pdf.assert_called_once_with(pdfPfad + ".tmp", sichtpruefung, fortschritt)
+        assert (tmp_path / "test.pdf").read_bytes() == b"%PDF"
+        assert not (tmp_path / "test.pdf.tmp").exists()
+        assert [e["pdfPfad"] for e in ergebnisArchiv.sucheNachNummer("12345")] == [pdfPfad]
     
     def test_speichere_sichtpruefung_zusammenfassung_ohne_sichtpruefung(self, sichtpruefung_manager):
         """Test: Fehler wenn Sichtprüfung nicht initialisiert ist"""
@@ -226,20 +243,20 @@ class TestSichtpruefungManager:
             sichtpruefung_manager.speichereSichtpruefungEigenschaft()
 
     @patch('src.logic.sichtpruefungManager.PdfGenerator')
-    def test_speichere_sichtpruefung_zusammenfassung_propagates_pdf_error(self, mock_pdf_generator, sichtpruefung_manager):
-        """Test: Fehler beim Erstellen des PDFs wird weitergereicht"""
-        sichtpruefung_manager.pdfPfad = 'test.pdf'
-        mock_pdf_instance = Mock()
-        mock_pdf_instance.erstelle_pdf.side_effect = RuntimeError('pdf error')
-        mock_pdf_generator.return_value = mock_pdf_instance
-        sichtpruefung_manager.ui.zusammenfassungPruefobjektStammdatenLagerortEingeben = Mock(text=Mock(return_value='Lager'))
-        sichtpruefung_manager.ui.zusammenfassungPruefobjektStammdatenNummerEingeben = Mock(text=Mock(return_value='123'))
-        sichtpruefung_manager.ui.zusammenfassungEinsatzbereitJa = Mock(isChecked=Mock(return_value=True))
-        sichtpruefung_manager.ui.zusammenfassungSignaturPrueferEingeben = Mock(text=Mock(return_value='Pruefer'))
-        sichtpruefung_manager.ui.zusammenfassungSignaturDatumEingeben = Mock(text=Mock(return_value='2025-01-01'))
-        sight = sichtpruefung_manager
-        sight.ui.zusammenfassungEinsatzbereitBemerkungenEingeben = Mock(toPlainText=Mock(return_value=''))
-        with pytest.raises(RuntimeError, match='pdf error'):
-            sichtpruefung_manager.speichereSichtpruefungZusammenfassung()
-        # Sollte keine Exception werfen
+    def test_pdf_erstellen_propagates_pdf_error(self, mock_pdf_generator, sichtpruefung_manager, tmp_path):
+        """Test: Fehler beim Erstellen des PDFs wird weitergereicht, ein vorhandenes PDF bleibt unverändert,
+        die Sichtprüfung wird trotzdem archiviert"""
+        pdfPfad = tmp_path / "test.pdf"
+        pdfPfad.write_bytes(b"alt")
 
+        def fehlschlagen(pfad, *_):
+            open(pfad, "wb").write(b"halb")
+            raise RuntimeError('pdf error')
+
+        mock_pdf_generator.return_value.erstelle_pdf.side_effect = fehlschlagen
+        sichtpruefung_manager.sichtpruefung.finalesErgebnisEinfuegen("Lager", "123", True, "Pruefer", "2025-01-01")
+        with pytest.raises(RuntimeError, match='pdf error'):
+            pdfErstellen(str(pdfPfad), sichtpruefung_manager.sichtpruefung)
+        assert pdfPfad.read_bytes() == b"alt"
+        assert not (tmp_path / "test.pdf.tmp").exists()
+        assert [e["pdfPfad"] for e in ergebnisArchiv.sucheNachNummer('123')] == [""]
@@ -0,0 +1,248 @@
+"""
+Tests für den PdfGenerator und die prozessweit geteilten Schriftarten und Stile.
+"""
+import io
+from unittest.mock import patch
+
+import pytest
+from pypdf import PdfReader
+
+from src import pdfGenerator
+from src.models.beispiel import beispielSichtpruefung
+from src.pdfGenerator import PdfGenerator, absatzStil, tabellenStil
+
+
+class TestSchriftartenUndStile:
+    """Test-Klasse für die Schriftarten- und Stil-Registry"""
+
+    def test_schriftarten_werden_nur_einmal_registriert(self):
+        """Test: Weitere PdfGeneratoren lesen die TTF-Dateien nicht erneut ein"""
+        PdfGenerator()
+        with patch.object(pdfGenerator, "TTFont") as ttfont:
+            PdfGenerator()
+            PdfGenerator()
+        ttfont.assert_not_called()
+
+    def test_gleiche_angaben_liefern_denselben_stil(self):
+        """Test: Absatz- und Tabellenstile werden wiederverwendet"""
+        stil = absatzStil("Zeile", fontName="SourceSans3", fontSize=9, leading=11.5)
+        assert absatzStil("Zeile", fontSize=9, leading=11.5, fontName="SourceSans3") is stil
+        assert absatzStil("Zeile", fontName="SourceSans3", fontSize=12, leading=11.5) is not stil
+        assert stil.fontSize == 9
+
+        befehle = (("TOPPADDING", (0, 0), (-1, -1), 0), ("BOTTOMPADDING", (0, 0), (-1, -1), 0))
+        assert tabellenStil(*befehle) is tabellenStil(*befehle)
+
+    def test_mehrere_berichte_nacheinander(self, tmp_path):
+        """Test: Mehrere Berichte mit geteilten Stilen werden vollständig erzeugt"""
+        sichtpruefung = beispielSichtpruefung(2, 3)
+        for nummer in range(2):
+            pfad = tmp_path / f"bericht_{nummer}.pdf"
+            PdfGenerator().erstelle_pdf(str(pfad), sichtpruefung)
+            assert pfad.read_bytes().startswith(b"%PDF")
+
+
+class TestAusgabe:
+    """Test-Klasse für die Ausgabe in Dateien und Streams"""
+
+    def test_pdf_in_stream(self, tmp_path):
+        """Test: erstelle_pdf_stream schreibt in ein BytesIO und liefert Seitenzahl und Größe"""
+        sichtpruefung = beispielSichtpruefung(2, 3)
+        ziel = io.BytesIO(b"alt")
+        ziel.seek(3)
+        seiten, groesse = PdfGenerator().erstelle_pdf_stream(ziel, sichtpruefung)
+
+        daten = ziel.getvalue()[3:]
+        assert (seiten, groesse) == (4, len(daten))
+        assert len(PdfReader(io.BytesIO(daten)).pages) == 4
+
+        pfad = tmp_path / "bericht.pdf"
+        PdfGenerator().erstelle_pdf(str(pfad), sichtpruefung)
+        assert pfad.stat().st_size == groesse
+
+    def test_pdf_in_nicht_positionierbaren_stream(self):
+        """Test: Auch Ziele ohne seek/tell (z.B. Pipes) bekommen das vollständige PDF"""
+        class Pipe(io.RawIOBase):
+            def __init__(self):
+                self.daten = bytearray()
+            def writable(self):
+                return True
+            def write(self, daten):
+                self.daten += daten
+                return len(daten)
+
+        pipe = Pipe()
+        seiten, groesse = PdfGenerator().erstelle_pdf_stream(pipe, beispielSichtpruefung(1, 1))
+        assert seiten == 4
+        assert groesse == len(pipe.daten)
+        assert bytes(pipe.daten).startswith(b"%PDF")
+
+
+@pytest.fixture
+def vorspann_cache():
+    """Fixture: Startet mit leerem Vorspann-Cache"""
+    pdfGenerator._vorspannCache.leeren()
+    yield pdfGenerator._vorspannCache
+    pdfGenerator._vorspannCache.leeren()
+
+
+class TestVorspannCache:
+    """Test-Klasse für den Cache von Deckblatt, Vorgaben und Prüfablauf"""
+
+    def test_vorspann_wird_wiederverwendet(self, tmp_path, vorspann_cache):
+        """Test: Der zweite Bericht zur selben Prüfanweisung setzt nur die Checkliste neu"""
+        sichtpruefung = beispielSichtpruefung(2, 3)
+        PdfGenerator().erstelle_pdf(str(tmp_path / "erster.pdf"), sichtpruefung)
+
+        with patch.object(PdfGenerator, "vorspannElemente", side_effect=AssertionError("Vorspann neu gesetzt")):
+            PdfGenerator().erstelle_pdf(str(tmp_path / "zweiter.pdf"), sichtpruefung)
+
+        erster, zweiter = PdfReader(tmp_path / "erster.pdf"), PdfReader(tmp_path / "zweiter.pdf")
+        assert len(erster.pages) == len(zweiter.pages) == 4
+        assert "Prüfanweisung" in zweiter.pages[0].extract_text()
+        assert "Checkliste" in zweiter.pages[3].extract_text()
+        assert len(vorspann_cache) == 1
+
+    def test_abbruch_waehrend_des_vorspanns(self, vorspann_cache):
+        """Test: Der Vorspann meldet Fortschritt, ein Abbruch darin hinterlässt keinen Cache-Eintrag"""
+        sichtpruefung = beispielSichtpruefung(2, 3)
+        gemeldet = []
+
+        def abbrechen(prozent):
+            gemeldet.append(prozent)
+            if prozent > 0:
+                raise pdfGenerator.PdfAbgebrochen()
+
+        generator = PdfGenerator()
+        generator.sichtpruefungSetzen(sichtpruefung)
+        with pytest.raises(pdfGenerator.PdfAbgebrochen):
+            generator.berichtSchreiben(io.BytesIO(), sichtpruefung.pruefanweisung, generator.checklisteElemente(), abbrechen)
+
+        assert gemeldet[0] == 0 and gemeldet[-1] > 0
+        assert len(vorspann_cache) == 0
+
+    def test_geaenderte_pruefanweisung_ergibt_neuen_vorspann(self, vorspann_cache):
+        """Test: Der Schlüssel hängt vom Inhalt ab, nicht vom Objekt"""
+        erste = beispielSichtpruefung(1, 1).pruefanweisung
+        zweite = beispielSichtpruefung(1, 1).pruefanweisung
+        assert pdfGenerator.vorspannSchluessel(erste) == pdfGenerator.vorspannSchluessel(zweite)
+
+        zweite.vorgabenText += "<p>Neu</p>"
+        assert pdfGenerator.vorspannSchluessel(erste) != pdfGenerator.vorspannSchluessel(zweite)
+
+
+class TestCheckliste:
+    """Test-Klasse für die Checkliste mit einer Tabelle je Kategorie"""
+
+    def test_checkboxen_stehen_auf_der_seite_mit_einsatzbereit(self, tmp_path, vorspann_cache):
+        """Test: Auch wenn die Checkliste über mehrere Seiten geht, stehen die Checkboxen in der Einsatzbereit-Zeile"""
+        pfad = tmp_path / "bericht.pdf"
+        PdfGenerator().erstelle_pdf(str(pfad), beispielSichtpruefung(2, 60))
+
+        seiten = PdfReader(pfad).pages
+        assert len(seiten) > 4
+        for seite in seiten[3:]:
+            inhalt = seite.get_contents().get_data().decode("latin-1")
+            anzahlCheckboxen = inhalt.count("9.5 9.5 re")
+            assert anzahlCheckboxen == (2 if "Einsatzbereit" in seite.extract_text() else 0)
+
+    def test_kategorie_kopf_wird_auf_folgeseite_wiederholt(self, tmp_path, vorspann_cache):
+        """Test: Eine geteilte Kategorie beginnt auf der Folgeseite wieder mit ihrem Namen"""
+        pfad = tmp_path / "bericht.pdf"
+        PdfGenerator().erstelle_pdf(str(pfad), beispielSichtpruefung(1, 80))
+
+        seiten = PdfReader(pfad).pages
+        assert len(seiten) == 5
+        assert seiten[4].extract_text().count("Kategorie 1") == 1
+
+
+class TestLogo:
+    """Test-Klasse für das Logo im Seitenkopf"""
+
+    def test_logo_ist_nur_einmal_eingebettet(self, tmp_path, vorspann_cache):
+        """Test: Alle Seiten, auch die der Checkliste, verweisen auf dasselbe Logo"""
+        pfad = tmp_path / "bericht.pdf"
+        PdfGenerator().erstelle_pdf(str(pfad), beispielSichtpruefung(2, 60))
+
+        reader = PdfReader(pfad)
+        logos = {seite["/Resources"]["/XObject"].raw_get("/FormXob.logo").idnum for seite in reader.pages}
+        assert len(reader.pages) > 4
+        assert len(logos) == 1
+        assert pfad.read_bytes().count(b"/Subtype /Image") == 2  # Logo und seine Alpha-Maske
+
+    def test_logo_wird_verkleinert_aber_nicht_vergroessert(self):
+        """Test: Bei niedriger Auflösung wird das Logo verkleinert, bei hoher bleibt es unverändert"""
+        generator = PdfGenerator()
+        with patch.object(pdfGenerator, "logoDpi", 72):
+            klein = pdfGenerator.logoBild(generator.logo_path, 181, 47.5)
+        with patch.object(pdfGenerator, "logoDpi", 600):
+            gross = pdfGenerator.logoBild(generator.logo_path, 181, 47.5)
+        assert klein.getSize() == (181, 48)
+        assert gross.getSize() == (499, 131)
+
+
+class TestSchriften:
+    """Test-Klasse für die Schriften im zusammengefügten PDF"""
+
+    def test_schriften_sind_nur_einmal_eingebettet(self, tmp_path, vorspann_cache):
+        """Test: Vorspann und Checkliste verwenden dieselben Schrift-Teilmengen"""
+        pfad = tmp_path / "bericht.pdf"
+        sichtpruefung = beispielSichtpruefung(2, 60)
+        PdfGenerator().erstelle_pdf(str(tmp_path / "vorher.pdf"), sichtpruefung)
+        PdfGenerator().erstelle_pdf(str(pfad), sichtpruefung)
+
+        reader = PdfReader(pfad)
+        schriften = {}
+        for seite in reader.pages:
+            for verweis in seite["/Resources"]["/Font"].values():
+                schriften.setdefault(verweis.get_object()["/BaseFont"], set()).add(verweis.idnum)
+        assert all(len(verweise) == 1 for verweise in schriften.values())
+        assert pfad.read_bytes().count(b"/FontFile2") == sum(name.startswith("/AAAAAA+") for name in schriften)
+        assert "Prüfanweisung" in reader.pages[0].extract_text()
+
+    def test_text_wie_ohne_geteilte_schriften(self, tmp_path, vorspann_cache):
+        """Test: Mit geteilten Schriften ergibt das PDF denselben Text wie mit eigenen Teilmengen je Teil"""
+        sichtpruefung = beispielSichtpruefung(2, 60)
+        sichtpruefung.pruefanweisung.vorgabenHinzufuegen("<p>Ösen, Größe, Maße &amp; Übergänge prüfen</p>")
+        PdfGenerator().erstelle_pdf(str(tmp_path / "geteilt.pdf"), sichtpruefung)
+        vorspann_cache.leeren()
+        with patch.object(pdfGenerator, "schriftBelegungTeilbar", return_value=False):
+            PdfGenerator().erstelle_pdf(str(tmp_path / "einzeln.pdf"), sichtpruefung)
+
+        geteilt, einzeln = PdfReader(tmp_path / "geteilt.pdf"), PdfReader(tmp_path / "einzeln.pdf")
+        assert [seite.extract_text() for seite in geteilt.pages] == [seite.extract_text() for seite in einzeln.pages]
+        assert "Ösen, Größe, Maße & Übergänge" in geteilt.pages[1].extract_text()
+        assert (tmp_path / "einzeln.pdf").read_bytes().count(b"/FontFile2") > (tmp_path / "geteilt.pdf").read_bytes().count(b"/FontFile2")
+
+
+
+class TestSammelbericht:
+    """Test-Klasse für den Sammelbericht mehrerer Sichtprüfungen"""
+
+    def test_vorspann_nur_einmal(self, tmp_path, vorspann_cache):
+        """Test: Deckblatt, Vorgaben und Prüfablauf stehen einmal vorne, danach Übersicht und je Prüfobjekt eine Checkliste"""
+        sichtpruefungen = []
+        for nummer in range(3):
+            sichtpruefung = beispielSichtpruefung(1, 2)
+            sichtpruefung.finalesErgebnisEinfuegen("HLF 20", f"UJ-{nummer}", nummer != 1, "Max Mustermann", "01.01.2025", "")
+            sichtpruefungen.append(sichtpruefung)
+        pfad = tmp_path / "sammelbericht.pdf"
+        PdfGenerator().erstelle_sammelbericht(str(pfad), sichtpruefungen)
+
+        seiten = [seite.extract_text() for seite in PdfReader(pfad).pages]
+        assert len(seiten) == 3 + 1 + 3
+        assert sum("Prüfanweisung" in text for text in seiten) == 1
+        assert "Übersicht" in seiten[3]
+        assert "Einsatzbereit: 2" in seiten[3] and "Nicht einsatzbereit: 1" in seiten[3]
+        assert ["UJ-0" in seiten[4], "UJ-1" in seiten[5], "UJ-2" in seiten[6]] == [True, True, True]
+        assert pfad.read_bytes().count(b"/Subtype /Image") == 2
+
+    def test_nur_eine_pruefanweisung(self, vorspann_cache):
+        """Test: Sichtprüfungen verschiedener Prüfanweisungen lassen sich nicht zusammenfassen"""
+        erste = beispielSichtpruefung(1, 2)
+        zweite = beispielSichtpruefung(1, 3)
+        zweite.pruefanweisung.namePruefobjekt = "Helm"
+        with pytest.raises(ValueError):
+            PdfGenerator().erstelle_sammelbericht_stream(io.BytesIO(), [erste, zweite])
+        with pytest.raises(ValueError):
+            PdfGenerator().erstelle_sammelbericht_stream(io.BytesIO(), [])
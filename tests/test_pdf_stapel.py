@@ -0,0 +1,43 @@
+"""
+Tests für die parallele Erstellung mehrerer PDFs aus dem Ergebnis-Archiv.
+"""
+import os
+
+import pytest
+from pypdf import PdfReader
+
+from src import pdfStapel
+from src.logic import ergebnisArchiv
+from src.models.beispiel import beispielSichtpruefung
+
+
+@pytest.fixture
+def archiv(tmp_path, monkeypatch):
+    """Fixture: Ergebnis-Archiv in einer temporären Datenbank"""
+    monkeypatch.setattr(ergebnisArchiv, "archivPfad", str(tmp_path / "archiv.sqlite3"))
+    yield tmp_path
+    ergebnisArchiv.schliesseVerbindungen()
+
+
+class TestPdfStapel:
+    """Test-Klasse für den PDF-Stapel"""
+
+    def test_pdfs_werden_parallel_erstellt(self, archiv):
+        """Test: Jede archivierte Sichtprüfung bekommt ihr PDF, eine fehlende Id hält die anderen nicht auf"""
+        for _ in range(3):
+            ergebnisArchiv.archiviereSichtpruefung(beispielSichtpruefung(2, 3))
+        eintraege = ergebnisArchiv.sucheAlle() + [{"id": 99}]
+
+        ergebnis = pdfStapel.pdfsErstellen(eintraege, str(archiv / "berichte"), prozesse=2)
+
+        assert sorted(ergebnis.erstellt) == [str(archiv / "berichte" / f"{i}_Benchmark-Prüfobjekt_4711.pdf") for i in (1, 2, 3)]
+        assert list(ergebnis.fehler) == [99]
+        assert ergebnis.seiten == 12
+        assert ergebnis.pdfsProSekunde() > 0
+        assert all(len(PdfReader(pfad).pages) == 4 for pfad in ergebnis.erstellt)
+        assert sorted(p.name for p in (archiv / "berichte").iterdir()) == sorted(os.path.basename(p) for p in ergebnis.erstellt)
+
+    def test_dateiname(self):
+        """Test: Dateinamen enthalten keine Pfad- oder Sonderzeichen"""
+        assert pdfStapel.pdfDateiname({"id": 7, "namePruefobjekt": "Helm / F1", "nummer": "HLM:01"}) == "7_Helm-F1_HLM-01.pdf"
+        assert pdfStapel.pdfDateiname({"id": 7}) == "7.pdf"
@@ -0,0 +1,87 @@
+"""
+Tests für die PDF-Erstellung im Hintergrund (PdfWorker).
+"""
+import pytest
+
+from src.gui.pdfWorker import PdfWorker
+from src.logic import ergebnisArchiv
+from src.models.beispiel import beispielSichtpruefung
+
+
+@pytest.fixture
+def archiv(tmp_path, monkeypatch):
+    """Fixture: Leitet das Ergebnis-Archiv in ein temporäres Verzeichnis um"""
+    monkeypatch.setattr(ergebnisArchiv, "archivPfad", str(tmp_path / "archiv.sqlite3"))
+    yield
+    ergebnisArchiv.schliesseVerbindungen()
+
+
+def worker_mit_signalen(pdfPfad, sichtpruefung):
+    worker = PdfWorker(str(pdfPfad), sichtpruefung)
+    signale = {"fortschritt": [], "fertig": [], "fehler": [], "abgebrochen": 0}
+    worker.signale.fortschritt.connect(signale["fortschritt"].append)
+    worker.signale.fertig.connect(signale["fertig"].append)
+    worker.signale.fehler.connect(signale["fehler"].append)
+    worker.signale.abgebrochen.connect(lambda: signale.update(abgebrochen=signale["abgebrochen"] + 1))
+    return worker, signale
+
+
+class TestPdfWorker:
+    """Test-Klasse für den PdfWorker"""
+
+    def test_pdf_wird_erstellt_und_fertig_gemeldet(self, tmp_path, archiv):
+        """Test: Nach dem Lauf liegt das PDF vor, Fortschritt endet bei 100 Prozent"""
+        pdfPfad = tmp_path / "bericht.pdf"
+        worker, signale = worker_mit_signalen(pdfPfad, beispielSichtpruefung(2, 3))
+
+        worker.run()
+
+        assert signale["fertig"] == [str(pdfPfad)]
+        assert pdfPfad.read_bytes().startswith(b"%PDF")
+        assert signale["fortschritt"][-1] == 100
+        assert signale["fortschritt"] == sorted(signale["fortschritt"])
+        assert len(ergebnisArchiv.sucheNachNummer("4711")) == 1
+
+    def test_worker_arbeitet_auf_kopie(self, tmp_path, archiv):
+        """Test: Änderungen nach dem Start verändern die Sichtprüfung des Workers nicht"""
+        sichtpruefung = beispielSichtpruefung(1, 2)
+        worker, _ = worker_mit_signalen(tmp_path / "bericht.pdf", sichtpruefung)
+
+        sichtpruefung.nummer = "0815"
+        sichtpruefung.pruefErgebnisEinfuegen(0, False, "Austauschen")
+
+        assert worker.sichtpruefung.nummer == "4711"
+        assert worker.sichtpruefung.eigenschaftspruefungen[0].keinHandlungsbedarf is True
+
+    def test_abbruch_waehrend_der_erstellung(self, tmp_path, archiv):
+        """Test: Ein Abbruch hinterlässt weder PDF noch temporäre Datei, die Sichtprüfung wird ohne PDF archiviert"""
+        pdfPfad = tmp_path / "bericht.pdf"
+        worker, signale = worker_mit_signalen(pdfPfad, beispielSichtpruefung(3, 5))
+        worker.signale.fortschritt.connect(lambda prozent: worker.abbrechen() if prozent >= 10 else None)
+
+        worker.run()
+
+        assert signale["abgebrochen"] == 1
+        assert signale["fertig"] == [] and signale["fehler"] == []
+        assert list(tmp_path.glob("bericht.pdf*")) == []
+        assert [e["pdfPfad"] for e in ergebnisArchiv.sucheNachNummer("4711")] == [""]
+
+    def test_abbruch_vor_dem_start(self, tmp_path, archiv):
+        """Test: Auch ein vor dem Start abgebrochener Worker archiviert die Sichtprüfung, ohne PDF"""
+        worker, signale = worker_mit_signalen(tmp_path / "bericht.pdf", beispielSichtpruefung(1, 1))
+        worker.abbrechen()
+
+        worker.run()
+
+        assert signale["abgebrochen"] == 1 and signale["fortschritt"] == []
+        assert list(tmp_path.glob("bericht.pdf*")) == []
+        assert [e["pdfPfad"] for e in ergebnisArchiv.sucheNachNummer("4711")] == [""]
+
+    def test_fehler_wird_gemeldet(self, tmp_path, archiv):
+        """Test: Fehler beim Schreiben werden als Signal gemeldet statt geworfen"""
+        worker, signale = worker_mit_signalen(tmp_path / "fehlt" / "bericht.pdf", beispielSichtpruefung(1, 1))
+
+        worker.run()
+
+        assert len(signale["fehler"]) == 1
+        assert signale["fertig"] == []
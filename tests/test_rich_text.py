@@ -0,0 +1,135 @@
+"""
+Tests für das Auslagern eingebetteter Bilder aus dem Rich-Text.
+"""
+import base64
+import io
+import os
+
+import pytest
+from PIL import Image as PilImage
+from reportlab.platypus import Image, Paragraph
+
+from src.logic import bildSpeicher, richText
+from src.pdfGenerator import PdfGenerator, stylesheet
+
+
+@pytest.fixture
+def bilder_dir(tmp_path, monkeypatch):
+    """Fixture: Leitet ausgelagerte Bilder in ein temporäres Verzeichnis um"""
+    pfad = tmp_path / "images"
+    monkeypatch.setattr(bildSpeicher, "bilderDir", str(pfad))
+    return pfad
+
+
+def gespeicherte_bilder(pfad):
+    return sorted(datei.name for datei in pfad.rglob("*.png"))
+
+
+def png_base64(farbe="red"):
+    puffer = io.BytesIO()
+    PilImage.new("RGB", (20, 10), farbe).save(puffer, format="PNG")
+    return base64.b64encode(puffer.getvalue()).decode("ascii")
+
+
+class TestBilderAuslagern:
+    """Test-Klasse für bilderAuslagern und bilderAufloesen"""
+
+    def test_data_uri_wird_als_datei_abgelegt(self, bilder_dir):
+        """Test: Eingebettete Bilder werden gespeichert und per Pfad referenziert"""
+        html = f'<p>Vorher<img src="data:image/png;base64,{png_base64()}" width="20" />Nachher</p>'
+
+        ergebnis = richText.bilderAuslagern(html)
+
+        assert "base64" not in ergebnis
+        dateien = gespeicherte_bilder(bilder_dir)
+        assert len(dateien) == 1
+        assert f'src="{bilder_dir.as_posix()}/{dateien[0][:2]}/{dateien[0]}" width="20"' in ergebnis
+        assert ergebnis.startswith("<p>Vorher") and ergebnis.endswith("Nachher</p>")
+
+    def test_gleiches_bild_wird_einmal_gespeichert(self, bilder_dir):
+        """Test: Identische Bilder teilen sich eine Datei"""
+        bild = f'<img src="data:image/png;base64,{png_base64()}" />'
+
+        ergebnis = richText.bilderAuslagern(bild + bild + f'<img src="data:image/png;base64,{png_base64("blue")}" />')
+
+        assert len(gespeicherte_bilder(bilder_dir)) == 2
+        assert sorted(ergebnis.count(datei) for datei in gespeicherte_bilder(bilder_dir)) == [1, 2]
+
+    def test_ohne_eingebettete_bilder_unveraendert(self, bilder_dir):
+        """Test: HTML ohne data-URIs und ungültige base64-Daten bleiben unverändert"""
+        html = '<p><img src="assets/images/riss.jpg" /><img src="data:image/png;base64,%%%" /></p>'
+
+        assert richText.bilderAuslagern(html) == html
+        assert not bilder_dir.exists()
+
+    def test_aufloesen_macht_pfade_absolut(self):
+        """Test: Relative Bildpfade werden für die Anzeige absolut aufgelöst"""
+        html = '<img src="assets/images/a.png" /><img src="https://example.org/b.png" />'
+
+        ergebnis = richText.bilderAufloesen(html)
+
+        assert f'src="{os.path.abspath("assets/images/a.png").replace(os.sep, "/")}"' in ergebnis
+        assert 'src="https://example.org/b.png"' in ergebnis
+
+
+class TestRichTextPdf:
+    """Test-Klasse für Bilder im PDF-Export"""
+
+    def test_bilder_werden_zu_flowables(self, bilder_dir):
+        """Test: Ausgelagerte Bilder erscheinen als Bild-Flowable zwischen den Paragraphen"""
+        html = richText.bilderAuslagern(f'<p>Vorher</p><img src="data:image/png;base64,{png_base64()}" /><p>Nachher</p>')
+
+        elemente = PdfGenerator().richTextElemente(html, Paragraph("").style)
+
+        assert [type(e) for e in elemente] == [Paragraph, Image, Paragraph]
+        assert (elemente[1].drawWidth, elemente[1].drawHeight) == (20, 10)
+
+    def test_fehlendes_bild_wird_ausgelassen(self):
+        """Test: Nicht vorhandene Bilddateien brechen den Export nicht ab"""
+        elemente = PdfGenerator().richTextElemente('<p>Text</p><img src="fehlt/bild.png" />', Paragraph("").style)
+
+        assert [type(e) for e in elemente] == [Paragraph]
+
+    def test_absaetze_und_listen_werden_einzelne_paragraphen(self):
+        """Test: Jeder Absatz, jede Zeile und jeder Listenpunkt wird ein eigener Paragraph"""
+        html = ('<html><head><style>p { white-space: pre-wrap; }</style></head><body>'
+                '<h2>Titel</h2><p>Erste <b>fette</b> Zeile<br />Zweite Zeile</p>'
+                '<p style="-qt-paragraph-type:empty;"><br /></p>'
+                '<ul><li>Punkt</li></ul><ol><li>Eins</li><li>Zwei</li></ol></body></html>')
+
+        elemente = PdfGenerator().richTextElemente(html, stylesheet()["Normal"])
+
+        assert [type(e).__name__ for e in elemente] == ["Paragraph"] * 3 + ["Spacer"] + ["Paragraph"] * 3
+        assert elemente[1].text == "Erste <b>fette</b> Zeile"
+        assert [e.bulletText for e in elemente[4:]] == ["•", "1.", "2."]
+
+
+class TestBloecke:
+    """Test-Klasse für das Zerlegen von Rich-Text in Blöcke"""
+
+    def test_bloecke(self):
+        """Test: Absätze, Zeilenumbrüche, Leerzeilen und verschachtelte Listen"""
+        html = ('<body><p>a <span style="font-weight:700">b</span><br />c</p><p><br /></p>'
+                '<ul><li>x<ul><li>y</li></ul></li><li>z<br />weiter</li></ul><ol><li>n</li></ol>Rest</body>')
+
+        assert richText.bloecke(html) == [
+            ("absatz", 'a <span style="font-weight:700">b</span>', ""), ("absatz", "c", ""), ("leer", "", ""),
+            ("punkt", "x", "•"), ("punkt", "y", "–"), ("punkt", "z", "•"), ("punkt", "weiter", ""),
+            ("punkt", "n", "1."), ("absatz", "Rest", ""),
+        ]
+
+    def test_inline_markup_ueber_zeilenumbruch(self):
+        """Test: Fettdruck über ein <br> bleibt in beiden Zeilen erhalten"""
+        assert richText.bloecke('<p><b>fett<br>weiter fett</b> normal</p>') == [
+            ("absatz", "<b>fett</b>", ""), ("absatz", "<b>weiter fett</b> normal", "")]
+        assert richText.bloecke('<p><span style="font-weight:600"><i>a<br/>b</i></span></p>') == [
+            ("absatz", '<span style="font-weight:600"><i>a</i></span>', ""),
+            ("absatz", '<span style="font-weight:600"><i>b</i></span>', "")]
+
+        elemente = PdfGenerator().richTextElemente('<p><b>fett<br>weiter fett</b> normal</p>', stylesheet()["Normal"])
+        assert [e.text for e in elemente] == ["<b>fett</b>", "<b>weiter fett</b> normal"]
+
+    def test_kopf_wird_ignoriert(self):
+        """Test: CSS im <head> wird nicht zu Text"""
+        assert richText.bloecke("<html><head><style>p { color: red; }</style></head><body>Text</body></html>") == [("absatz", "Text", "")]
+        assert richText.bloecke("") == []
@@ -48,8 +48,9 @@ def test_loesche_pruefanweisung_removes_files_and_overview(tmp_path, monkeypatch
     tree2 = ET.ElementTree(root2)
     tree2.write(str(overview), encoding='utf-8', xml_declaration=True)
 
-    # Monkeypatch module-level overview path
+    # Monkeypatch module-level overview path, unused images are removed synchronously
     monkeypatch.setattr(serializer, 'pruefanweisungenXmlPfad', str(overview))
+    monkeypatch.setattr(serializer, 'bilderImHintergrundAufraeumen', False)
 
     # Ensure files exist
     assert xml_path.exists()
@@ -65,10 +66,9 @@ def test_loesche_pruefanweisung_removes_files_and_overview(tmp_path, monkeypatch
     assert not img1.exists()
     assert not img2.exists()
 
-    # Overview should no longer contain the entry
-    tree_after = ET.parse(str(overview))
-    root_after = tree_after.getroot()
-    assert len(root_after.findall('Pruefanweisung')) == 0
+    # Overview should no longer contain the entry (snapshot + journal)
+    serializer.uebersichtCacheLeeren()
+    assert serializer.ladePruefanweisungenXml() == []
 
 
 def test_loesche_pruefanweisung_handles_missing_overview(tmp_path, monkeypatch):
@@ -90,6 +90,7 @@ def test_loesche_pruefanweisung_handles_missing_overview(tmp_path, monkeypatch):
 
     # Point overview path to a non-existing file
     monkeypatch.setattr(serializer, 'pruefanweisungenXmlPfad', str(tmp_path / 'nonexistent.xml'))
+    monkeypatch.setattr(serializer, 'bilderImHintergrundAufraeumen', False)
 
     # Should not raise, and should remove xml and image
     deleted = serializer.loeschePruefanweisung(str(xml_path))
@@ -0,0 +1,167 @@
+"""
+Tests für den Cache der Prüfanweisungen-Übersicht.
+"""
+import os
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+
+import pytest
+
+import src.logic.serializer as serializer
+from src.models.pruefanweisung import Pruefanweisung
+
+
+@pytest.fixture
+def uebersicht(tmp_path, monkeypatch):
+    """Fixture: Leitet die Übersichts-XML in ein temporäres Verzeichnis um"""
+    pfad = tmp_path / "pruefanweisungen.xml"
+    monkeypatch.setattr(serializer, "pruefanweisungenXmlPfad", str(pfad))
+    serializer.uebersichtCacheLeeren()
+    yield pfad
+    serializer.uebersichtCacheLeeren()
+
+
+def erstelle_pruefanweisung(name):
+    pruefanweisung = Pruefanweisung()
+    pruefanweisung.auswahlHinzufuegen(f"assets/images/{name}.jpg", name)
+    return pruefanweisung
+
+
+class TestUebersichtCache:
+    """Test-Klasse für den Übersichts-Cache"""
+
+    def test_zweiter_aufruf_parst_nicht_erneut(self, uebersicht):
+        """Test: Unveränderte Übersicht wird aus dem Cache geliefert"""
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung("Helm"), "data/pruefanweisungen/Helm.xml")
+        serializer.uebersichtCacheLeeren()
+
+        erste = serializer.ladePruefanweisungenXml()
+        with patch.object(serializer.ET, "parse", side_effect=AssertionError("Datei erneut geparst")):
+            zweite = serializer.ladePruefanweisungenXml()
+
+        assert erste == zweite
+        assert zweite[0]["Name"] == "Helm"
+
+    def test_hinzufuegen_aktualisiert_cache(self, uebersicht):
+        """Test: Hinzufügen aktualisiert den Cache ohne erneutes Parsen beim Laden"""
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung("Helm"), "data/pruefanweisungen/Helm.xml")
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung("Jacke"), "data/pruefanweisungen/Jacke.xml")
+
+        with patch.object(serializer.ET, "parse", side_effect=AssertionError("Datei erneut geparst")):
+            eintraege = serializer.ladePruefanweisungenXml()
+
+        assert [e["Name"] for e in eintraege] == ["Helm", "Jacke"]
+
+    def test_loeschen_aktualisiert_cache(self, uebersicht, tmp_path):
+        """Test: Löschen entfernt den Eintrag direkt aus dem Cache"""
+        xml_pfad = str(tmp_path / "Helm.xml")
+        ET.ElementTree(ET.Element("Pruefanweisung")).write(xml_pfad, encoding="utf-8", xml_declaration=True)
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung("Helm"), xml_pfad)
+        serializer.ladePruefanweisungenXml()
+
+        serializer.loeschePruefanweisung(xml_pfad)
+
+        assert serializer.ladePruefanweisungenXml() == []
+
+    def test_externe_aenderung_invalidiert_cache(self, uebersicht):
+        """Test: Von außen geänderte Übersicht wird neu eingelesen"""
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung("Helm"), "data/pruefanweisungen/Helm.xml")
+        serializer.ladePruefanweisungenXml()
+
+        root = ET.Element("Pruefanweisungen")
+        eintrag = ET.SubElement(root, "Pruefanweisung")
+        ET.SubElement(eintrag, "Name").text = "Extern"
+        ET.SubElement(eintrag, "VorschauBildPfad").text = "bild.jpg"
+        ET.SubElement(eintrag, "PruefanweisungXmlPfad").text = "extern.xml"
+        ET.ElementTree(root).write(str(uebersicht), encoding="utf-8", xml_declaration=True)
+        stat = os.stat(uebersicht)
+        os.utime(uebersicht, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert [e["Name"] for e in serializer.ladePruefanweisungenXml()] == ["Extern"]
+
+    def test_rueckgabe_veraendert_cache_nicht(self, uebersicht):
+        """Test: Änderungen am Rückgabewert wirken sich nicht auf den Cache aus"""
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung("Helm"), "data/pruefanweisungen/Helm.xml")
+
+        eintraege = serializer.ladePruefanweisungenXml()
+        eintraege[0]["Name"] = "Verändert"
+        eintraege.clear()
+
+        assert serializer.ladePruefanweisungenXml()[0]["Name"] == "Helm"
+
+
+class TestUebersichtJournal:
+    """Test-Klasse für das Journal der Übersicht"""
+
+    def test_hinzufuegen_haengt_an_journal_an(self, uebersicht):
+        """Test: Weitere Prüfanweisungen werden angehängt statt die Übersicht neu zu schreiben"""
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung("Helm"), "data/pruefanweisungen/Helm.xml")
+        snapshot_vorher = uebersicht.read_bytes()
+
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung("Jacke"), "data/pruefanweisungen/Jacke.xml")
+
+        assert uebersicht.read_bytes() == snapshot_vorher
+        with open(serializer._journalPfad(), encoding="utf-8") as journal:
+            assert len(journal.readlines()) == 1
+
+    def test_snapshot_und_journal_werden_zusammengefuehrt(self, uebersicht):
+        """Test: Laden spielt das Journal auf den Snapshot ab"""
+        for name in ["Helm", "Jacke", "Hose"]:
+            serializer.addToPruefanweisungenXml(erstelle_pruefanweisung(name), f"data/pruefanweisungen/{name}.xml")
+        with open(serializer._journalPfad(), "a", encoding="utf-8") as journal:
+            journal.write('{"aktion": "entfernen", "PruefanweisungXmlPfad": "data/pruefanweisungen/Jacke.xml"}\n')
+        serializer.uebersichtCacheLeeren()
+
+        eintraege = serializer.ladePruefanweisungenXml()
+
+        assert eintraege == [
+            {"Name": "Helm", "VorschauBildPfad": "assets/images/Helm.jpg", "PruefanweisungXmlPfad": "data/pruefanweisungen/Helm.xml"},
+            {"Name": "Hose", "VorschauBildPfad": "assets/images/Hose.jpg", "PruefanweisungXmlPfad": "data/pruefanweisungen/Hose.xml"},
+        ]
+
+    def test_unvollstaendige_journalzeile_wird_uebersprungen(self, uebersicht):
+        """Test: Eine abgeschnittene letzte Journalzeile verhindert das Laden nicht"""
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung("Helm"), "data/pruefanweisungen/Helm.xml")
+        with open(serializer._journalPfad(), "a", encoding="utf-8") as journal:
+            journal.write('{"aktion": "hinzuf')
+        serializer.uebersichtCacheLeeren()
+
+        assert [e["Name"] for e in serializer.ladePruefanweisungenXml()] == ["Helm"]
+
+    def test_eintrag_nach_unvollstaendiger_zeile_bleibt_erhalten(self, uebersicht):
+        """Test: Ein Eintrag, der nach einer abgeschnittenen Zeile angehängt wird, geht nicht verloren"""
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung("Helm"), "data/pruefanweisungen/Helm.xml")
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung("Jacke"), "data/pruefanweisungen/Jacke.xml")
+        with open(serializer._journalPfad(), "a", encoding="utf-8") as journal:
+            journal.write('{"aktion": "hinzuf')
+
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung("Hose"), "data/pruefanweisungen/Hose.xml")
+        serializer.uebersichtCacheLeeren()
+
+        assert [e["Name"] for e in serializer.ladePruefanweisungenXml()] == ["Helm", "Jacke", "Hose"]
+
+    def test_kompaktierung_ab_schwellwert(self, uebersicht, monkeypatch):
+        """Test: Überschreitet das Journal den Schwellwert, wird es in den Snapshot gefaltet"""
+        monkeypatch.setattr(serializer, "journalMaxBytes", 300)
+        for index in range(10):
+            serializer.addToPruefanweisungenXml(erstelle_pruefanweisung(f"Objekt{index}"), f"data/pruefanweisungen/Objekt{index}.xml")
+
+        journal_groesse = os.path.getsize(serializer._journalPfad()) if os.path.exists(serializer._journalPfad()) else 0
+        assert journal_groesse <= 300
+        snapshot = ET.parse(str(uebersicht)).getroot().findall("Pruefanweisung")
+        assert len(snapshot) >= 5
+        serializer.uebersichtCacheLeeren()
+        assert len(serializer.ladePruefanweisungenXml()) == 10
+
+    def test_kompaktierung_ist_wiederholbar(self, uebersicht):
+        """Test: Wird das Journal nach einem Absturz erneut angewendet, entstehen keine Duplikate"""
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung("Helm"), "data/pruefanweisungen/Helm.xml")
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung("Jacke"), "data/pruefanweisungen/Jacke.xml")
+        journal = open(serializer._journalPfad(), encoding="utf-8").read()
+
+        serializer.kompaktierePruefanweisungenJournal()
+        with open(serializer._journalPfad(), "w", encoding="utf-8") as datei:
+            datei.write(journal)
+        serializer.uebersichtCacheLeeren()
+
+        assert [e["Name"] for e in serializer.ladePruefanweisungenXml()] == ["Helm", "Jacke"]
@@ -0,0 +1,243 @@
+"""
+Tests für das Laden einzelner Prüfanweisungen im XML-Format.
+"""
+import copy
+import html
+import os
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+
+import pytest
+
+import src.logic.serializer as serializer
+from src.models.pruefanweisung import Pruefanweisung
+
+
+@pytest.fixture
+def xml_verzeichnis(tmp_path, monkeypatch):
+    """Fixture: Leitet die Prüfanweisungen in ein temporäres Verzeichnis um"""
+    monkeypatch.setattr(serializer, "pruefanweisungenDir", str(tmp_path / "pruefanweisungen"))
+    monkeypatch.setattr(serializer, "speicherBackend", "xml")
+    serializer._pruefanweisungCache.leeren()
+    yield tmp_path
+    serializer._pruefanweisungCache.leeren()
+
+
+def erstelle_pruefanweisung(name="Überjacke"):
+    pruefanweisung = Pruefanweisung()
+    pruefanweisung.auswahlHinzufuegen("assets/images/vorschau.jpg", name)
+    pruefanweisung.infosHinzufuegen("Sichtprüfung", "DGUV 305-002", "", "12 Monate", "Gerätewart", "", "Hersteller", "10 Jahre")
+    pruefanweisung.vorgabenHinzufuegen("<p style=\"margin:0\">Vorgaben &amp; <b>Hinweise</b></p>")
+    pruefanweisung.pruefablaufHinzufuegen("<p>Prüfablauf</p>")
+    pruefanweisung.eigenschaftHinzufuegen("Außenmaterial", "Keine Risse", [("assets/images/riss.jpg", "Riss")])
+    pruefanweisung.eigenschaftHinzufuegen("Reflexstreifen", "Vollständig", [])
+    pruefanweisung.hinweisHinzufuegen("Hinweis")
+    return pruefanweisung
+
+
+class TestPruefanweisungCache:
+    """Test-Klasse für den LRU-Cache geladener Prüfanweisungen"""
+
+    def test_wiederholtes_laden_nutzt_cache(self, xml_verzeichnis):
+        """Test: Eine unveränderte Datei wird nur einmal gelesen"""
+        pfad = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung())
+        serializer.ladePruefanweisungXml(pfad)
+
+        with patch("builtins.open", side_effect=AssertionError("Datei erneut gelesen")):
+            sichtpruefung = serializer.ladePruefanweisungXml(pfad)
+
+        assert sichtpruefung.pruefanweisung.namePruefobjekt == "Überjacke"
+        assert len(sichtpruefung.eigenschaftspruefungen) == 2
+
+    def test_jede_sichtpruefung_ist_unabhaengig(self, xml_verzeichnis):
+        """Test: Ergebnisse einer Sichtprüfung verändern die zwischengespeicherte Vorlage nicht"""
+        pfad = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung())
+        erste = serializer.ladePruefanweisungXml(pfad)
+        erste.pruefErgebnisEinfuegen(0, False, "Jacke austauschen")
+        erste.eigenschaftspruefungen[0].eigenschaft.bilder.append(("neu.jpg", ""))
+        erste.pruefanweisung.eigenschaften.clear()
+
+        zweite = serializer.ladePruefanweisungXml(pfad)
+
+        assert zweite.eigenschaftspruefungen is not erste.eigenschaftspruefungen
+        assert zweite.eigenschaftspruefungen[0].keinHandlungsbedarf is True
+        assert zweite.eigenschaftspruefungen[0].massnahmen == ''
+        assert zweite.eigenschaftspruefungen[0].eigenschaft.bilder == [("assets/images/riss.jpg", "Riss")]
+        assert len(zweite.pruefanweisung.eigenschaften) == 2
+
+    def test_geaenderte_datei_wird_neu_gelesen(self, xml_verzeichnis):
+        """Test: Ändert sich die Datei, wird der Cache-Eintrag ersetzt"""
+        pfad = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung())
+        serializer.ladePruefanweisungXml(pfad)
+
+        with open(pfad, "r", encoding="utf-8") as datei:
+            inhalt = datei.read()
+        with open(pfad, "w", encoding="utf-8") as datei:
+            datei.write(inhalt.replace("Überjacke", "Überhose"))
+        stat = os.stat(pfad)
+        os.utime(pfad, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert serializer.ladePruefanweisungXml(pfad).pruefanweisung.namePruefobjekt == "Überhose"
+
+
+class TestLazyLaden:
+    """Test-Klasse für das verzögerte Laden von Texten und Bildern"""
+
+    def test_texte_und_bilder_werden_erst_bei_zugriff_geladen(self, xml_verzeichnis):
+        """Test: Vorgaben, Prüfablauf und Bilder stehen nach dem Öffnen noch nicht im Speicher"""
+        pfad = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung())
+
+        sichtpruefung = serializer.ladePruefanweisungXml(pfad)
+
+        pruefanweisung = sichtpruefung.pruefanweisung
+        assert pruefanweisung.prueffrist == "12 Monate"
+        assert pruefanweisung._vorgabenText is None
+        assert sichtpruefung.eigenschaftspruefungen[0].eigenschaft._bilder is None
+        assert pruefanweisung.vorgabenText == "<p style=\"margin:0\">Vorgaben &amp; <b>Hinweise</b></p>"
+        assert pruefanweisung.pruefablaufText == "<p>Prüfablauf</p>"
+        assert sichtpruefung.eigenschaftspruefungen[0].eigenschaft.bilder == [("assets/images/riss.jpg", "Riss")]
+        assert sichtpruefung.eigenschaftspruefungen[1].eigenschaft.bilder == []
+
+    def test_nachladen_liest_datei_einmal_fuer_alle_kopien(self, xml_verzeichnis):
+        """Test: Mehrere Sichtprüfungen derselben Vorlage lesen die Texte nur einmal nach"""
+        pfad = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung())
+        erste = serializer.ladePruefanweisungXml(pfad)
+        zweite = serializer.ladePruefanweisungXml(pfad)
+        assert erste.pruefanweisung.vorgabenText
+
+        with patch("builtins.open", side_effect=AssertionError("Datei erneut gelesen")):
+            assert zweite.pruefanweisung.pruefablaufText == "<p>Prüfablauf</p>"
+            assert zweite.pruefanweisung.eigenschaften[0].bilder == [("assets/images/riss.jpg", "Riss")]
+
+    def test_tiefe_kopie_bleibt_nachladbar(self, xml_verzeichnis):
+        """Test: Eine tiefe Kopie (z.B. für den PDF-Worker) lädt Texte und Bilder weiterhin nach"""
+        pfad = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung())
+        kopie = copy.deepcopy(serializer.ladePruefanweisungXml(pfad))
+
+        assert kopie.pruefanweisung.pruefablaufText == "<p>Prüfablauf</p>"
+        assert kopie.eigenschaftspruefungen[0].eigenschaft.bilder == [("assets/images/riss.jpg", "Riss")]
+
+    def test_fehlgeschlagenes_nachladen_wird_nicht_gemerkt(self, xml_verzeichnis):
+        """Test: Ein Lesefehler beim Nachladen wird gemeldet und beim nächsten Zugriff erneut versucht"""
+        pfad = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung())
+        sichtpruefung = serializer.ladePruefanweisungXml(pfad)
+        with open(pfad, "rb") as datei:
+            inhalt = datei.read()
+        with open(pfad, "wb") as datei:
+            datei.write(inhalt[:len(inhalt) // 2])
+
+        with pytest.raises(ET.ParseError):
+            sichtpruefung.pruefanweisung.vorgabenText
+        assert serializer._pruefanweisungCache.get(pfad) is None
+
+        with open(pfad, "wb") as datei:
+            datei.write(inhalt)
+        assert sichtpruefung.pruefanweisung.vorgabenText == "<p style=\"margin:0\">Vorgaben &amp; <b>Hinweise</b></p>"
+        assert sichtpruefung.eigenschaftspruefungen[0].eigenschaft.bilder == [("assets/images/riss.jpg", "Riss")]
+
+    def test_fehlende_optionale_tags(self, xml_verzeichnis):
+        """Test: Fehlende oder leere Tags ergeben leere Werte statt eines Fehlers"""
+        pfad = xml_verzeichnis / "minimal.xml"
+        pfad.write_text(
+            "<?xml version='1.0' encoding='utf-8'?>\n"
+            "<Pruefanweisung><Name>Helm</Name><PruefablaufText />"
+            "<Eigenschaften><Eigenschaft><Kategorie>Schale</Kategorie></Eigenschaft></Eigenschaften>"
+            "</Pruefanweisung>", encoding="utf-8")
+
+        sichtpruefung = serializer.ladePruefanweisungXml(str(pfad))
+
+        pruefanweisung = sichtpruefung.pruefanweisung
+        assert pruefanweisung.namePruefobjekt == "Helm"
+        assert pruefanweisung.pfadVorschauBild == ""
+        assert pruefanweisung.hinweis == ""
+        assert pruefanweisung.vorgabenText == ""
+        assert pruefanweisung.pruefablaufText == ""
+        assert sichtpruefung.eigenschaftspruefungen[0].eigenschaft.beschreibung == ""
+        assert sichtpruefung.eigenschaftspruefungen[0].eigenschaft.bilder == []
+
+
+def schreibe_v1(pfad, pruefanweisung):
+    """Schreibt eine Prüfanweisung wie vor Format v2 mit doppelt maskiertem Rich-Text"""
+    root = serializer._pruefanweisungXmlElement(pruefanweisung)
+    del root.attrib["version"]
+    root.find("VorgabenText").text = html.escape(pruefanweisung.vorgabenText)
+    root.find("PruefablaufText").text = html.escape(pruefanweisung.pruefablaufText)
+    ET.ElementTree(root).write(str(pfad), encoding="utf-8", xml_declaration=True)
+
+
+class TestFormatV2:
+    """Test-Klasse für das Dateiformat v2"""
+
+    def test_rich_text_wird_nur_einmal_maskiert(self, xml_verzeichnis):
+        """Test: v2 speichert den Rich-Text ohne zusätzliches html.escape"""
+        pfad = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung())
+
+        inhalt = open(pfad, encoding="utf-8").read()
+
+        assert 'version="2"' in inhalt
+        assert "Vorgaben &amp;amp; &lt;b&gt;Hinweise&lt;/b&gt;" in inhalt
+        assert "&amp;lt;" not in inhalt
+
+    def test_v1_wird_weiterhin_gelesen(self, xml_verzeichnis):
+        """Test: Dateien im alten Format werden unverändert geladen"""
+        pfad = xml_verzeichnis / "alt.xml"
+        schreibe_v1(pfad, erstelle_pruefanweisung())
+
+        pruefanweisung = serializer.ladePruefanweisungXml(str(pfad)).pruefanweisung
+
+        assert pruefanweisung.vorgabenText == "<p style=\"margin:0\">Vorgaben &amp; <b>Hinweise</b></p>"
+
+    def test_komprimierte_datei_wird_erkannt(self, xml_verzeichnis, monkeypatch):
+        """Test: gzip-komprimierte Dateien werden am Dateianfang erkannt und gelesen"""
+        monkeypatch.setattr(serializer, "xmlKomprimieren", True)
+        pfad = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung())
+
+        with open(pfad, "rb") as datei:
+            assert datei.read(2) == b"\x1f\x8b"
+        sichtpruefung = serializer.ladePruefanweisungXml(pfad)
+
+        assert pfad.endswith(".xml")
+        assert sichtpruefung.pruefanweisung.pruefablaufText == "<p>Prüfablauf</p>"
+        assert sichtpruefung.eigenschaftspruefungen[0].eigenschaft.bilder == [("assets/images/riss.jpg", "Riss")]
+
+    def test_konverter_schreibt_v1_nach_v2_um(self, xml_verzeichnis):
+        """Test: Der Konverter schreibt alte Dateien an Ort und Stelle um und überspringt aktuelle"""
+        verzeichnis = xml_verzeichnis / "pruefanweisungen"
+        verzeichnis.mkdir()
+        schreibe_v1(verzeichnis / "alt.xml", erstelle_pruefanweisung())
+        serializer.speicherePruefanweisungXml(erstelle_pruefanweisung("Neu"))
+
+        assert serializer.konvertiereNachV2() == 1
+        assert serializer.konvertiereNachV2() == 0
+        assert 'version="2"' in (verzeichnis / "alt.xml").read_text(encoding="utf-8")
+        pruefanweisung = serializer.ladePruefanweisungXml(str(verzeichnis / "alt.xml")).pruefanweisung
+        assert pruefanweisung.vorgabenText == "<p style=\"margin:0\">Vorgaben &amp; <b>Hinweise</b></p>"
+        assert pruefanweisung.eigenschaften[0].bilder == [("assets/images/riss.jpg", "Riss")]
+
+        assert serializer.konvertiereNachV2(komprimieren=True) == 2
+        assert (verzeichnis / "alt.xml").read_bytes()[:2] == b"\x1f\x8b"
+
+    def test_nach_konvertierung_wird_version_der_datei_genutzt(self, xml_verzeichnis):
+        """Test: Wird eine geöffnete v1-Datei umgeschrieben, liest das Nachladen sie als v2"""
+        verzeichnis = xml_verzeichnis / "pruefanweisungen"
+        verzeichnis.mkdir()
+        schreibe_v1(verzeichnis / "alt.xml", erstelle_pruefanweisung())
+        pruefanweisung = serializer.ladePruefanweisungXml(str(verzeichnis / "alt.xml")).pruefanweisung
+
+        assert serializer.konvertiereNachV2() == 1
+
+        assert pruefanweisung.vorgabenText == "<p style=\"margin:0\">Vorgaben &amp; <b>Hinweise</b></p>"
+        assert pruefanweisung.eigenschaften[0].bilder == [("assets/images/riss.jpg", "Riss")]
+
+    def test_geaenderte_eigenschaften_beim_nachladen_schlagen_fehl(self, xml_verzeichnis):
+        """Test: Passen die Eigenschaften der geänderten Datei nicht mehr, werden keine falschen Bilder zugeordnet"""
+        pfad = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung())
+        pruefanweisung = serializer.ladePruefanweisungXml(pfad).pruefanweisung
+        geaendert = erstelle_pruefanweisung()
+        geaendert.eigenschaften.reverse()
+        serializer._schreibePruefanweisungXml(geaendert, pfad, False)
+        stat = os.stat(pfad)
+        os.utime(pfad, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        with pytest.raises(ValueError, match="Eigenschaften passen nicht mehr"):
+            pruefanweisung.eigenschaften[0].bilder
@@ -0,0 +1,105 @@
+"""
+Tests für das SQLite-Backend der Prüfanweisungen.
+"""
+import pytest
+
+import src.logic.serializer as serializer
+from src.logic import sqliteSpeicher
+from src.models.pruefanweisung import Pruefanweisung
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path, monkeypatch):
+    """Fixture: Aktiviert das SQLite-Backend mit einer temporären Datenbank"""
+    monkeypatch.setattr(sqliteSpeicher, "datenbankPfad", str(tmp_path / "pruefanweisungen.sqlite3"))
+    monkeypatch.setattr(serializer, "speicherBackend", "sqlite")
+    yield tmp_path
+    sqliteSpeicher.schliesseVerbindungen()
+
+
+def erstelle_pruefanweisung(name="Überjacke", bild="assets/images/vorschau.jpg"):
+    pruefanweisung = Pruefanweisung()
+    pruefanweisung.auswahlHinzufuegen(bild, name)
+    pruefanweisung.infosHinzufuegen("Sichtprüfung", "DGUV 305-002", "", "12 Monate", "Gerätewart", "", "Hersteller", "10 Jahre")
+    pruefanweisung.vorgabenHinzufuegen("<p>Vorgaben &amp; Hinweise</p>")
+    pruefanweisung.pruefablaufHinzufuegen("<p>Prüfablauf</p>")
+    pruefanweisung.eigenschaftHinzufuegen("Außenmaterial", "Keine Risse", [("assets/images/riss.jpg", "Riss"), ("assets/images/naht.jpg", "")])
+    pruefanweisung.eigenschaftHinzufuegen("Reflexstreifen", "Vollständig", [])
+    pruefanweisung.hinweisHinzufuegen("Hinweis")
+    return pruefanweisung
+
+
+class TestSqliteBackend:
+    """Test-Klasse für das SQLite-Backend"""
+
+    def test_speichern_und_laden(self, sqlite_backend):
+        """Test: Gespeicherte Prüfanweisung wird vollständig wieder geladen"""
+        pfad = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung())
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung(), pfad)
+
+        sichtpruefung = serializer.ladePruefanweisungXml(pfad)
+
+        pruefanweisung = sichtpruefung.pruefanweisung
+        assert pruefanweisung.namePruefobjekt == "Überjacke"
+        assert pruefanweisung.prueffrist == "12 Monate"
+        assert pruefanweisung.vorgabenText == "<p>Vorgaben &amp; Hinweise</p>"
+        assert [e.eigenschaft.kategorie for e in sichtpruefung.eigenschaftspruefungen] == ["Außenmaterial", "Reflexstreifen"]
+        assert sichtpruefung.eigenschaftspruefungen[0].eigenschaft.bilder == [("assets/images/riss.jpg", "Riss"), ("assets/images/naht.jpg", "")]
+        assert not (sqlite_backend / "pruefanweisungen").exists()
+
+    def test_gleicher_name_erhaelt_eindeutigen_pfad(self, sqlite_backend):
+        """Test: Zwei Prüfanweisungen mit gleichem Namen überschreiben sich nicht"""
+        pfad1 = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung())
+        pfad2 = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung())
+
+        assert pfad1 != pfad2
+        assert [e["PruefanweisungXmlPfad"] for e in serializer.ladePruefanweisungenXml()] == [pfad1, pfad2]
+
+    def test_loeschen_entfernt_eintrag_und_bilder(self, sqlite_backend, monkeypatch):
+        """Test: Löschen entfernt Datenbankeintrag und referenzierte Bilder"""
+        monkeypatch.setattr(serializer, "bilderImHintergrundAufraeumen", False)
+        bild = sqlite_backend / "vorschau.jpg"
+        bild.write_bytes(b"bild")
+        pfad = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung(bild=str(bild)))
+
+        geloescht = serializer.loeschePruefanweisung(pfad)
+
+        assert str(bild) in geloescht
+        assert "assets/images/riss.jpg" in geloescht
+        assert not bild.exists()
+        assert serializer.ladePruefanweisungenXml() == []
+        with pytest.raises(FileNotFoundError):
+            serializer.ladePruefanweisungXml(pfad)
+
+    def test_migration_aus_xml(self, sqlite_backend, monkeypatch):
+        """Test: Bestehende XML-Prüfanweisungen werden mit ihren Pfaden übernommen"""
+        monkeypatch.setattr(serializer, "pruefanweisungenDir", str(sqlite_backend / "pruefanweisungen"))
+        monkeypatch.setattr(serializer, "pruefanweisungenXmlPfad", str(sqlite_backend / "pruefanweisungen.xml"))
+        serializer.uebersichtCacheLeeren()
+        monkeypatch.setattr(serializer, "speicherBackend", "xml")
+        xml_pfad = serializer.speicherePruefanweisungXml(erstelle_pruefanweisung())
+        serializer.addToPruefanweisungenXml(erstelle_pruefanweisung(), xml_pfad)
+        monkeypatch.setattr(serializer, "speicherBackend", "sqlite")
+
+        anzahl = serializer.migriereXmlNachSqlite()
+
+        assert anzahl == 1
+        assert serializer.speicherBackend == "sqlite"
+        assert serializer.ladePruefanweisungenXml()[0]["PruefanweisungXmlPfad"] == xml_pfad
+        sichtpruefung = serializer.ladePruefanweisungXml(xml_pfad)
+        assert sichtpruefung.pruefanweisung.vorgabenText == "<p>Vorgaben &amp; Hinweise</p>"
+        assert len(sichtpruefung.eigenschaftspruefungen) == 2
+        assert "assets/images/riss.jpg" in serializer.bildReferenzIndex().bilderVon(xml_pfad)
+        serializer.uebersichtCacheLeeren()
+
+    def test_konfiguration_waehlt_backend(self, tmp_path, monkeypatch):
+        """Test: Backend und Datenbankpfad werden aus der Konfiguration übernommen"""
+        monkeypatch.setattr(serializer, "speicherBackend", "xml")
+        monkeypatch.setattr(sqliteSpeicher, "datenbankPfad", sqliteSpeicher.datenbankPfad)
+
+        serializer.konfiguriereSpeicher({"speicherBackend": "sqlite", "datenbankPfad": str(tmp_path / "db.sqlite3")})
+
+        assert serializer.speicherBackend == "sqlite"
+        assert sqliteSpeicher.datenbankPfad == str(tmp_path / "db.sqlite3")
+        with pytest.raises(ValueError, match="Unbekanntes Speicher-Backend"):
+            serializer.konfiguriereSpeicher({"speicherBackend": "csv"})
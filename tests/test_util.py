@@ -0,0 +1,89 @@
+"""
+Tests für die Hilfsfunktionen in src.util.
+"""
+from unittest.mock import patch
+
+from src import util
+from src.util import LruCache, cleanHtml
+
+
+class TestLruCache:
+    """Test-Klasse für LruCache"""
+
+    def test_verdraengt_aeltesten_eintrag(self):
+        """Test: Bei zu vielen Einträgen wird der am längsten unbenutzte verdrängt"""
+        cache = LruCache(maxEintraege=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_begrenzung_nach_bytes(self):
+        """Test: Die Summe der Größen bleibt unter maxBytes"""
+        cache = LruCache(maxBytes=100)
+        cache.put("a", "x", 60)
+        cache.put("b", "y", 30)
+        cache.put("c", "z", 30)
+
+        assert "a" not in cache
+        assert cache.bytes == 60
+        assert len(cache) == 2
+
+    def test_zu_grosser_eintrag_wird_nicht_aufgenommen(self):
+        """Test: Ein Eintrag größer als maxBytes verdrängt nicht den ganzen Cache"""
+        cache = LruCache(maxBytes=100)
+        cache.put("a", "x", 50)
+        cache.put("b", "y", 500)
+
+        assert "a" in cache
+        assert "b" not in cache
+
+    def test_ueberschreiben_und_entfernen(self):
+        """Test: Überschreiben und Entfernen halten die Größe konsistent"""
+        cache = LruCache()
+        cache.put("a", 1, 10)
+        cache.put("a", 2, 20)
+        assert cache.get("a") == 2
+        assert cache.bytes == 20
+
+        cache.entfernen("a")
+        assert cache.get("a", "fehlt") == "fehlt"
+        assert cache.bytes == 0
+
+
+QTEXTEDIT_HTML = (
+    '<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.0//EN" "http://www.w3.org/TR/REC-html40/strict.dtd">\n'
+    '<html><head><meta name="qrichtext" content="1" /><meta charset="utf-8" /><style type="text/css">\n'
+    'p, li { white-space: pre-wrap; }\n</style></head><body style=" font-family:\'Sans Serif\'; font-size:9pt;">\n'
+    '<p style=" margin-top:0px;">Auf <span style=" font-weight:700;">Risse</span> &amp; <i>Schmutz</i> prüfen.<br />Zweite Zeile</p></body></html>'
+)
+
+
+class TestCleanHtml:
+    """Test-Klasse für cleanHtml"""
+
+    def test_qtextedit_html_ohne_beautifulsoup(self):
+        """Test: QTextEdit-HTML wird ohne BeautifulSoup bereinigt, <head> und CSS fallen weg"""
+        util._cleanHtmlCache.leeren()
+        with patch.object(util, "BeautifulSoup") as beautifulSoup:
+            text = cleanHtml(QTEXTEDIT_HTML)
+        beautifulSoup.assert_not_called()
+        assert text == "\n\nAuf Risse &amp; <i>Schmutz</i> prüfen.\nZweite Zeile"
+
+    def test_anderes_html_ueber_beautifulsoup(self):
+        """Test: HTML, das nicht von QTextEdit stammt, wird weiterhin über BeautifulSoup zerlegt"""
+        util._cleanHtmlCache.leeren()
+        assert cleanHtml("<html><head><style>p {}</style></head><body><p>a <b>b</b></p></body></html>") == "\na <b>b</b>"
+        assert cleanHtml("Text ohne <script>x</script>Tags") == "Text ohne xTags"
+
+    def test_ergebnis_wird_wiederverwendet(self):
+        """Test: Gleicher Inhalt wird nur einmal bereinigt"""
+        util._cleanHtmlCache.leeren()
+        erstes = cleanHtml(QTEXTEDIT_HTML)
+        with patch.object(util.bleach, "clean", side_effect=AssertionError("erneut bereinigt")):
+            assert cleanHtml(QTEXTEDIT_HTML) == erstes
+        assert len(util._cleanHtmlCache) == 1
@@ -0,0 +1,87 @@
+"""
+Tests für die Vorschaubilder des Auswahl-Rasters.
+"""
+import os
+from unittest.mock import patch
+
+import pytest
+from PIL import Image as PilImage
+
+from src.logic import vorschauBilder
+
+
+@pytest.fixture
+def vorschau_dir(tmp_path, monkeypatch):
+    """Fixture: Vorschaubilder in einem temporären Verzeichnis"""
+    pfad = tmp_path / "vorschau"
+    monkeypatch.setattr(vorschauBilder, "vorschauDir", str(pfad))
+    return pfad
+
+
+def foto(pfad, groesse=(1600, 1200), modus="RGB", farbe="red"):
+    PilImage.new(modus, groesse, farbe).save(pfad)
+    return str(pfad)
+
+
+class TestVorschauBilder:
+    """Test-Klasse für die Vorschaubilder"""
+
+    def test_vorschaubild_wird_einmal_erzeugt(self, tmp_path, vorschau_dir):
+        """Test: Das Vorschaubild passt in die Zielgröße und wird beim zweiten Mal nur nachgeschlagen"""
+        original = foto(tmp_path / "foto.jpg")
+
+        vorschau = vorschauBilder.vorschauBild(original, 371)
+        with PilImage.open(vorschau) as bild:
+            assert bild.size == (371, 278)
+        assert vorschau.startswith(str(vorschau_dir)) and vorschau.endswith("_371.jpg")
+
+        with patch.object(vorschauBilder.PilImage, "open", side_effect=AssertionError("erneut dekodiert")):
+            assert vorschauBilder.vorschauBild(original, 371) == vorschau
+
+    def test_geaendertes_original_bekommt_neues_vorschaubild(self, tmp_path, vorschau_dir):
+        """Test: Der Schlüssel ist der Inhalt, nicht der Pfad"""
+        original = foto(tmp_path / "foto.jpg")
+        erste = vorschauBilder.vorschauBild(original)
+        foto(tmp_path / "foto.jpg", (800, 800), farbe="blue")
+        os.utime(original, ns=(1, 1))
+
+        zweite = vorschauBilder.vorschauBild(original)
+        assert zweite != erste
+        with PilImage.open(zweite) as bild:
+            assert bild.size == (371, 371)
+
+    def test_transparenz_bleibt_erhalten(self, tmp_path, vorschau_dir):
+        """Test: Bilder mit Alphakanal werden als PNG abgelegt"""
+        vorschau = vorschauBilder.vorschauBild(foto(tmp_path / "icon.png", (800, 400), "RGBA", (0, 0, 0, 0)))
+        assert vorschau.endswith(".png")
+        with PilImage.open(vorschau) as bild:
+            assert bild.mode == "RGBA"
+
+    def test_fehlendes_bild_bleibt_unveraendert(self, vorschau_dir):
+        """Test: Nicht vorhandene Bilder liefern ihren Pfad zurück, wie bisher an QIcon"""
+        assert vorschauBilder.vorschauBild("fehlt/bild.jpg") == "fehlt/bild.jpg"
+        assert vorschauBilder.vorschauBild("") == ""
+
+    def test_vorwaermen(self, tmp_path, vorschau_dir):
+        """Test: vorschauBilderErzeugen legt die Vorschaubilder für alle Bilder eines Verzeichnisses an"""
+        (tmp_path / "daten" / "unter").mkdir(parents=True)
+        foto(tmp_path / "daten" / "a.jpg")
+        foto(tmp_path / "daten" / "unter" / "b.png", (500, 500))
+        (tmp_path / "daten" / "notiz.txt").write_text("kein Bild")
+
+        bildPfade = vorschauBilder.bildDateien([str(tmp_path / "daten")])
+        assert [os.path.basename(pfad) for pfad in bildPfade] == ["a.jpg", "b.png"]
+        assert vorschauBilder.vorschauBilderErzeugen(bildPfade, (371, 742), prozesse=1) == 4
+        assert len(list(vorschau_dir.rglob("*_371.*"))) == 2
+        assert vorschauBilder.bildDateien([str(tmp_path)]) == bildPfade
+
+    def test_verwaiste_vorschaubilder_aufraeumen(self, tmp_path, vorschau_dir):
+        """Test: Vorschaubilder, deren Original fehlt, werden gelöscht, die übrigen bleiben"""
+        bleibt = foto(tmp_path / "bleibt.jpg")
+        weg = foto(tmp_path / "weg.jpg", farbe="blue")
+        vorschauBilder.vorschauBilderErzeugen([bleibt, weg], (371, 742), prozesse=1)
+        os.remove(weg)
+
+        assert vorschauBilder.vorschauBilderAufraeumen([bleibt]) == 2
+        assert len(list(vorschau_dir.rglob("*_*.jpg"))) == 2
+        assert vorschauBilder.vorschauBild(bleibt).startswith(str(vorschau_dir))
@@ -0,0 +1,76 @@
+"""
+Tests für die Wartungswerkzeuge auf der Kommandozeile.
+"""
+import os
+
+import pytest
+from PIL import Image as PilImage
+
+import src.logic.serializer as serializer
+from src import pdfGenerator, werkzeuge
+from src.logic import bildSpeicher, vorschauBilder
+from src.models.pruefanweisung import Pruefanweisung
+
+
+@pytest.fixture
+def xml_verzeichnis(tmp_path, monkeypatch):
+    """Fixture: Leitet die Prüfanweisungen in ein temporäres Verzeichnis um"""
+    monkeypatch.setattr(serializer, "pruefanweisungenDir", str(tmp_path / "pruefanweisungen"))
+    monkeypatch.setattr(serializer, "speicherBackend", "xml")
+    serializer._pruefanweisungCache.leeren()
+    pdfGenerator._vorspannCache.leeren()
+    yield tmp_path
+    serializer._pruefanweisungCache.leeren()
+    pdfGenerator._vorspannCache.leeren()
+
+
+class TestPdfBenchmark:
+    """Test-Klasse für pdf-benchmark"""
+
+    def test_benchmark_mit_gespeicherter_pruefanweisung(self, xml_verzeichnis, capsys):
+        """Test: --pruefanweisung nimmt eine gespeicherte Prüfanweisung als Vorlage"""
+        pruefanweisung = Pruefanweisung()
+        pruefanweisung.auswahlHinzufuegen("", "Überjacke")
+        pruefanweisung.vorgabenHinzufuegen("<p>Vorgaben</p>")
+        pruefanweisung.pruefablaufHinzufuegen("<p>Ablauf</p>")
+        pruefanweisung.eigenschaftHinzufuegen("Kategorie", "Nähte prüfen")
+        xmlPfad = serializer.speicherePruefanweisungXml(pruefanweisung)
+
+        assert werkzeuge.main(["pdf-benchmark", "--anzahl", "1", "--pruefanweisung", xmlPfad]) == 0
+        assert "1 PDFs in" in capsys.readouterr().out
+
+
+    def test_benchmark_mit_beispiel_pruefanweisung(self, xml_verzeichnis, capsys):
+        """Test: Ohne --pruefanweisung wird die Beispiel-Prüfanweisung gemessen"""
+        assert werkzeuge.main(["pdf-benchmark", "--anzahl", "2", "--kategorien", "1", "--eigenschaften", "2"]) == 0
+        assert "Weitere PDFs" in capsys.readouterr().out
+
+
+class TestVorschauErzeugen:
+    """Test-Klasse für vorschau-erzeugen"""
+
+    def test_aufraeumen_behaelt_vorschaubilder_der_pruefanweisungen(self, xml_verzeichnis, monkeypatch):
+        """Test: Vorschaubilder von Prüfanweisungen außerhalb der Verzeichnisse bleiben, verwaiste werden gelöscht"""
+        monkeypatch.setattr(serializer, "pruefanweisungenXmlPfad", str(xml_verzeichnis / "pruefanweisungen.xml"))
+        monkeypatch.setattr(bildSpeicher, "bilderDir", str(xml_verzeichnis / "bilder"))
+        monkeypatch.setattr(vorschauBilder, "vorschauDir", str(xml_verzeichnis / "vorschau"))
+        serializer.uebersichtCacheLeeren()
+        (xml_verzeichnis / "anderswo").mkdir()
+        (xml_verzeichnis / "bilder").mkdir()
+        vorschau, geloescht = xml_verzeichnis / "anderswo" / "helm.jpg", xml_verzeichnis / "geloescht.jpg"
+        PilImage.new("RGB", (800, 600), "red").save(vorschau)
+        PilImage.new("RGB", (800, 600), "blue").save(geloescht)
+        pruefanweisung = Pruefanweisung()
+        pruefanweisung.auswahlHinzufuegen(str(vorschau), "Helm")
+        serializer.addToPruefanweisungenXml(pruefanweisung, serializer.speicherePruefanweisungXml(pruefanweisung))
+        behalten = vorschauBilder.vorschauBild(str(vorschau))
+        verwaist = vorschauBilder.vorschauBild(str(geloescht))
+        geloescht.unlink()
+        config = xml_verzeichnis / "config.yaml"
+        config.write_text('speicherBackend: "xml"\n')
+
+        assert werkzeuge.main(["--config", str(config), "vorschau-erzeugen", str(xml_verzeichnis / "bilder"),
+                               "--prozesse", "1", "--aufraeumen"]) == 0
+
+        assert os.path.exists(behalten) and not os.path.exists(verwaist)
+        serializer.uebersichtCacheLeeren()
@@ -0,0 +1,73 @@
+"""
+Tests für die Tabelle der Zusammenfassungen (ZusammenfassungModell).
+"""
+import pytest
+from PySide6.QtCore import Qt
+
+from src.gui.zusammenfassungTabelle import SPALTE_BESCHREIBUNG, SPALTE_HAKEN, SPALTE_MASSNAHMEN, ZusammenfassungModell, ZusammenfassungTabelle
+from src.logic.serializer import eigenschaftenNachKategorienGruppieren, eigenschaftspruefungenNachKategorienGruppieren
+from src.models.eigenschaft import Eigenschaft
+from src.models.eigenschaftpruefung import Eigenschaftspruefung
+
+
+@pytest.fixture
+def pruefungen():
+    """Fixture: Drei Eigenschaftsprüfungen in zwei Kategorien"""
+    return [Eigenschaftspruefung(Eigenschaft("Helmschale", "Risse")),
+            Eigenschaftspruefung(Eigenschaft("Helmschale", "Verformungen"), False, "Aussondern"),
+            Eigenschaftspruefung(Eigenschaft("Visier", "Kratzer"))]
+
+
+class TestZusammenfassungModell:
+    """Test-Klasse für das ZusammenfassungModell"""
+
+    def test_kategoriezeilen_vor_ihren_eigenschaften(self, app, pruefungen):
+        """Test: Je Kategorie eine Kategoriezeile, darunter ihre Eigenschaften mit Haken und Maßnahmen"""
+        modell = ZusammenfassungModell()
+        modell.kategorienSetzen(eigenschaftspruefungenNachKategorienGruppieren(pruefungen))
+
+        assert modell.rowCount() == 5
+        assert [modell.istKategorie(zeile) for zeile in range(5)] == [True, False, False, True, False]
+        assert modell.index(0, SPALTE_BESCHREIBUNG).data() == "Helmschale"
+        assert modell.index(2, SPALTE_BESCHREIBUNG).data() == "Verformungen"
+        assert modell.index(1, SPALTE_HAKEN).data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+        assert modell.index(2, SPALTE_HAKEN).data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Unchecked
+        assert modell.index(2, SPALTE_MASSNAHMEN).data() == "Aussondern"
+
+    def test_bearbeitung_schreibt_in_die_sichtpruefung(self, app, pruefungen):
+        """Test: Haken und Maßnahmen landen direkt in den Eigenschaftsprüfungen"""
+        modell = ZusammenfassungModell()
+        modell.kategorienSetzen(eigenschaftspruefungenNachKategorienGruppieren(pruefungen))
+
+        assert modell.setData(modell.index(4, SPALTE_HAKEN), Qt.CheckState.Unchecked.value, Qt.ItemDataRole.CheckStateRole)
+        assert modell.setData(modell.index(4, SPALTE_MASSNAHMEN), "Visier tauschen")
+
+        assert pruefungen[2].keinHandlungsbedarf is False
+        assert pruefungen[2].massnahmen == "Visier tauschen"
+        assert not modell.setData(modell.index(3, SPALTE_MASSNAHMEN), "Kategorie")
+        assert not modell.setData(modell.index(4, SPALTE_BESCHREIBUNG), "Beschreibung")
+
+    def test_pruefanweisung_nur_anzeigen(self, app):
+        """Test: Eigenschaften einer Prüfanweisung haben leere, nicht bearbeitbare Felder"""
+        modell = ZusammenfassungModell()
+        modell.kategorienSetzen(eigenschaftenNachKategorienGruppieren([Eigenschaft("Gurt", "Nähte")]))
+
+        assert modell.index(1, SPALTE_BESCHREIBUNG).data() == "Nähte"
+        assert modell.index(1, SPALTE_HAKEN).data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Unchecked
+        assert modell.index(1, SPALTE_MASSNAHMEN).data() == ""
+        assert modell.flags(modell.index(1, SPALTE_MASSNAHMEN)) == Qt.ItemFlag.ItemIsEnabled
+        assert not modell.setData(modell.index(1, SPALTE_MASSNAHMEN), "Neu")
+
+    def test_leeren(self, app, pruefungen):
+        """Test: Nach leeren() ist die Tabelle leer, die Tabelle übernimmt die Kategoriezeilen als Spannen"""
+        modell = ZusammenfassungModell()
+        tabelle = ZusammenfassungTabelle()
+        tabelle.setModel(modell)
+        modell.kategorienSetzen(eigenschaftspruefungenNachKategorienGruppieren(pruefungen))
+
+        assert tabelle.columnSpan(3, 0) == 3
+        assert tabelle.columnSpan(4, 0) == 1
+
+        modell.leeren()
+
+        assert modell.rowCount() == 0